@@ -0,0 +1,137 @@
+import logging, os, threading, time, uuid
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(part):
+    # `_` separa as partes da chave no nome do arquivo; `quote` não o escapa
+    return quote(str(part), safe='').replace('_', '%5F')
+
+
+class ParquetResponseCache:
+    """
+    Cache em disco de respostas tabulares (DataFrames), um arquivo Parquet
+    comprimido por chave.
+
+    - a chave é uma tupla de textos (ex.: `(symbol, interval, start, end)`)
+      e vira o nome do arquivo, legível e sem colisões;
+    - `ttl` (segundos) vale a partir da gravação (mtime do arquivo); entradas
+      vencidas contam como ausentes;
+    - `max_bytes` limita o tamanho total: ao passar do limite, as entradas
+      usadas há mais tempo (atime, atualizado a cada leitura) são removidas,
+      tanto ao abrir o cache quanto a cada gravação;
+    - `offline=True` nunca expira entradas e aceita a entrada mais recente
+      de um prefixo da chave (`get(..., fallback=...)`), para repetir uma
+      execução só com o que já está no disco; o frame devolvido traz a chave
+      da entrada lida em `df.attrs['cache_key']`.
+    """
+
+    SUFFIX = '.parquet'
+
+    def __init__(self, root, ttl=24 * 3600, max_bytes=512 * 1024 ** 2, **kwargs):
+        self.root = Path(root).resolve()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = kwargs.get('offline', False)
+        self.compression = kwargs.get('compression', 'zstd')
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        # Execuções só de leitura (ou offline) nunca chamam `put`: o limite vale desde a abertura
+        self.evict()
+
+    def path_for(self, key):
+        return self.root / ('_'.join(_encode(part) for part in key) + self.SUFFIX)
+
+    def key_for(self, path):
+        """Chave (tupla de textos) correspondente ao arquivo `path`."""
+        return tuple(unquote(part) for part in Path(path).name[:-len(self.SUFFIX)].split('_'))
+
+    def get(self, key, fallback=None):
+        """
+        DataFrame guardado em `key`, ou None se ausente/vencido. Em modo
+        offline, sem a chave exata, usa a entrada mais recente cuja chave
+        começa por `fallback` (ex.: o mesmo ativo e intervalo).
+        """
+        path = self.path_for(key)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            path = self._latest_path(fallback) if self.offline and fallback else None
+            if path is None:
+                self._count('misses')
+                return None
+            logger.debug("📴 Chave %s ausente; repetindo a entrada '%s'.", key, path.name)
+            st = path.stat()
+
+        if not self.offline and self.ttl is not None and time.time() - st.st_mtime > self.ttl:
+            self._count('expired')
+            return None
+        return self._read(path, st)
+
+    def _latest_path(self, prefix):
+        pattern = '_'.join(_encode(part) for part in prefix) + '_*' + self.SUFFIX
+        candidates = [(path.stat().st_mtime, path) for path in self.root.glob(pattern)] if self.root.exists() else []
+        return max(candidates)[1] if candidates else None
+
+    def _read(self, path, st):
+        try:
+            df = pq.read_table(path).to_pandas()
+        except (OSError, pa.ArrowInvalid) as err:
+            logger.warning("⚠️ Entrada de cache ilegível removida (%s): %s", path.name, err)
+            path.unlink(missing_ok=True)
+            self._count('misses')
+            return None
+        # Marca o uso (atime) sem mexer na data de gravação (mtime), usada pelo TTL
+        os.utime(path, (time.time(), st.st_mtime))
+        df.attrs['cache_key'] = self.key_for(path)
+        self._count('hits')
+        return df
+
+    def put(self, key, df):
+        """Grava `df` em `key` (escrita atômica) e aplica o limite de tamanho."""
+        path = self.path_for(key)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp, compression=self.compression)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até o total caber em `max_bytes`; retorna quantas saíram."""
+        if self.max_bytes is None:
+            return 0
+        with self._lock:
+            entries = []
+            for path in self.root.glob('*' + self.SUFFIX):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_atime, st.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+
+        if evicted:
+            self._count('evicted', evicted)
+            logger.debug("🧹 %d entrada(s) removida(s) do cache '%s' (limite de %d bytes).", evicted, self.root, self.max_bytes)
+        return evicted
+
+    def clear(self):
+        for path in self.root.glob('*' + self.SUFFIX) if self.root.exists() else ():
+            path.unlink(missing_ok=True)
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.stats[name] += n
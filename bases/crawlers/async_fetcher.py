@@ -0,0 +1,84 @@
+import asyncio, logging, time
+from urllib.parse import urlsplit
+
+from bases.crawlers.http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetcher:
+    """
+    Busca várias URLs em paralelo com asyncio.
+
+    - `concurrency` limita as requisições em andamento (semáforo);
+    - `rate_per_host` limita quantas requisições por segundo começam em cada host;
+    - falhas são repetidas `retries` vezes com backoff exponencial; com um
+      `http_client` que já repete as requisições (`retries > 0`), o fetcher
+      não repete de novo, para que só uma camada faça retry;
+    - as requisições usam a sessão pooled do HttpClient (executada em threads),
+      reaproveitando as conexões entre páginas.
+    """
+
+    def __init__(self, http_client=None, **kwargs):
+        self.concurrency = kwargs.get('concurrency', 8)
+        self.rate_per_host = kwargs.get('rate_per_host', 5.0)
+        self.retries = kwargs.get('retries', 3)
+        self.backoff_factor = kwargs.get('backoff_factor', 0.5)
+        # As repetições ficam a cargo do fetcher; o pool precisa comportar a concorrência
+        self.http = http_client or HttpClient(retries=0, pool_size=self.concurrency, **{
+            k: v for k, v in kwargs.items() if k in ('timeout', 'headers')
+        })
+        if getattr(self.http, 'retries', 0):
+            # Cliente com retry próprio (urllib3): as tentativas não se multiplicam
+            self.retries = 0
+        self._semaphore = None
+        self._host_locks = {}
+        self._host_next_slot = {}
+
+    async def _wait_host_slot(self, host):
+        """Espaça o início das requisições ao mesmo host conforme `rate_per_host`."""
+        if not self.rate_per_host:
+            return
+
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._host_next_slot.get(host, now))
+            self._host_next_slot[host] = slot + 1.0 / self.rate_per_host
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def fetch(self, url):
+        """Retorna o corpo de `url`, com retry/backoff; levanta a última exceção se esgotar."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            await self._wait_host_slot(host)
+            try:
+                async with self._semaphore:
+                    return await asyncio.to_thread(self.http.get_text, url)
+            except Exception as err:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff_factor * (2 ** attempt)
+                logger.debug("🔁 Tentativa %d falhou para %s (%s); nova tentativa em %.1fs.", attempt + 1, url, err, delay)
+                await asyncio.sleep(delay)
+
+    async def fetch_many(self, urls):
+        """Gera (url, corpo ou exceção) à medida que cada requisição termina."""
+        async def _fetch(url):
+            try:
+                return url, await self.fetch(url)
+            except Exception as err:
+                return url, err
+
+        for task in asyncio.as_completed([_fetch(url) for url in urls]):
+            yield await task
+
+    def reset(self):
+        """Descarta o estado ligado ao event loop (para reutilizar o fetcher em outro `asyncio.run`)."""
+        self._semaphore = None
+        self._host_locks.clear()
+        self._host_next_slot.clear()
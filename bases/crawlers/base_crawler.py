@@ -1,52 +1,69 @@
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
+
+from bases.crawlers.driver_pool import DEFAULT_BLOCKED_RESOURCES, create_driver, get_driver_pool
+from bases.crawlers.readiness import CrawlBudget, PhaseTimings, default_readiness
 
 
 class BaseCrawler:
     url = ''
-    
+
     def __init__(self, **kwargs):
         self.time_to_wait = kwargs.get('time_to_wait', 0)
         self.headless = kwargs.get('headless', False)
         self.driver = None
-    
+        # Esperas por condição no lugar de pausas fixas, limitadas pelo orçamento da coleta
+        self.readiness = kwargs.get('readiness') or default_readiness()
+        self.wait_timeout = kwargs.get('wait_timeout', 10)
+        self.budget = CrawlBudget(kwargs.get('time_budget'))
+        self.timings = PhaseTimings()
+        # Navegador reaproveitado entre coletas (pool compartilhado do processo)
+        self.reuse_driver = kwargs.get('reuse_driver', True)
+        self.blocked_resources = tuple(kwargs.get('blocked_resources', DEFAULT_BLOCKED_RESOURCES))
+        self.driver_pool = kwargs.get('driver_pool')
+        self.pool_options = {
+            # `pool_size` é do HttpClient (conexões); o pool de navegadores tem opção própria
+            'size': kwargs.get('driver_pool_size', 1),
+            'max_pages_per_driver': kwargs.get('max_pages_per_driver', 50),
+        }
+
+    def _get_pool(self):
+        if self.driver_pool is None:
+            self.driver_pool = get_driver_pool(
+                headless=self.headless, blocked_resources=self.blocked_resources, **self.pool_options
+            )
+        return self.driver_pool
+
     def _setup_driver(self):
-        """Configura e instancia o driver do Chrome apenas quando necessário."""
+        """Obtém o driver do Chrome apenas quando necessário (do pool, se `reuse_driver`)."""
         if self.driver is not None:
             return
-            
-        options = webdriver.ChromeOptions()
-        if self.headless:
-            options.add_argument('--headless')
-            
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument("--start-maximized")
-
-        user_agent = (
-            "Mozilla/5.0 (X11; Linux x86_64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-        options.add_argument(f'user-agent={user_agent}')
-        service = ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.set_page_load_timeout(30)
-    
+
+        if self.reuse_driver:
+            self.driver = self._get_pool().acquire()
+        else:
+            self.driver = create_driver(self.headless, self.blocked_resources)
+
     def close_driver(self):
-        """Fecha o driver se estiver ativo."""
+        """Devolve o driver ao pool (ou o fecha, sem reaproveitamento)."""
         if self.driver is not None:
-            self.driver.quit()
-            self.driver = None 
+            if self.reuse_driver:
+                self._get_pool().release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
+
+    def _load(self, url):
+        with self.timings.phase('navegacao'):
+            self.driver.get(url)
+        if self.reuse_driver:
+            self._get_pool().record_page(self.driver)
 
     def goto(self, url=None):
         """Navega para a URL especificada. Configura o driver se necessário."""
         self._setup_driver()
         if url:
             self.url = url
-        return self.driver.get(self.url)
+        return self._load(self.url)
 
     def run(self):
         """Navigate to the configured URL and return the raw page source."""
@@ -58,18 +75,21 @@ class BaseCrawler:
         self._setup_driver()
         if url:
             self.url = url
-            self.driver.get(self.url)
-            
-        if self.time_to_wait:
-            time.sleep(self.time_to_wait)
+            self._load(self.url)
+
+        with self.timings.phase('prontidao'):
+            self.readiness.wait(self.driver, self.budget.timeout(self.wait_timeout))
+            # Pausa fixa apenas se configurada explicitamente
+            if self.time_to_wait:
+                time.sleep(self.time_to_wait)
+
+        with self.timings.phase('page_source'):
+            return self.driver.page_source
 
-        return self.driver.page_source
-    
     def __enter__(self):
         """Context manager entry."""
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - garante que o driver seja fechado."""
+        """Context manager exit - garante que o driver seja fechado (ou devolvido ao pool)."""
         self.close_driver()
-    
\ No newline at end of file
@@ -0,0 +1,232 @@
+import atexit, logging, threading, time
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+
+from bases.crawlers.http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+# Padrões de URL bloqueados por tipo de recurso (via DevTools, antes do download)
+BLOCKED_URL_PATTERNS = {
+    'image': ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif"],
+    'font': ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    'stylesheet': ["*.css"],
+}
+DEFAULT_BLOCKED_RESOURCES = ('image', 'font', 'stylesheet')
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path():
+    """Caminho do ChromeDriver, resolvido pelo webdriver-manager uma única vez por processo."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+            logger.debug("🧭 ChromeDriver resolvido em %s", _driver_path)
+        return _driver_path
+
+
+def build_chrome_options(headless=False, blocked_resources=DEFAULT_BLOCKED_RESOURCES):
+    """Opções do Chrome usadas pelos crawlers (imagens desativadas quando bloqueadas)."""
+    options = webdriver.ChromeOptions()
+    # `driver.get` retorna no DOMContentLoaded; a prontidão fica com as estratégias de espera
+    options.page_load_strategy = 'eager'
+    if headless:
+        options.add_argument('--headless')
+
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument("--start-maximized")
+    options.add_argument(f'user-agent={HttpClient.user_agent}')
+
+    if 'image' in blocked_resources:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def create_driver(headless=False, blocked_resources=DEFAULT_BLOCKED_RESOURCES, page_load_timeout=30):
+    """Inicia um Chrome com o driver em cache e bloqueia imagens/fontes/CSS pelo DevTools."""
+    service = ChromeService(resolve_driver_path())
+    driver = webdriver.Chrome(service=service, options=build_chrome_options(headless, blocked_resources))
+    driver.set_page_load_timeout(page_load_timeout)
+
+    patterns = [p for kind in blocked_resources for p in BLOCKED_URL_PATTERNS.get(kind, [])]
+    if patterns:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        except Exception as err:
+            logger.debug("⚠️ Não foi possível bloquear recursos via DevTools: %s", err)
+    return driver
+
+
+class DriverPool:
+    """
+    Pool de navegadores reaproveitados entre coletas.
+
+    - `size` limita quantos Chrome ficam abertos ao mesmo tempo (`acquire`
+      espera quando todos estão em uso);
+    - drivers ociosos passam por um health check antes de serem entregues e
+      são substituídos se a sessão tiver caído;
+    - cada driver é reciclado após `max_pages_per_driver` páginas, para
+      limitar o crescimento de memória do navegador;
+    - `warm()` abre os navegadores antecipadamente.
+    """
+
+    def __init__(self, **kwargs):
+        self.size = kwargs.get('size', 1)
+        self.max_pages_per_driver = kwargs.get('max_pages_per_driver', 50)
+        self.headless = kwargs.get('headless', False)
+        self.blocked_resources = tuple(kwargs.get('blocked_resources', DEFAULT_BLOCKED_RESOURCES))
+        self.page_load_timeout = kwargs.get('page_load_timeout', 30)
+        self.factory = kwargs.get('factory') or (lambda: create_driver(
+            self.headless, self.blocked_resources, self.page_load_timeout
+        ))
+        self._cond = threading.Condition()
+        self._idle = []
+        self._pages = {}
+        self._total = 0
+        self._closed = False
+
+    def _create(self):
+        start = time.perf_counter()
+        driver = self.factory()
+        self._pages[id(driver)] = 0
+        logger.debug("🚀 Navegador iniciado em %.2fs (pool: %d/%d).", time.perf_counter() - start, self._total, self.size)
+        return driver
+
+    def _quit(self, driver):
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def is_healthy(driver):
+        """Verifica se a sessão do navegador ainda responde."""
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout=None):
+        """Entrega um driver saudável (reaproveitado ou novo); espera se o pool estiver cheio."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Pool de navegadores encerrado.")
+            if not self._cond.wait_for(lambda: self._idle or self._total < self.size, timeout):
+                raise TimeoutError(f"Nenhum navegador disponível no pool em {timeout}s.")
+            driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                self._total += 1
+
+        if driver is not None:
+            if self.is_healthy(driver):
+                return driver
+            logger.info("🩺 Navegador sem resposta descartado; iniciando outro.")
+            self._quit(driver)
+
+        try:
+            return self._create()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def record_page(self, driver):
+        """Contabiliza uma página carregada pelo driver (usado na reciclagem)."""
+        self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+
+    def release(self, driver):
+        """Devolve o driver ao pool, reciclando-o se atingiu o limite de páginas ou caiu."""
+        pages = self._pages.get(id(driver), 0)
+        reuse = not self._closed and pages < self.max_pages_per_driver
+        if reuse:
+            try:
+                # Descarta a página pesada mantendo a sessão aberta
+                driver.get("about:blank")
+            except Exception:
+                reuse = False
+
+        if not reuse:
+            if pages >= self.max_pages_per_driver:
+                logger.debug("♻️ Navegador reciclado após %d páginas.", pages)
+            self._quit(driver)
+
+        with self._cond:
+            if reuse:
+                self._idle.append(driver)
+            else:
+                self._total -= 1
+            self._cond.notify()
+
+    def warm(self, count=None):
+        """Abre antecipadamente até `count` navegadores (padrão: `size`)."""
+        drivers = []
+        for _ in range(min(count or self.size, self.size)):
+            with self._cond:
+                if self._total >= self.size:
+                    break
+                self._total += 1
+            try:
+                drivers.append(self._create())
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                raise
+        with self._cond:
+            self._idle.extend(drivers)
+            self._cond.notify_all()
+        return len(drivers)
+
+    def close(self):
+        """Fecha os navegadores ociosos; os que estão em uso são fechados ao serem devolvidos."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(**kwargs):
+    """
+    Retorna o pool compartilhado para a combinação de opções do navegador e
+    do pool: crawlers com `size`/`max_pages_per_driver` diferentes não
+    recebem o pool um do outro.
+    """
+    key = (
+        kwargs.get('headless', False),
+        tuple(kwargs.get('blocked_resources', DEFAULT_BLOCKED_RESOURCES)),
+        kwargs.get('size', 1),
+        kwargs.get('max_pages_per_driver', 50),
+        kwargs.get('page_load_timeout', 30),
+    )
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = _pools[key] = DriverPool(**kwargs)
+        return pool
+
+
+def close_all_pools():
+    """Encerra os navegadores de todos os pools do processo."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+atexit.register(close_all_pools)
@@ -0,0 +1,71 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpClient:
+    """Cliente HTTP com sessão e pool de conexões reutilizados entre requisições."""
+
+    user_agent = (
+        "Mozilla/5.0 (X11; Linux x86_64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    def __init__(self, **kwargs):
+        self.timeout = kwargs.get('timeout', 15)
+        self.retries = kwargs.get('retries', 3)
+        self.backoff_factor = kwargs.get('backoff_factor', 0.5)
+        self.pool_size = kwargs.get('pool_size', 10)
+        self.headers = kwargs.get('headers', {})
+        self.session = None
+
+    def _setup_session(self):
+        """Cria a sessão apenas quando necessário."""
+        if self.session is not None:
+            return
+
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": self.user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+            "Accept-Language": "pt-BR,pt;q=0.9",
+            **self.headers,
+        })
+
+    def get(self, url, **kwargs):
+        """GET com retry/backoff; levanta `requests.HTTPError` em respostas de erro."""
+        self._setup_session()
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.get(url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def get_text(self, url, **kwargs):
+        """Retorna o corpo da resposta como texto (UTF-8 quando o servidor não informa o charset)."""
+        response = self.get(url, **kwargs)
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = 'utf-8'
+        return response.text
+
+    def close(self):
+        """Fecha a sessão e as conexões do pool."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,187 @@
+import math, time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Intervalo de verificação das esperas por condição (o padrão do Selenium é 0,5s)
+POLL_FREQUENCY = 0.1
+
+_COUNT_SCRIPT = """
+return document.evaluate('count(' + arguments[0] + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue;
+"""
+
+# Resolve assim que a contagem passa de `previous` (observando mutações do DOM) ou no timeout
+_COUNT_ABOVE_SCRIPT = """
+const [xpath, previous, timeoutMs, done] = arguments;
+const count = () => document.evaluate('count(' + xpath + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue;
+let current = count();
+if (current > previous) { done(current); return; }
+let scheduled = false;
+const finish = () => { observer.disconnect(); clearTimeout(timer); done(count()); };
+const observer = new MutationObserver(() => {
+    if (scheduled) return;
+    scheduled = true;
+    setTimeout(() => { scheduled = false; if (count() > previous) finish(); }, 50);
+});
+observer.observe(document.body || document.documentElement, {childList: true, subtree: true});
+const timer = setTimeout(finish, timeoutMs);
+"""
+
+# Resolve quando o DOM fica `quietMs` sem inserções/remoções de nós (ou no timeout); mudanças
+# de atributos (anúncios, cotações piscando) não contam, senão a página nunca ficaria quieta
+_DOM_QUIET_SCRIPT = """
+const [quietMs, timeoutMs, done] = arguments;
+let idle;
+const finish = (quiet) => { observer.disconnect(); clearTimeout(idle); clearTimeout(timer); done(quiet); };
+const observer = new MutationObserver(() => { clearTimeout(idle); idle = setTimeout(() => finish(true), quietMs); });
+observer.observe(document.documentElement, {childList: true, subtree: true});
+idle = setTimeout(() => finish(true), quietMs);
+const timer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+_HREFS_SCRIPT = """
+const [xpath, start] = arguments;
+const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const hrefs = [];
+for (let i = start; i < result.snapshotLength; i++) hrefs.push(result.snapshotItem(i).href);
+return hrefs;
+"""
+
+
+def _run_async(driver, script, timeout, *args):
+    """Executa um script assíncrono com o timeout de script ajustado à espera."""
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(script, *args, int(timeout * 1000))
+
+
+def count_matches(driver, xpath):
+    """Conta os nós de `xpath` no navegador, sem trazer os elementos para o Python."""
+    return int(driver.execute_script(_COUNT_SCRIPT, xpath))
+
+
+def wait_for_count_above(driver, xpath, previous, timeout):
+    """Espera (por mutações do DOM) até haver mais de `previous` nós de `xpath`; retorna a contagem."""
+    if timeout <= 0:
+        return count_matches(driver, xpath)
+    return int(_run_async(driver, _COUNT_ABOVE_SCRIPT, timeout, xpath, previous))
+
+
+def collect_hrefs(driver, xpath, start=0):
+    """`href` dos nós de `xpath` a partir da posição `start`, em uma única chamada."""
+    return driver.execute_script(_HREFS_SCRIPT, xpath, start)
+
+
+class ReadinessStrategy(ABC):
+    """Condição de prontidão da página; `wait` retorna True se foi atingida dentro do timeout."""
+
+    @abstractmethod
+    def wait(self, driver, timeout):
+        pass
+
+
+class DocumentReady(ReadinessStrategy):
+    """`document.readyState` igual a 'complete'."""
+
+    def wait(self, driver, timeout):
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            return True
+        except TimeoutException:
+            return False
+
+
+class ElementsPresent(ReadinessStrategy):
+    """Pelo menos um elemento do `locator` presente no DOM."""
+
+    def __init__(self, locator):
+        self.locator = locator
+
+    def wait(self, driver, timeout):
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+                EC.presence_of_element_located(self.locator)
+            )
+            return True
+        except TimeoutException:
+            return False
+
+
+class DomQuiet(ReadinessStrategy):
+    """DOM sem nós inseridos/removidos por `quiet_ms` (scripts da página terminaram de renderizar)."""
+
+    def __init__(self, quiet_ms=300):
+        self.quiet_ms = quiet_ms
+
+    def wait(self, driver, timeout):
+        if timeout <= 0:
+            return False
+        try:
+            return bool(_run_async(driver, _DOM_QUIET_SCRIPT, timeout, self.quiet_ms))
+        except TimeoutException:
+            return False
+
+
+class AllReady(ReadinessStrategy):
+    """Aplica as estratégias em sequência, dividindo o mesmo timeout."""
+
+    def __init__(self, *strategies):
+        self.strategies = strategies
+
+    def wait(self, driver, timeout):
+        deadline = time.monotonic() + timeout
+        return all(s.wait(driver, max(0.0, deadline - time.monotonic())) for s in self.strategies)
+
+
+def default_readiness():
+    return AllReady(DocumentReady(), DomQuiet())
+
+
+class CrawlBudget:
+    """Orçamento total de tempo de uma coleta (`seconds=None` para ilimitado)."""
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.started_at = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+
+    def remaining(self):
+        if self.seconds is None or self.started_at is None:
+            return math.inf
+        return self.seconds - (time.monotonic() - self.started_at)
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, default):
+        """Timeout de uma espera limitado ao que resta do orçamento."""
+        return max(0.0, min(default, self.remaining()))
+
+
+class PhaseTimings:
+    """Acumula a duração de cada fase da coleta (ex.: download, parser, carregar_mais)."""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+
+    def reset(self):
+        self.durations.clear()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] += time.perf_counter() - start
+
+    def summary(self):
+        return " | ".join(f"{name}={elapsed:.2f}s" for name, elapsed in self.durations.items()) or "-"
@@ -4,9 +4,13 @@ from abc import ABC, abstractmethod
 class ExtractInterface(ABC):
     
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        super().__init__()
     
     @abstractmethod
     def do_extract(self, **kwargs):
         """Extrai dados e retorna um DataFrame do Spark"""
         pass
+
+    def iter_extract(self, **kwargs):
+        """Versão em fluxo de `do_extract`: gera os dados em lotes (padrão: um único lote)."""
+        yield self.do_extract(**kwargs)
@@ -2,11 +2,23 @@ from abc import ABC, abstractmethod
 
 
 class LoadInterface(ABC):
-    
+    # Nome do argumento de `do_load` que recebe os dados (cada loader declara o seu)
+    batch_kwarg = 'data'
+
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        super().__init__()
     
     @abstractmethod
     def do_load(self, **kwargs):
         """Carrega o DataFrame para o destino final"""
         pass
+
+    def iter_load(self, batches, **kwargs):
+        """
+        Versão em fluxo de `do_load`: carrega cada lote assim que ele chega e gera o resultado.
+
+        Cada lote é passado a `do_load` no argumento `batch_kwarg`, o mesmo
+        usado nas chamadas diretas (ex.: `df=` ou `data_transformed=`).
+        """
+        for batch in batches:
+            yield self.do_load(**{self.batch_kwarg: batch}, **kwargs)
@@ -1,7 +1,24 @@
 from abc import ABC
 
+from bases.metrics import PipelineMetrics, get_exporter
+
 
 class PipelineInterface(ABC):
+    # Nome usado nas métricas exportadas
+    name = 'pipeline'
+
     def run(self):
         """Executa o pipeline e retorna os dados processados."""
         pass
+
+    @property
+    def metrics(self):
+        """Coletor das etapas; exporta para `metrics_path` (JSON lines ou `.prom`) se configurado."""
+        if getattr(self, '_metrics', None) is None:
+            path = getattr(self, 'metrics_path', None)
+            self._metrics = PipelineMetrics(self.name, [get_exporter(path)] if path else [])
+        return self._metrics
+
+    def stage(self, name, data_in=None):
+        """Context manager que mede uma etapa do pipeline (`with self.stage('extract') as m:`)."""
+        return self.metrics.stage(name, data_in)
@@ -2,8 +2,19 @@ from abc import ABC, abstractmethod
 
 
 class TransformInterface(ABC):
-    
+    # Nome do argumento de `do_transform` que recebe os dados (cada transformer declara o seu)
+    batch_kwarg = 'data'
+
     @abstractmethod
     def do_transform(self, **kwargs):
         """Transforma o DataFrame de entrada e retorna o DataFrame transformado"""
         pass
+
+    def iter_transform(self, batches, **kwargs):
+        """
+        Versão em fluxo de `do_transform`: transforma cada lote assim que ele chega.
+
+        Cada lote é passado a `do_transform` no argumento `batch_kwarg`.
+        """
+        for batch in batches:
+            yield self.do_transform(**{self.batch_kwarg: batch}, **kwargs)
@@ -0,0 +1,215 @@
+import logging, threading, uuid, duckdb
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre leitores e compactação
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Coluna de controle: ordem de chegada das linhas (a mais recente vence na deduplicação)
+INGESTED_AT = '_ingested_at'
+CATALOG_FILE = 'lake.duckdb'
+# Trava compartilhada (leitores) / exclusiva (remoção de arquivos na compactação)
+LOCK_FILE = '.lake.lock'
+
+
+@contextmanager
+def lake_lock(root, exclusive=False):
+    """Trava de arquivo do lake, visível a outros processos (`flock`)."""
+    if fcntl is None:
+        yield
+        return
+
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / LOCK_FILE, 'a') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class ParquetLakeSink:
+    """
+    Destino Parquet particionado no formato Hive (`coluna=valor/`), ao lado do DuckDB.
+
+    - `append` só cria arquivos novos (nunca reescreve os existentes), então
+      leitores nunca disputam o lock do banco nem veem arquivos pela metade;
+    - `safe_append` é o `append` usado pelos loaders: falhas no lake são
+      registradas sem interromper a carga;
+    - `compact` junta os arquivos de cada partição em um só, mantendo a
+      versão mais recente de cada `key`; o arquivo compactado entra por
+      `rename` atômico e os antigos só são removidos sob a trava exclusiva do
+      lake, então leitores de `lake_reader` nunca perdem um arquivo no meio
+      da consulta (enquanto os dois coexistem, a view deduplica por `key`);
+    - partições com mais de `max_files` arquivos são compactadas
+      automaticamente após a escrita;
+    - `view_sql` é a view DuckDB (deduplicada por `key`) sobre os arquivos.
+    """
+
+    def __init__(self, root, dataset, partition_by, key, **kwargs):
+        self.root = Path(root).resolve()
+        self.dataset = dataset
+        self.partition_by = list(partition_by)
+        self.key = list(key)
+        self.max_files = kwargs.get('max_files', 32)
+        self.compression = kwargs.get('compression', 'zstd')
+        self.views_ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self.root / self.dataset
+
+    @property
+    def glob(self):
+        return str(self.path / '**' / '*.parquet')
+
+    def has_files(self):
+        return self.path.exists() and any(self.path.rglob('*.parquet'))
+
+    def _partitioning(self, schema):
+        return ds.partitioning(pa.schema([schema.field(c) for c in self.partition_by]), flavor='hive')
+
+    def append(self, table):
+        """Grava `table` (Arrow) em arquivos novos nas partições correspondentes; retorna as partições tocadas."""
+        if table is None or table.num_rows == 0:
+            return []
+
+        table = table.append_column(INGESTED_AT, pa.array([datetime.now()] * table.num_rows, pa.timestamp('us')))
+        written = []
+        with self._lock:
+            ds.write_dataset(
+                table,
+                self.path,
+                format='parquet',
+                partitioning=self._partitioning(table.schema),
+                basename_template=f"part-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+                existing_data_behavior='overwrite_or_ignore',
+                file_options=ds.ParquetFileFormat().make_write_options(compression=self.compression),
+                file_visitor=lambda f: written.append(Path(f.path).parent),
+            )
+            partitions = sorted(set(written))
+            logger.debug("🪣 %d linha(s) gravadas em %d partição(ões) de '%s'.", table.num_rows, len(partitions), self.dataset)
+
+            crowded = [p for p in partitions if len(list(p.glob('*.parquet'))) > self.max_files]
+            if crowded:
+                self._compact(crowded)
+        return partitions
+
+    def safe_append(self, table):
+        """
+        `append` para cópias do banco: cria as views na primeira escrita e, em
+        caso de falha, só registra o erro (a carga no banco não é desfeita).
+        """
+        try:
+            partitions = self.append(table)
+            if not self.views_ready:
+                ensure_lake_views([self])
+            return partitions
+        except Exception as err:
+            logger.exception("❌ Erro ao gravar '%s' no lake '%s': %s", self.dataset, self.root, err)
+            return []
+
+    def compact(self, partitions=None):
+        """Compacta as partições indicadas (padrão: todas com mais de um arquivo); retorna quantas mudaram."""
+        with self._lock:
+            if partitions is None:
+                partitions = sorted({f.parent for f in self.path.rglob('*.parquet')}) if self.path.exists() else []
+            return self._compact(partitions)
+
+    def _compact(self, partitions):
+        compacted = 0
+        # Colunas de partição não ficam nos arquivos (estão no caminho) e são constantes na partição
+        order = ", ".join(c for c in self.key if c not in self.partition_by)
+        dedup = f"QUALIFY ROW_NUMBER() OVER (PARTITION BY {order} ORDER BY {INGESTED_AT} DESC) = 1" if order else ""
+        with duckdb.connect() as conn:
+            for partition in partitions:
+                files = sorted(partition.glob('*.parquet'))
+                if len(files) < 2:
+                    continue
+
+                table = conn.execute(f"""
+                    SELECT * FROM read_parquet(?, hive_partitioning = false, union_by_name = true)
+                    {dedup}
+                    ORDER BY {order or INGESTED_AT}
+                """, [[str(f) for f in files]]).arrow()
+                if isinstance(table, pa.RecordBatchReader):
+                    table = table.read_all()
+
+                # Escreve o arquivo compactado antes de remover os antigos
+                target = partition / f"compacted-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+                tmp = target.with_suffix('.tmp')
+                pq.write_table(table, tmp, compression=self.compression)
+                tmp.replace(target)
+                with lake_lock(self.root, exclusive=True):
+                    for f in files:
+                        f.unlink()
+
+                compacted += 1
+                logger.debug("🗜️ %s: %d arquivos → 1 (%d linhas).", partition.relative_to(self.root), len(files), table.num_rows)
+
+        if compacted:
+            logger.info("🗜️ %d partição(ões) de '%s' compactada(s).", compacted, self.dataset)
+        return compacted
+
+    def view_sql(self, name=None):
+        """
+        View DuckDB sobre os arquivos: filtros nas colunas de partição só leem
+        as pastas correspondentes, e a versão mais recente de cada `key` vence.
+        """
+        # As colunas de partição entram na janela para que os filtros nelas desçam até a leitura
+        window = ", ".join(dict.fromkeys(self.partition_by + self.key))
+        return f"""
+            CREATE OR REPLACE VIEW {name or self.dataset} AS
+            SELECT * EXCLUDE ({INGESTED_AT})
+            FROM read_parquet('{self.glob}', hive_partitioning = true, union_by_name = true)
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY {window} ORDER BY {INGESTED_AT} DESC) = 1
+        """
+
+
+def ensure_lake_views(sinks, catalog=None):
+    """
+    Cria as views dos datasets em um catálogo DuckDB próprio do lake
+    (`<root>/lake.duckdb`), separado do banco dos pipelines.
+    """
+    sinks = [s for s in sinks if s.has_files()]
+    if not sinks:
+        return None
+
+    catalog = Path(catalog or sinks[0].root / CATALOG_FILE)
+    try:
+        with duckdb.connect(str(catalog)) as conn:
+            for sink in sinks:
+                conn.execute(sink.view_sql())
+                sink.views_ready = True
+        logger.debug("🗂️ Views do lake atualizadas em '%s': %s", catalog, ", ".join(s.dataset for s in sinks))
+        return catalog
+    except duckdb.IOException as err:
+        # Catálogo aberto por um leitor: as views existentes continuam válidas (glob)
+        logger.warning("⚠️ Catálogo do lake em uso; views não atualizadas: %s", err)
+        return None
+
+
+def connect_lake(root, read_only=True):
+    """Abre o catálogo do lake para consultas (`SELECT * FROM prices WHERE symbol = ...`)."""
+    return duckdb.connect(str(Path(root).resolve() / CATALOG_FILE), read_only=read_only)
+
+
+@contextmanager
+def lake_reader(root):
+    """
+    Conexão ao catálogo com a trava compartilhada do lake: a compactação
+    espera as consultas em andamento antes de remover arquivos.
+    """
+    with lake_lock(Path(root).resolve()), connect_lake(root) as conn:
+        yield conn
@@ -0,0 +1,282 @@
+import functools, json, logging, os, sys, threading, time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Coletor ativo no contexto atual (definido por `PipelineMetrics.session`)
+_current = ContextVar('pipeline_metrics', default=None)
+
+
+def peak_rss_bytes():
+    """Pico de memória residente do processo (None se a plataforma não informar)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(data):
+    """
+    Retorna (linhas, bytes) de um lote: DataFrame, tabela/RecordBatch do Arrow,
+    lista de registros ou o dicionário `{'data': [...]}` usado pelo scraping.
+    """
+    if data is None:
+        return None, None
+    if isinstance(data, dict) and 'data' in data:
+        return measure(data['data'])
+    if hasattr(data, 'memory_usage'):  # pandas.DataFrame
+        return len(data), int(data.memory_usage(deep=True).sum())
+    if hasattr(data, 'nbytes') and hasattr(data, 'num_rows'):  # pyarrow.Table / RecordBatch
+        return data.num_rows, data.nbytes
+    if isinstance(data, (list, tuple)):
+        size = sum(
+            sum(sys.getsizeof(v) for v in item.values()) if isinstance(item, dict) else sys.getsizeof(item)
+            for item in data
+        )
+        return len(data), size
+    return None, None
+
+
+class StageMetrics:
+    """Medidas de uma etapa: tempo de parede/CPU, linhas e bytes de entrada/saída e pico de RSS."""
+
+    def __init__(self, pipeline, stage, data_in=None):
+        self.pipeline = pipeline
+        self.stage = stage
+        self.started_at = datetime.now()
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.rows_in, self.bytes_in = measure(data_in)
+        self.rows_out = self.bytes_out = None
+        self.peak_rss_bytes = None
+        self.status = 'ok'
+
+    def set_input(self, data):
+        self.rows_in, self.bytes_in = measure(data)
+
+    def set_output(self, data):
+        self.rows_out, self.bytes_out = measure(data)
+
+    def to_dict(self):
+        return {
+            'pipeline': self.pipeline,
+            'stage': self.stage,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_s': round(self.wall_s, 6),
+            'cpu_s': round(self.cpu_s, 6),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'peak_rss_bytes': self.peak_rss_bytes,
+            'status': self.status,
+        }
+
+
+class PipelineMetrics:
+    """
+    Coletor das etapas de um pipeline.
+
+    - `stage(nome)` é um context manager que mede a etapa e devolve o
+      `StageMetrics` para o chamador informar a saída (`set_output`/`rows_out`);
+    - `session()` envolve uma execução: ativa o coletor para as tarefas
+      (`track`/`instrumented`) e exporta as medidas ao final;
+    - o tempo de CPU é o do processo (`time.process_time`), incluindo threads
+      auxiliares como os downloads em paralelo.
+    """
+
+    def __init__(self, pipeline, exporters=()):
+        self.pipeline = pipeline
+        self.exporters = list(exporters)
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name, data_in=None):
+        metrics = StageMetrics(self.pipeline, name, data_in)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield metrics
+        except BaseException:
+            metrics.status = 'error'
+            raise
+        finally:
+            metrics.wall_s = time.perf_counter() - wall
+            metrics.cpu_s = time.process_time() - cpu
+            metrics.peak_rss_bytes = peak_rss_bytes()
+            self.stages.append(metrics)
+            logger.debug(
+                "⏱️ [%s] %s: %.3fs parede | %.3fs CPU | linhas %s → %s",
+                self.pipeline, name, metrics.wall_s, metrics.cpu_s, metrics.rows_in, metrics.rows_out,
+            )
+
+    @contextmanager
+    def session(self):
+        """Ativa o coletor durante a execução e exporta as etapas ao final (mesmo com erro)."""
+        self.stages = []
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+            self.export()
+
+    def export(self):
+        records = [s.to_dict() for s in self.stages]
+        for exporter in self.exporters:
+            try:
+                exporter.export(records)
+            except Exception as err:
+                logger.warning("⚠️ Falha ao exportar métricas (%s): %s", type(exporter).__name__, err)
+
+    def summary(self):
+        return " | ".join(f"{s.stage}={s.wall_s:.2f}s" for s in self.stages) or "-"
+
+
+@contextmanager
+def track(name, data_in=None):
+    """
+    Mede um trecho no coletor ativo do pipeline; sem pipeline ativo (ex.: a
+    tarefa executada isoladamente) apenas devolve um `StageMetrics` avulso.
+    """
+    collector = _current.get()
+    if collector is None:
+        yield StageMetrics(None, name, data_in)
+        return
+    with collector.stage(name, data_in) as metrics:
+        yield metrics
+
+
+def counting(batches, metrics):
+    """Repassa os lotes de um fluxo somando linhas/bytes como entrada da etapa `metrics`."""
+    metrics.rows_in, metrics.bytes_in = metrics.rows_in or 0, metrics.bytes_in or 0
+    for batch in batches:
+        rows, size = measure(batch)
+        metrics.rows_in += rows or 0
+        metrics.bytes_in += size or 0
+        yield batch
+
+
+def instrumented(name=None):
+    """Decorador equivalente a `track`: a saída da etapa é o retorno da função."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track(name or func.__qualname__) as metrics:
+                result = func(*args, **kwargs)
+                metrics.set_output(result)
+                return result
+        return wrapper
+    return decorator
+
+
+class JsonLinesExporter:
+    """Acrescenta uma linha JSON por etapa ao arquivo (histórico de execuções)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, records):
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self.path.open('a', encoding='utf-8') as fh:
+            for record in records:
+                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class PrometheusTextfileExporter:
+    """
+    Arquivo no formato texto do Prometheus (textfile collector do node_exporter).
+
+    Mantém a última execução de cada pipeline; etapas repetidas na mesma
+    execução (ex.: lotes do modo em fluxo) são somadas. O arquivo é
+    reescrito de forma atômica (temporário + `os.replace`).
+    """
+
+    GAUGES = (
+        ('wall_seconds', 'wall_s', "Tempo de parede da etapa."),
+        ('cpu_seconds', 'cpu_s', "Tempo de CPU do processo durante a etapa."),
+        ('rows_in', 'rows_in', "Linhas recebidas pela etapa."),
+        ('rows_out', 'rows_out', "Linhas produzidas pela etapa."),
+        ('bytes_in', 'bytes_in', "Bytes recebidos pela etapa."),
+        ('bytes_out', 'bytes_out', "Bytes produzidos pela etapa."),
+        ('peak_rss_bytes', 'peak_rss_bytes', "Pico de memória residente do processo ao fim da etapa."),
+        ('calls', 'calls', "Execuções da etapa na última execução do pipeline."),
+        ('errors', 'errors', "Execuções da etapa que terminaram com erro."),
+        ('last_run_timestamp_seconds', 'timestamp', "Início da última execução da etapa (epoch)."),
+    )
+
+    def __init__(self, path, prefix='pipeline_stage'):
+        self.path = Path(path)
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._latest = {}
+
+    @staticmethod
+    def _aggregate(records):
+        stages = {}
+        for r in records:
+            key = (r['pipeline'] or '', r['stage'])
+            agg = stages.setdefault(key, {'calls': 0, 'errors': 0})
+            agg['calls'] += 1
+            agg['errors'] += r['status'] != 'ok'
+            for field in ('wall_s', 'cpu_s', 'rows_in', 'rows_out', 'bytes_in', 'bytes_out'):
+                if r[field] is not None:
+                    agg[field] = agg.get(field, 0) + r[field]
+            if r['peak_rss_bytes'] is not None:
+                agg['peak_rss_bytes'] = max(agg.get('peak_rss_bytes', 0), r['peak_rss_bytes'])
+            agg['timestamp'] = datetime.fromisoformat(r['started_at']).timestamp()
+        return stages
+
+    def export(self, records):
+        if not records:
+            return
+        with self._lock:
+            stages = self._aggregate(records)
+            # Substitui apenas as etapas dos pipelines desta execução
+            pipelines = {pipeline for pipeline, _ in stages}
+            self._latest = {k: v for k, v in self._latest.items() if k[0] not in pipelines}
+            self._latest.update(stages)
+            self._write()
+
+    def _write(self):
+        lines = []
+        for metric, field, help_text in self.GAUGES:
+            name = f"{self.prefix}_{metric}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for (pipeline, stage), values in sorted(self._latest.items()):
+                if values.get(field) is not None:
+                    lines.append(f'{name}{{pipeline="{pipeline}",stage="{stage}"}} {values[field]}')
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+_exporters = {}
+_exporters_lock = threading.Lock()
+
+
+def get_exporter(path):
+    """
+    Exportador compartilhado do arquivo `path`: `.prom` gera o formato do
+    Prometheus; qualquer outra extensão, JSON lines.
+    """
+    path = Path(path).resolve()
+    with _exporters_lock:
+        exporter = _exporters.get(path)
+        if exporter is None:
+            cls = PrometheusTextfileExporter if path.suffix == '.prom' else JsonLinesExporter
+            exporter = _exporters[path] = cls(path)
+        return exporter
@@ -0,0 +1,56 @@
+"""
+Benchmark da coleta da listagem: HTTP sequencial × asyncio com concorrência limitada.
+
+Serve páginas de listagem sintéticas em um servidor local com latência
+artificial. Não usa rede externa nem navegador.
+
+Uso:
+    python benchmarks/bench_crawler.py --items 300 --latency 0.2
+"""
+import argparse, sys, time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from fixtures import infomoney_routes, serve
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+
+
+def make_crawler(base_url, mode, items, **kwargs):
+    crawler = InfoMoneyCrawler(mode=mode, minimum_items=items, max_pages=1000, **kwargs)
+    crawler.url = f"{base_url}/ultimas-noticias/"
+    crawler.page_url_template = f"{base_url}/ultimas-noticias/page/{{page}}/"
+    return crawler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do crawler HTTP/assíncrono.")
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="Latência por requisição (s).")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--articles", action="store_true", help="Também busca o texto de cada notícia.")
+    args = parser.parse_args(argv)
+
+    pages = -(-args.items // args.per_page)
+    with serve(infomoney_routes(pages, args.per_page), latency=args.latency) as base_url:
+        scenarios = [("http (sequencial)", "http", {})]
+        scenarios.append(("async + notícias" if args.articles else "async", "async", {
+            "concurrency": args.concurrency,
+            "rate_per_host": 0,
+            "fetch_articles": args.articles,
+        }))
+
+        for name, mode, kwargs in scenarios:
+            crawler = make_crawler(base_url, mode, args.items, **kwargs)
+            start = time.perf_counter()
+            items = crawler.run()["data"]
+            elapsed = time.perf_counter() - start
+            print(f"{name:<20} {len(items):6d} notícias  {elapsed:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark dos backends de parser da listagem do InfoMoney (BeautifulSoup × lxml).
+
+Gera páginas de listagem com 100, 1.000 e 10.000 notícias, confere que os
+dois backends extraem exatamente os mesmos campos e mede o tempo de cada um.
+
+Uso:
+    python benchmarks/bench_parser.py --sizes 100 1000 10000
+"""
+import argparse, sys, time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from fixtures import make_listing_page
+from scrapping.crawlers.parsers import PARSERS
+
+BASE_URL = "https://www.infomoney.com.br/ultimas-noticias/"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos parsers da listagem.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    ok = True
+    for size in args.sizes:
+        page = make_listing_page(0, size)
+        results, timings = {}, {}
+
+        for name, backend in PARSERS.items():
+            instance = backend()
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results[name] = instance.parse(page, BASE_URL)
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+
+        same = results["bs4"] == results["lxml"]
+        ok &= same
+        speedup = timings["bs4"] / timings["lxml"]
+        print(
+            f"{size:>6} itens ({len(page) / 1024:8.0f} KiB) | "
+            f"bs4 {timings['bs4']:7.3f}s | lxml {timings['lxml']:7.3f}s | "
+            f"{speedup:5.1f}x | {'mesmos campos' if same else 'DIVERGENTE'}"
+        )
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
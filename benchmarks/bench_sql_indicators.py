@@ -0,0 +1,80 @@
+"""
+Paridade e benchmark: indicadores em pandas (IndicatorEngine) × DuckDB (SqlIndicatorEngine).
+
+Carrega OHLCV sintético em um banco temporário com os indicadores do
+pandas, recalcula tudo no DuckDB com funções de janela e compara as
+colunas. Termina com código 1 se alguma coluna divergir além da tolerância.
+
+Uso:
+    python benchmarks/bench_sql_indicators.py --symbols 100 --years 5
+"""
+import argparse, sys, tempfile, time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from api.indicators import IndicatorEngine, SqlIndicatorEngine
+from api.tasks.loader import YFinanceLoad
+from config.database import close_all, get_manager
+from bench_indicators import make_ohlcv
+
+INDICATORS = {
+    "ma_14d": ("sma", 14),
+    "ma_50d": ("sma", 50),
+    "vol_30d": ("volatility", 30),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paridade pandas × DuckDB dos indicadores.")
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    df = make_ohlcv(args.symbols, args.years * 252)
+    sql_engine = SqlIndicatorEngine(indicators=INDICATORS)
+    columns = sql_engine.columns
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+
+        start = time.perf_counter()
+        expected = IndicatorEngine(indicators=INDICATORS).compute(df)
+        pandas_elapsed = time.perf_counter() - start
+        YFinanceLoad(db_path=db_path, indicators=INDICATORS).do_load(df=expected)
+
+        conn = get_manager(db_path).cursor()
+        start = time.perf_counter()
+        sql_engine.recompute(conn)
+        sql_elapsed = time.perf_counter() - start
+
+        actual = conn.execute(
+            f"SELECT symbol, strftime(date, '%Y-%m-%d') AS date, {', '.join(columns)} "
+            "FROM prices ORDER BY symbol, date"
+        ).df()
+        close_all()
+
+    expected = expected.sort_values(["symbol", "date"], ignore_index=True)
+    print(f"{len(df):,} barras | pandas {pandas_elapsed:.3f}s | DuckDB {sql_elapsed:.3f}s")
+
+    ok = True
+    for column in columns:
+        # Médias são arredondadas em 2 casas: diferenças de 1 ulp podem virar 0.01
+        atol = 0.01 + 1e-9 if column.startswith("ma_") else 1e-12
+        left, right = expected[column].to_numpy(dtype="float64"), actual[column].to_numpy(dtype="float64")
+        same_nulls = np.array_equal(np.isnan(left), np.isnan(right))
+        diff = np.nanmax(np.abs(left - right)) if len(left) else 0.0
+        column_ok = same_nulls and diff <= atol
+        ok &= column_ok
+        print(f"{column:<12} {'OK' if column_ok else 'DIVERGENTE'}  (máx. diferença {diff:.2e})")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
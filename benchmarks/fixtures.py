@@ -0,0 +1,142 @@
+"""
+Fixtures offline para os benchmarks: páginas de listagem do InfoMoney, servidor
+HTTP local, `yf.download` sintético e um webdriver falso.
+"""
+import socket, threading, time
+from contextlib import contextmanager
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+RELATIVE_DATES = ("{n} minutos atrás", "{n} horas atrás", "{n} dias atrás", "{n} semanas atrás", "{n} meses atrás")
+
+
+def make_listing_item(i):
+    """Um container de notícia com a mesma estrutura de classes da listagem real."""
+    date_text = RELATIVE_DATES[i % len(RELATIVE_DATES)].format(n=i % 50 + 1)
+    return (
+        '<div class="basis-1/4 px-6 md:px-0">'
+        '<div class="line-clamp-1"><div class="text-sm font-medium">Mercados</div></div>'
+        '<div class="md:line-clamp-3">'
+        f'<a class="hover:underline font-bold" href="/mercados/noticia-{i}/">Notícia de teste número {i}</a>'
+        '</div>'
+        f'<div class="text-wl-neutral-500">{date_text}</div>'
+        '</div>'
+    )
+
+
+def make_listing_page(start, count):
+    """Página de listagem com `count` notícias, numeradas a partir de `start`."""
+    items = "".join(make_listing_item(i) for i in range(start, start + count))
+    return (
+        '<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8"><title>Últimas notícias</title></head>'
+        f'<body><main><div class="flex flex-wrap">{items}</div></main></body></html>'
+    )
+
+
+def make_article_page(i):
+    paragraphs = "".join(f"<p>Parágrafo {p} da notícia {i}.</p>" for p in range(5))
+    return f'<html><body><article><h1>Notícia {i}</h1>{paragraphs}</article></body></html>'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def __init__(self, routes, latency, *args, **kwargs):
+        self.routes = routes
+        self.latency = latency
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = self.routes(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def infomoney_routes(pages, per_page):
+    """Rotas /ultimas-noticias/, /ultimas-noticias/page/N/ e /mercados/noticia-N/."""
+    def routes(path):
+        if path == "/ultimas-noticias/":
+            return make_listing_page(0, per_page)
+        if path.startswith("/ultimas-noticias/page/"):
+            page = int(path.strip("/").rsplit("/", 1)[-1])
+            return make_listing_page((page - 1) * per_page, per_page) if page <= pages else None
+        if path.startswith("/mercados/noticia-"):
+            return make_article_page(path.strip("/").rsplit("-", 1)[-1])
+        return None
+    return routes
+
+
+@contextmanager
+def serve(routes, latency=0.0):
+    """Sobe um servidor HTTP local em uma porta livre e devolve a URL base."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_Handler, routes, latency))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def fake_yf_download(tickers, start=None, end=None, interval="1d", group_by="column", **kwargs):
+    """Substituto de `yf.download`: OHLCV determinístico por ativo, agrupado por ticker."""
+    tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+    index = pd.bdate_range(start, end, inclusive="left", name="Date")
+    frames = {}
+    for ticker in tickers:
+        rng = np.random.default_rng(sum(map(ord, ticker)))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+        frames[ticker] = pd.DataFrame({
+            "Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+            "Volume": rng.integers(1_000, 1_000_000, len(index)),
+        }, index=index)
+    return pd.concat(frames, axis=1)
+
+
+class FakeDriver:
+    """Webdriver falso: devolve páginas de `routes` sem abrir navegador."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.page_source = ""
+
+    def get(self, url):
+        self.page_source = self.routes(url) or ""
+
+    def execute_script(self, script, *args):
+        return "complete" if "readyState" in script else None
+
+    def quit(self):
+        pass
+
+
+@contextmanager
+def no_network():
+    """Recusa conexões fora do loopback enquanto ativo (garante benchmarks offline)."""
+    original = socket.socket.connect
+
+    def connect(sock, address):
+        if isinstance(address, tuple) and address[0] not in ("127.0.0.1", "localhost", "::1"):
+            raise ConnectionRefusedError(f"Acesso à rede bloqueado no benchmark: {address}")
+        return original(sock, address)
+
+    socket.socket.connect = connect
+    try:
+        yield
+    finally:
+        socket.socket.connect = original
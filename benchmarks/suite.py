@@ -0,0 +1,332 @@
+"""
+Suíte de benchmarks de todas as etapas dos pipelines, com baseline versionada.
+
+Roda sem rede nem navegador: `yf.download` é substituído por OHLCV sintético,
+o crawler recebe um webdriver falso e conexões fora do loopback são
+recusadas. Cada caso mede a mediana de `--repeat` rodadas; casos sem
+`setup` repetem a chamada quantas vezes forem precisas para a rodada durar
+ao menos 0,2 s (`timeit.Timer.autorange`). O resultado é salvo em
+`benchmarks/results/<commit>.json` e comparado com a baseline
+(`benchmarks/baseline.json`). Cada rodada é normalizada por um laço de
+calibração medido logo antes dela, para reduzir o efeito da máquina e das
+variações de frequência da CPU ao longo da execução.
+
+Uso:
+    python benchmarks/suite.py                       # roda e compara com a baseline
+    python benchmarks/suite.py --filter loader       # apenas os casos que contêm "loader"
+    python benchmarks/suite.py --save-baseline       # grava o resultado como nova baseline
+    python benchmarks/suite.py --baseline benchmarks/results/abc1234.json
+"""
+import argparse, json, logging, platform, statistics, subprocess, sys, tempfile, time, timeit
+from contextlib import ExitStack
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "src", BENCH_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import api.tasks.extractor as yf_extractor
+from analytics.news_prices import NewsPriceLinks
+from api.tasks.extractor import YFinanceExtract
+from api.tasks.loader import YFinanceLoad
+from api.tasks.transformers import YFinanceTransform
+from bases.crawlers.readiness import ReadinessStrategy
+from bench_indicators import make_ohlcv
+from config.database import close_all
+from fixtures import RELATIVE_DATES, FakeDriver, fake_yf_download, infomoney_routes, make_listing_page, no_network
+from scrapping.crawlers.dates import convert_relative_dates
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+from scrapping.tasks.loader import ScrappingLoader
+from scrapping.tasks.transformer import ScrappingTransformer
+
+RESULTS_DIR = BENCH_DIR / "results"
+BASELINE = BENCH_DIR / "baseline.json"
+REFERENCE_TIME = datetime(2025, 1, 15, 12, 0)
+BASE_URL = "https://www.infomoney.com.br/ultimas-noticias/"
+
+CASES = {}
+# Casos com DuckDB (disco, checkpoints, threads) variam mais entre execuções
+DUCKDB_TOLERANCE = 0.5
+# Casos abaixo de 1 ms: cache da CPU e o escalonador pesam mais que o código medido
+MICRO_TOLERANCE = 0.5
+
+
+def case(name, tolerance=None):
+    """
+    Registra um caso. A função recebe o diretório temporário e devolve
+    `(setup, func)`: `setup()` roda antes de cada rodada (fora do tempo) e
+    seu retorno é passado a `func`, executada uma vez na rodada. Sem `setup`,
+    `func(None)` é repetida até a rodada durar o bastante para medir.
+    `tolerance` amplia a tolerância de `--tolerance` para este caso.
+    """
+    def decorator(factory):
+        CASES[name] = (factory, tolerance)
+        return factory
+    return decorator
+
+
+class Immediate(ReadinessStrategy):
+    """Prontidão imediata: o webdriver falso já entrega a página completa."""
+
+    def wait(self, driver, timeout):
+        return True
+
+
+def _news_items(n, start=0, invalid_every=10):
+    items = []
+    for i in range(start, start + n):
+        items.append({
+            "tipo_noticia": "Mercados",
+            "titulo_noticia": "" if invalid_every and i % invalid_every == 0 else f"Notícia {i}",
+            "url_noticia": f"https://www.infomoney.com.br/mercados/noticia-{i}/",
+            "data_noticia": REFERENCE_TIME,
+        })
+    return items
+
+
+# --------------------------------------------------------------------------
+# Casos
+# --------------------------------------------------------------------------
+@case("crawler.parser[synthetic_listing]")
+def _synthetic_listing(tmp):
+    # Página gerada com a estrutura de classes da listagem real (não é HTML gravado do site)
+    crawler = InfoMoneyCrawler(mode="http")
+    html = make_listing_page(0, 100)
+    return None, lambda _: crawler._parser(html, reference=REFERENCE_TIME)
+
+
+@case("crawler.selenium_page")
+def _selenium_page(tmp):
+    routes = infomoney_routes(pages=1, per_page=100)
+    crawler = InfoMoneyCrawler(mode="selenium", reuse_driver=False, readiness=Immediate())
+    crawler.driver = FakeDriver(lambda url: routes(url.split("infomoney.com.br", 1)[-1]))
+    return None, lambda _: crawler._parser(crawler.get_page_source(BASE_URL), reference=REFERENCE_TIME)
+
+
+@case("dates.convert_relative[1000]", tolerance=MICRO_TOLERANCE)
+def _convert_relative(tmp):
+    crawler = InfoMoneyCrawler(mode="http")
+    texts = [RELATIVE_DATES[i % len(RELATIVE_DATES)].format(n=i % 50 + 1) for i in range(1000)]
+    return None, lambda _: [crawler._convert_relative_to_absolute_date(t, REFERENCE_TIME) for t in texts]
+
+
+@case("dates.convert_relative_batch[1000]", tolerance=MICRO_TOLERANCE)
+def _convert_relative_batch(tmp):
+    texts = [RELATIVE_DATES[i % len(RELATIVE_DATES)].format(n=i % 50 + 1) for i in range(1000)]
+    return None, lambda _: convert_relative_dates(texts, REFERENCE_TIME)
+
+
+for _size in (100, 10_000):
+    @case(f"transform.scrapping[{_size}]", tolerance=MICRO_TOLERANCE if _size < 1000 else None)
+    def _scrapping_transform(tmp, size=_size):
+        transformer = ScrappingTransformer()
+        data = {"data_extracao": REFERENCE_TIME, "data": _news_items(size)}
+        return None, lambda _: transformer.do_transform(data_extracted=data)
+
+
+for _symbols, _bars in ((1, 252), (20, 1260), (200, 1260)):
+    @case(f"transform.yfinance[{_symbols}x{_bars}]")
+    def _yfinance_transform(tmp, symbols=_symbols, bars=_bars):
+        transformer = YFinanceTransform(seed_from_db=False)
+        df = make_ohlcv(symbols, bars)
+        # O transformador não altera o frame recebido: sem `setup`, a chamada é repetida na rodada
+        return None, lambda _: transformer.do_transform(data=df)
+
+
+@case("extract.yfinance[20 ativos]")
+def _yfinance_extract(tmp):
+    symbols = [f"SYM{i:04d}" for i in range(20)]
+    extractor = YFinanceExtract(symbols=symbols, db_path=str(tmp / "ausente.db"), backfill_days=365, batch_size=5)
+    return None, lambda _: extractor.do_extract()
+
+
+@case("extract.yfinance.cached[20 ativos]")
+def _yfinance_extract_cached(tmp):
+    symbols = [f"SYM{i:04d}" for i in range(20)]
+    options = dict(symbols=symbols, db_path=str(tmp / "ausente.db"), backfill_days=365, batch_size=5)
+    YFinanceExtract(cache_dir=str(tmp / "yf_cache"), **options).do_extract()
+    # Repetição offline: todos os lotes saem do cache em disco
+    extractor = YFinanceExtract(cache_dir=str(tmp / "yf_cache"), offline=True, **options)
+    return None, lambda _: extractor.do_extract()
+
+
+@case("loader.news.insert[5000]", tolerance=DUCKDB_TOLERANCE)
+def _news_insert(tmp):
+    loader = ScrappingLoader(db_path=str(tmp / "news_insert.db"))
+    offsets = count(0, 5000)
+    # URLs inéditas a cada rodada: mede o caminho de inserção
+    return (lambda: {"data": _news_items(5000, next(offsets), invalid_every=0)}), \
+        lambda data: loader.do_load(data_transformed=data)
+
+
+@case("loader.news.skip_known[5000]", tolerance=DUCKDB_TOLERANCE)
+def _news_skip(tmp):
+    loader = ScrappingLoader(db_path=str(tmp / "news_skip.db"))
+    data = {"data": _news_items(5000, invalid_every=0)}
+    loader.do_load(data_transformed=data)
+    return None, lambda _: loader.do_load(data_transformed=data)
+
+
+@case("loader.prices.insert[20x1260]", tolerance=DUCKDB_TOLERANCE)
+def _prices_insert(tmp):
+    df = YFinanceTransform(seed_from_db=False).do_transform(data=make_ohlcv(20, 1260))
+    databases = (str(tmp / f"prices_{i}.db") for i in count())
+    # Banco novo a cada rodada: mede a carga inicial
+    return (lambda: YFinanceLoad(db_path=next(databases))), lambda loader: loader.do_load(df=df.copy())
+
+
+@case("loader.prices.upsert_unchanged[20x1260]", tolerance=DUCKDB_TOLERANCE)
+def _prices_upsert(tmp):
+    df = YFinanceTransform(seed_from_db=False).do_transform(data=make_ohlcv(20, 1260))
+    loader = YFinanceLoad(db_path=str(tmp / "prices_upsert.db"))
+    loader.do_load(df=df.copy())
+    return None, lambda _: loader.do_load(df=df.copy())
+
+
+@case("news_prices.refresh[100 novas x 20 ativos]", tolerance=DUCKDB_TOLERANCE)
+def _news_prices_refresh(tmp):
+    db_path = str(tmp / "news_prices.db")
+    YFinanceLoad(db_path=db_path).do_load(
+        df=YFinanceTransform(seed_from_db=False).do_transform(data=make_ohlcv(20, 1260))
+    )
+    news = ScrappingLoader(db_path=db_path)
+    news.do_load(data_transformed={"data": _news_items(5000, invalid_every=0)})
+    links = NewsPriceLinks(db_path=db_path)
+    links.refresh()
+    offsets = count(5000, 100)
+    # Notícias inéditas a cada rodada: mede a atualização incremental
+    return (lambda: news.do_load(data_transformed={"data": _news_items(100, next(offsets), invalid_every=0)})), \
+        lambda _: links.refresh()
+
+
+# --------------------------------------------------------------------------
+# Execução e comparação
+# --------------------------------------------------------------------------
+CALIBRATION = timeit.Timer(lambda: sum(i * i for i in range(200_000)))
+
+
+def calibrate(repeat=3):
+    """Tempo de um laço Python fixo: referência da velocidade da máquina neste momento."""
+    return min(CALIBRATION.repeat(repeat, number=1))
+
+
+def run_case(factory, repeat, tmp):
+    setup, func = factory(tmp)
+    if setup is None:
+        timer = timeit.Timer(lambda: func(None))
+        number, _ = timer.autorange()
+        rounds = [(calibrate(), timer.timeit(number) / number) for _ in range(repeat)]
+    else:
+        # O estado é consumido pela chamada (ex.: URLs inéditas): uma chamada por rodada
+        number, rounds = 1, []
+        for _ in range(repeat):
+            state = setup()
+            calibration = calibrate()
+            start = time.perf_counter()
+            func(state)
+            rounds.append((calibration, time.perf_counter() - start))
+    timings = [t for _, t in rounds]
+    return {
+        "min": min(timings), "median": statistics.median(timings),
+        # Tempo em unidades de calibração: é o valor comparado com a baseline
+        "normalized": statistics.median(t / c for c, t in rounds),
+        "rounds": repeat, "number": number,
+    }
+
+
+def run_suite(selected, repeat):
+    results = {}
+    with ExitStack() as stack:
+        stack.enter_context(no_network())
+        tmp = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        original_download = yf_extractor.yf.download
+        yf_extractor.yf.download = fake_yf_download
+        stack.callback(setattr, yf_extractor.yf, "download", original_download)
+        stack.callback(close_all)
+
+        for name in selected:
+            results[name] = run_case(CASES[name][0], repeat, tmp)
+            print(f"  {name:<42} {results[name]['median'] * 1000:10.3f} ms")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline, tolerance):
+    """Compara tempos normalizados pela calibração; retorna os casos que regrediram."""
+    regressions = []
+    print(f"\nComparação com {baseline.get('commit', '?')} (tolerância {tolerance:.0%}):")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or "normalized" not in base:
+            print(f"  {name:<42} {'(novo)':>10}")
+            continue
+        limit = max(tolerance, CASES[name][1] or 0) if name in CASES else tolerance
+        ratio = result["normalized"] / base["normalized"]
+        status = "regressão" if ratio > 1 + limit else "melhora" if ratio < 1 - limit else "ok"
+        print(f"  {name:<42} {ratio:9.2f}x  {status}")
+        if status == "regressão":
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks offline dos pipelines.")
+    parser.add_argument("--filter", default="", help="Roda apenas os casos cujo nome contém o texto.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Variação aceita antes de acusar regressão.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--list", action="store_true", help="Lista os casos e sai.")
+    args = parser.parse_args(argv)
+
+    selected = [name for name in CASES if args.filter in name]
+    if args.list:
+        print("\n".join(selected))
+        return 0
+
+    # Logs da aplicação atrapalham a leitura e o tempo medido
+    logging.disable(logging.WARNING)
+
+    print(f"Rodando {len(selected)} caso(s) ({args.repeat} rodadas)...")
+    current = {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": run_suite(selected, args.repeat),
+    }
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output = RESULTS_DIR / f"{current['commit']}.json"
+    output.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    print(f"Resultado salvo em {output.relative_to(PROJECT_ROOT)}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"Baseline atualizada: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("Nenhuma baseline encontrada; use --save-baseline para criar.")
+        return 0
+
+    regressions = compare(current, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
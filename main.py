@@ -1,4 +1,6 @@
-import argparse, sys
+import argparse, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 # Caminho do projeto e do diretório src
@@ -11,8 +13,16 @@ for path in (PROJECT_ROOT, SRC_DIR):
         sys.path.insert(0, str(path))
     
 from scrapping.pipeline import ScrappingPipeline
+from scrapping.tasks.loader import ScrappingLoader, news_lake_sink
 from api.pipeline import YFinancePipeline
+from api.tasks.extractor import normalize_symbols
+from api.tasks.loader import prices_lake_sink
+from api.tasks.transformers import YFinanceSqlTransform
+from analytics.news_prices import NewsPriceLinks
+from bases.lake import ensure_lake_views
+from config.database import close_all
 from config.logging import setup_logging
+from config.settings import LAKE_PATH, METRICS_PATH, YF_CACHE_PATH, YF_OFFLINE
 
 setup_logging()
 
@@ -31,47 +41,225 @@ def build_parser():
         action="store_true",
         help="Executa apenas o pipeline da API."
     )
+    parser.add_argument(
+        "--full-crawl",
+        action="store_true",
+        help="No scraping, percorre a listagem até a profundidade máxima mesmo ao encontrar notícias já armazenadas."
+    )
+    parser.add_argument(
+        "--min-pages",
+        type=int,
+        help="Profundidade mínima (páginas da listagem) do scraping antes do encerramento antecipado."
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        help="Profundidade máxima (páginas da listagem) do scraping."
+    )
+    parser.add_argument(
+        "--symbols",
+        nargs="+",
+        help="Lista de ativos para o pipeline da API (ex: BTC-USD ETH-USD)."
+    )
+    parser.add_argument(
+        "--symbols-file",
+        help="Arquivo com um ativo por linha para o pipeline da API."
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Ignora o histórico salvo e baixa novamente todo o período no pipeline da API."
+    )
+    parser.add_argument(
+        "--recompute-indicators",
+        action="store_true",
+        help="Recalcula no DuckDB os indicadores de todo o histórico da tabela prices."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Executa os pipelines em fluxo: cada lote extraído é transformado e carregado antes do próximo."
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Exporta as métricas das etapas (tempo, CPU, linhas, bytes, pico de RSS): "
+             "'.prom' gera o formato textfile do Prometheus; outra extensão, JSON lines."
+    )
+    parser.add_argument(
+        "--yf-cache-dir",
+        help="Guarda as respostas do yfinance em Parquet neste diretório (chave: ativo, intervalo, início, fim)."
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="No pipeline da API, não acessa a rede: usa apenas o que está no cache do yfinance."
+    )
+    parser.add_argument(
+        "--lake-dir",
+        help="Também grava as notícias e cotações carregadas em Parquet particionado (Hive) neste diretório."
+    )
+    parser.add_argument(
+        "--compact-lake",
+        action="store_true",
+        help="Compacta os arquivos de cada partição do lake (um arquivo por partição) e atualiza as views."
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Executa os pipelines selecionados ao mesmo tempo (threads no mesmo processo)."
+    )
     return parser
 
 
-def run_scrapping_pipeline():
+def run_scrapping_pipeline(**kwargs):
     """Executa o pipeline de scraping."""
     print("Iniciando pipeline de scraping...")
     
     # Agora o pipeline instancia automaticamente as classes ETL
-    pipeline = ScrappingPipeline()
-    pipeline.run()
+    loader = ScrappingLoader(lake_path=kwargs.pop("lake_path", LAKE_PATH))
+    pipeline = ScrappingPipeline(loader=loader, metrics_path=kwargs.pop("metrics_path", METRICS_PATH))
+    pipeline.run(**kwargs)
     print("Pipeline de scraping concluído!")
 
 
-def run_api_pipeline():
+def run_api_pipeline(**kwargs):
     """Executa o pipeline da API."""
     print("Iniciando pipeline da API...")
-    pipeline = YFinancePipeline()
+    pipeline = YFinancePipeline(**kwargs)
     pipeline.run()
     print("Pipeline da API concluído!")
 
 
+def run_indicator_recompute(**kwargs):
+    """Recalcula os indicadores de prices diretamente no banco."""
+    print("Iniciando recálculo dos indicadores...")
+    YFinanceSqlTransform(**kwargs).do_transform()
+    print("Recálculo dos indicadores concluído!")
+
+
+def run_news_prices_refresh():
+    """Atualiza a tabela materializada news_prices com as notícias e barras novas."""
+    print("Atualizando ligações notícias × cotações...")
+    stats = NewsPriceLinks().refresh()
+    print(f"news_prices: {stats['news']} notícia(s) nova(s), {stats['rows']} linha(s) gravadas.")
+
+
+def run_lake_compaction(lake_path):
+    """Compacta as partições do lake e recria as views do catálogo."""
+    print("Compactando o lake Parquet...")
+    sinks = [news_lake_sink(lake_path), prices_lake_sink(lake_path)]
+    compacted = sum(sink.compact() for sink in sinks)
+    catalog = ensure_lake_views(sinks)
+    print(f"{compacted} partição(ões) compactada(s); catálogo: {catalog or '-'}")
+
+
+def _timed(func):
+    """Executa `func` e retorna (duração em segundos, exceção ou None)."""
+    start = time.perf_counter()
+    try:
+        func()
+        return time.perf_counter() - start, None
+    except Exception as err:
+        return time.perf_counter() - start, err
+
+
+def run_pipelines(pipelines, parallel=False):
+    """
+    Executa os pipelines em sequência ou em paralelo e exibe os tempos.
+
+    No modo paralelo cada pipeline roda em uma thread do mesmo processo:
+    o DuckDB só permite um processo escritor por arquivo, e as threads
+    compartilham a conexão de `config.database`, que serializa as escritas.
+    """
+    start = time.perf_counter()
+
+    if parallel and len(pipelines) > 1:
+        with ThreadPoolExecutor(max_workers=len(pipelines)) as executor:
+            futures = {name: executor.submit(_timed, func) for name, func in pipelines.items()}
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {}
+        for name, func in pipelines.items():
+            results[name] = _timed(func)
+            if results[name][1] is not None:
+                break
+
+    total = time.perf_counter() - start
+    print(f"Tempos ({'paralelo' if parallel else 'sequencial'}):")
+    for name, (elapsed, err) in results.items():
+        print(f"  {name:<10} {elapsed:8.2f}s{'  (falhou)' if err else ''}")
+    print(f"  {'total':<10} {total:8.2f}s")
+
+    for _, err in results.values():
+        if err is not None:
+            raise err
+    return results
+
+
 def main(argv=None):
     parser = build_parser()
     args = parser.parse_args(argv)
+    lake_path = args.lake_dir or LAKE_PATH
+    if args.compact_lake and not lake_path:
+        parser.error("--compact-lake requer --lake-dir (ou a variável lake_path).")
+    cache_dir = args.yf_cache_dir or YF_CACHE_PATH
+    offline = args.offline or YF_OFFLINE
+    if offline and not cache_dir:
+        parser.error("--offline requer --yf-cache-dir (ou a variável yf_cache_path).")
+
+    api_kwargs = {
+        "symbols": args.symbols,
+        "symbols_file": args.symbols_file,
+        "full_refresh": args.full_refresh,
+        "streaming": args.stream,
+        "metrics_path": args.metrics_file or METRICS_PATH,
+        "lake_path": lake_path,
+        "cache_dir": cache_dir,
+        "offline": offline,
+    }
+    scrapping_kwargs = {
+        "stop_at_known": not args.full_crawl,
+        "min_pages": args.min_pages,
+        "max_pages": args.max_pages,
+        "streaming": args.stream,
+        "metrics_path": args.metrics_file or METRICS_PATH,
+        "lake_path": lake_path,
+    }
+
+    run_all = not args.scrapping and not args.api and not args.recompute_indicators and not args.compact_lake
+    pipelines = {}
 
     # Se nenhum argumento foi passado, executa todos os pipelines
-    if not args.scrapping and not args.api:
+    if run_all:
         print("Executando todos os pipelines...")
-        run_scrapping_pipeline()
-        run_api_pipeline()
+
+    if args.scrapping or run_all:
+        pipelines["scrapping"] = partial(run_scrapping_pipeline, **scrapping_kwargs)
+
+    if args.api or run_all:
+        pipelines["api"] = partial(run_api_pipeline, **api_kwargs)
+
+    if pipelines:
+        run_pipelines(pipelines, parallel=args.parallel)
+
+    if run_all:
         print("Todos os pipelines foram executados!")
-        return
 
-    # Executa apenas o pipeline de scraping se especificado
-    if args.scrapping:
-        run_scrapping_pipeline()
-    
-    # Executa apenas o pipeline da API se especificado
-    if args.api:
-        run_api_pipeline()
+    # Recalcula os indicadores no banco se especificado
+    if args.recompute_indicators:
+        # Mesma normalização da extração: `btc-usd` precisa casar com `BTC-USD` no banco
+        run_indicator_recompute(symbols=normalize_symbols(args.symbols) or None)
+
+    # Liga as notícias às cotações depois que os pipelines gravaram
+    if pipelines or args.recompute_indicators:
+        run_news_prices_refresh()
+
+    if args.compact_lake:
+        run_lake_compaction(lake_path)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        close_all()
@@ -0,0 +1,205 @@
+import logging
+
+from api.tasks.loader import create_changes_table
+from config.database import arrow_table, get_manager
+from config.settings import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# Colunas de cada barra copiadas para a tabela materializada
+BAR_COLUMNS = ("close", "pct_change", "ma_7d", "ma_30d")
+# Prefixos: barra do dia da notícia e barra seguinte
+LEGS = ("day", "next")
+
+
+class NewsPriceLinks:
+    """
+    Tabela materializada `news_prices`: cada notícia ligada, para cada ativo,
+    à barra do dia e à barra seguinte.
+
+    - `day_*` é a última barra com `date <= data da notícia` (fim de semana e
+      feriado caem no último pregão) e `next_*` a primeira com `date >` a
+      data da notícia, ambas com `ASOF JOIN`;
+    - `refresh` é incremental: liga as notícias novas (`id` acima do último
+      processado), refaz as linhas afetadas pelas barras registradas em
+      `prices_changes` desde o último `seq` e liga o histórico aos ativos
+      novos;
+    - as entradas de `prices_changes` consumidas são removidas ao final
+      (`prune_changes=False` as mantém, se houver outros consumidores);
+    - notícias sem `data_noticia` ficam de fora.
+    """
+
+    def __init__(self, **kwargs):
+        self.db_path = kwargs.get("db_path", DB_PATH)
+        self.table = kwargs.get("table", "news_prices")
+        self.table_news = kwargs.get("table_news", "news")
+        self.table_prices = kwargs.get("table_prices", "prices")
+        self.columns = list(kwargs.get("columns", BAR_COLUMNS))
+        self.prune_changes = kwargs.get("prune_changes", True)
+        self.db = get_manager(self.db_path)
+
+    @property
+    def conn(self):
+        return self.db.cursor()
+
+    @property
+    def table_state(self):
+        return f"{self.table}_state"
+
+    def _create_schema(self, conn):
+        create_changes_table(conn, self.table_prices)
+        legs = ",\n".join(
+            f"                {leg}_date DATE" + "".join(f",\n                {leg}_{c} DOUBLE" for c in self.columns)
+            for leg in LEGS
+        )
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                news_id INTEGER,
+                symbol VARCHAR,
+                data_noticia TIMESTAMP,
+                news_date DATE,
+{legs},
+                PRIMARY KEY (news_id, symbol)
+            );
+        """)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table_state} (last_news_id BIGINT, last_change_seq BIGINT);")
+        logger.debug("🧱 Tabela '%s' criada/verificada.", self.table)
+
+    def _sources_ready(self, conn):
+        tables = {row[0] for row in conn.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+        return self.table_news in tables and self.table_prices in tables
+
+    def refresh(self, full=False):
+        """
+        Atualiza `news_prices` com as notícias e barras novas (`full=True`
+        recalcula tudo) e retorna as contagens.
+        """
+        stats = {"news": 0, "stale": 0, "rows": 0}
+        with self.db.writing() as conn:
+            if not self._sources_ready(conn):
+                logger.info("ℹ️ Tabelas '%s'/'%s' ausentes; '%s' não atualizada.", self.table_news, self.table_prices, self.table)
+                return stats
+
+            conn.execute("BEGIN TRANSACTION;")
+            try:
+                self._create_schema(conn)
+                if full:
+                    conn.execute(f"DELETE FROM {self.table};")
+                    conn.execute(f"DELETE FROM {self.table_state};")
+                stats = self._refresh(conn)
+                conn.execute("COMMIT;")
+            except Exception:
+                conn.execute("ROLLBACK;")
+                raise
+
+        logger.info(
+            "🔗 '%s' atualizada: %d notícia(s) nova(s) | %d ligação(ões) refeitas | %d linha(s) gravadas.",
+            self.table, stats["news"], stats["stale"], stats["rows"],
+        )
+        return stats
+
+    def _refresh(self, conn):
+        last_news_id, last_seq = conn.execute(
+            f"SELECT COALESCE(MAX(last_news_id), 0), COALESCE(MAX(last_change_seq), 0) FROM {self.table_state}"
+        ).fetchone()
+        news_hi = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {self.table_news}").fetchone()[0]
+        seq_hi = conn.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {self.table_prices}_changes").fetchone()[0]
+
+        # Faixa de datas alterada por ativo: superconjunto das ligações que podem mudar
+        changed = f"""
+            SELECT symbol, MIN(date) AS lo, MAX(date) AS hi
+            FROM {self.table_prices}_changes
+            WHERE seq > ? AND seq <= ?
+            GROUP BY symbol
+        """
+        new_symbols = arrow_table(conn.execute(f"""
+            SELECT c.symbol FROM ({changed}) c
+            WHERE NOT EXISTS (SELECT 1 FROM {self.table} l WHERE l.symbol = c.symbol)
+        """, [last_seq, seq_hi]))["symbol"].to_pylist()
+
+        # Barras novas/alteradas entre a barra do dia e a notícia (ou entre a notícia e a barra seguinte)
+        stale = arrow_table(conn.execute(f"""
+            DELETE FROM {self.table} l
+            USING ({changed}) c
+            WHERE l.symbol = c.symbol AND (
+                (l.news_date >= c.lo AND (l.day_date IS NULL OR l.day_date <= c.hi))
+                OR (l.news_date < c.hi AND (l.next_date IS NULL OR l.next_date >= c.lo))
+            )
+            RETURNING l.news_id, l.symbol
+        """, [last_seq, seq_hi]))
+
+        conn.register("temp_stale", stale)
+        try:
+            rows = conn.execute(f"""
+                INSERT INTO {self.table}
+                {self._build_query()}
+            """, [last_news_id, news_hi, new_symbols, last_news_id]).fetchone()[0]
+        finally:
+            conn.unregister("temp_stale")
+
+        conn.execute(f"DELETE FROM {self.table_state};")
+        conn.execute(f"INSERT INTO {self.table_state} VALUES (?, ?);", [news_hi, seq_hi])
+        if self.prune_changes:
+            # Já refletidas em `news_prices`: sem isso o registro cresce a cada carga de preços
+            conn.execute(f"DELETE FROM {self.table_prices}_changes WHERE seq <= ?;", [seq_hi])
+
+        new_news = conn.execute(
+            f"SELECT COUNT(*) FROM {self.table_news} WHERE id > ? AND id <= ? AND data_noticia IS NOT NULL",
+            [last_news_id, news_hi],
+        ).fetchone()[0]
+        return {"news": new_news, "stale": stale.num_rows, "rows": rows}
+
+    def _build_query(self):
+        """
+        SELECT das ligações a (re)calcular: notícias novas × todos os ativos,
+        ligações invalidadas (`temp_stale`) e histórico × ativos novos.
+        """
+        legs = []
+        for leg, alias in zip(LEGS, ("d", "x")):
+            legs.append(f"{alias}.date AS {leg}_date")
+            legs += [f"{alias}.{c} AS {leg}_{c}" for c in self.columns]
+
+        return f"""
+            WITH pairs AS (
+                SELECT n.id AS news_id, s.symbol
+                FROM {self.table_news} n
+                CROSS JOIN (SELECT DISTINCT symbol FROM {self.table_prices}) s
+                WHERE n.id > ? AND n.id <= ?
+                UNION
+                SELECT news_id, symbol FROM temp_stale
+                UNION
+                SELECT n.id, s.symbol
+                FROM {self.table_news} n
+                CROSS JOIN (SELECT unnest(?::VARCHAR[]) AS symbol) s
+                WHERE n.id <= ?
+            ),
+            targets AS (
+                SELECT p.news_id, p.symbol, n.data_noticia, CAST(n.data_noticia AS DATE) AS news_date
+                FROM pairs p
+                JOIN {self.table_news} n ON n.id = p.news_id
+                WHERE n.data_noticia IS NOT NULL
+            )
+            SELECT t.news_id, t.symbol, t.data_noticia, t.news_date, {", ".join(legs)}
+            FROM targets t
+            ASOF LEFT JOIN {self.table_prices} d
+                ON t.symbol = d.symbol AND t.news_date >= d.date
+            ASOF LEFT JOIN {self.table_prices} x
+                ON t.symbol = x.symbol AND t.news_date < x.date
+        """
+
+    def fetch(self, symbol=None, start=None, end=None):
+        """Ligações como DataFrame, filtradas por ativo e período de `data_noticia`."""
+        clauses, params = [], []
+        if symbol:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if start is not None:
+            clauses.append("data_noticia >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("data_noticia < ?")
+            params.append(end)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return self.conn.execute(
+            f"SELECT * FROM {self.table}{where} ORDER BY data_noticia DESC, news_id DESC, symbol", params
+        ).df()
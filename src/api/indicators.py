@@ -0,0 +1,294 @@
+import logging, duckdb
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from config.database import get_manager
+from config.settings import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# Indicadores padrão gravados em prices (nome da coluna → (tipo, janela em barras))
+DEFAULT_INDICATORS = {
+    "ma_7d": ("sma", 7),
+    "ma_30d": ("sma", 30),
+}
+
+# Tipos suportados:
+#   sma        → média móvel simples de `close`
+#   ema        → média móvel exponencial de `close` (alpha = 2 / (janela + 1))
+#   volatility → desvio padrão amostral de pct_change na janela
+INDICATOR_KINDS = ("sma", "ema", "volatility")
+
+# Linhas processadas por vez nas janelas deslizantes (limita a memória de std)
+_CHUNK_ROWS = 65_536
+
+
+def resolve_indicators(extra=None):
+    """Combina os indicadores padrão com os extras configurados e valida os tipos."""
+    indicators = dict(DEFAULT_INDICATORS)
+    indicators.update(extra or {})
+
+    for column, (kind, window) in indicators.items():
+        if kind not in INDICATOR_KINDS:
+            raise ValueError(f"Tipo de indicador desconhecido para '{column}': {kind}")
+        if int(window) < 1:
+            raise ValueError(f"Janela inválida para '{column}': {window}")
+    return indicators
+
+
+def _group_position(group_start):
+    """Posição de cada linha dentro do seu ativo (0 na primeira barra)."""
+    group_id = np.cumsum(group_start) - 1
+    first_row = np.flatnonzero(group_start)
+    return np.arange(len(group_start)) - first_row[group_id]
+
+
+def _sliding(values, window, func):
+    """Aplica `func` sobre cada janela de `window` valores, em blocos de linhas."""
+    result = np.full(len(values), np.nan)
+    for start in range(0, len(values) - window + 1, _CHUNK_ROWS):
+        stop = min(start + _CHUNK_ROWS + window - 1, len(values))
+        windows = np.lib.stride_tricks.sliding_window_view(values[start:stop], window)
+        result[start + window - 1:stop] = func(windows)
+    return result
+
+
+def rolling_mean(values, window, group_start):
+    """
+    Média móvel de `window` barras sobre um array ordenado por (symbol, date).
+
+    Cada média é calculada apenas com os valores da própria janela, então o
+    resultado de uma barra não depende de quanto histórico veio antes dela —
+    condição para o cálculo incremental bater exatamente com o recálculo completo.
+    `group_start` marca a primeira linha de cada ativo; janelas que cruzam a
+    fronteira entre ativos ficam NaN.
+    """
+    values = np.asarray(values, dtype="float64")
+    result = _sliding(values, window, lambda w: w.mean(axis=1))
+    result[_group_position(group_start) < window - 1] = np.nan
+    return result
+
+
+def rolling_std(values, window, group_start):
+    """Desvio padrão amostral (ddof=1) por janela, com as mesmas regras de `rolling_mean`."""
+    values = np.asarray(values, dtype="float64")
+    if window < 2:
+        return np.full(len(values), np.nan)
+
+    result = _sliding(values, window, lambda w: w.std(axis=1, ddof=1))
+    result[_group_position(group_start) < window - 1] = np.nan
+    return result
+
+
+class IndicatorEngine:
+    """
+    Calcula pct_change e os indicadores configurados de forma incremental.
+
+    Todos os ativos de um frame longo são processados juntos, sem laço por
+    ativo: as janelas deslizam sobre o array inteiro e as que cruzam a
+    fronteira entre ativos são descartadas.
+
+    Antes do cálculo, a janela de cada ativo é semeada com as últimas barras já
+    gravadas na tabela de preços (anteriores à primeira barra do lote). Assim
+    um lote com poucas barras novas produz os mesmos valores de um recálculo
+    sobre todo o histórico. As EMAs continuam a partir do último valor gravado.
+    """
+
+    def __init__(self, **kwargs):
+        self.db_path = kwargs.get("db_path", DB_PATH)
+        self.table_prices = kwargs.get("table_prices", "prices")
+        self.indicators = resolve_indicators(kwargs.get("indicators"))
+
+    @property
+    def columns(self):
+        """Colunas geradas pelo motor, na ordem em que são calculadas."""
+        return ["pct_change", *self.indicators]
+
+    @property
+    def lookback(self):
+        """Quantidade de barras anteriores necessárias para completar as janelas."""
+        needed = [1]  # pct_change precisa de ao menos a barra anterior
+        for kind, window in self.indicators.values():
+            if kind == "sma":
+                needed.append(window - 1)
+            elif kind == "volatility":
+                # `window` retornos dependem de `window + 1` fechamentos
+                needed.append(window)
+        return max(needed)
+
+    def compute(self, df, seed=None):
+        """Calcula os indicadores de `df` usando `seed` como histórico anterior."""
+        df = df.copy()
+        df["_seed"] = False
+
+        if seed is not None and not seed.empty:
+            seed = seed.assign(_seed=True)
+            df = pd.concat([seed, df], ignore_index=True)
+
+        df = df.sort_values(["symbol", "date"], ignore_index=True)
+        group_start = (df["symbol"] != df["symbol"].shift()).to_numpy()
+        close = df["close"].to_numpy(dtype="float64")
+
+        df["pct_change"] = df.groupby("symbol", sort=False)["close"].pct_change().fillna(0)
+        returns = df["pct_change"].to_numpy(dtype="float64")
+
+        for column, (kind, window) in self.indicators.items():
+            if kind == "sma":
+                df[column] = np.round(rolling_mean(close, window, group_start), 2)
+            elif kind == "volatility":
+                df[column] = rolling_std(returns, window, group_start)
+            elif kind == "ema":
+                df[column] = self._ema(df, column, window)
+
+        return df.loc[~df["_seed"]].drop(columns="_seed").reset_index(drop=True)
+
+    @staticmethod
+    def _ema(df, column, window):
+        """
+        EMA recursiva (adjust=False) agrupada por ativo.
+
+        Quando a última barra semeada já tem a EMA gravada, a recursão parte
+        desse valor e ignora as barras semeadas anteriores, reproduzindo a
+        mesma sequência de operações do cálculo completo.
+        """
+        values = df["close"].astype("float64")
+        if column in df.columns:
+            stored = df[column].astype("float64")
+            # Semente mais recente de cada ativo: a próxima linha é barra nova ou outro ativo
+            next_is_seed = df["_seed"].shift(-1, fill_value=False).astype(bool)
+            last_seed = df["_seed"] & (~next_is_seed | (df["symbol"] != df["symbol"].shift(-1)))
+            resume = last_seed & stored.notna()
+            values = values.where(~resume, stored)
+
+            # Em ativos que retomam da EMA gravada, as barras semeadas anteriores saem do cálculo
+            resumed_symbols = df.loc[resume, "symbol"]
+            skip = df["_seed"] & ~last_seed & df["symbol"].isin(resumed_symbols)
+            values = values.where(~skip)
+
+        return (
+            values.groupby(df["symbol"], sort=False)
+            .ewm(span=window, adjust=False, ignore_na=True)
+            .mean()
+            .reset_index(level=0, drop=True)
+        )
+
+    def load_seed(self, df):
+        """Lê de prices as últimas `lookback` barras de cada ativo anteriores ao lote."""
+        if not Path(self.db_path).exists():
+            return None
+
+        batch_start = df.groupby("symbol", as_index=False)["date"].min()
+        conn = get_manager(self.db_path).cursor()
+        try:
+            table_cols = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table_prices});").fetchall()}
+            ema_cols = [
+                column for column, (kind, _) in self.indicators.items()
+                if kind == "ema" and column in table_cols
+            ]
+            select_ema = "".join(f", p.{column}" for column in ema_cols)
+
+            conn.register("batch_start", batch_start)
+            seed = conn.execute(f"""
+                SELECT p.symbol, strftime(p.date, '%Y-%m-%d') AS date, p.close{select_ema}
+                FROM {self.table_prices} p
+                JOIN batch_start b
+                    ON p.symbol = b.symbol AND p.date < CAST(b.date AS DATE)
+                WHERE p.close IS NOT NULL
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY p.symbol ORDER BY p.date DESC) <= ?
+            """, [self.lookback]).df()
+
+            logger.debug("🌱 %d barras de histórico carregadas para semear os indicadores.", len(seed))
+            return seed
+
+        except duckdb.CatalogException:
+            logger.debug("🧱 Tabela '%s' ainda não existe; indicadores sem histórico.", self.table_prices)
+            return None
+
+        finally:
+            conn.unregister("batch_start")
+
+
+class SqlIndicatorEngine:
+    """
+    Recalcula pct_change e os indicadores diretamente no DuckDB.
+
+    Usa funções de janela `OVER (PARTITION BY symbol ORDER BY date ROWS ...)`
+    sobre a tabela de preços, com o mesmo contrato de colunas do
+    IndicatorEngine, sem trazer o histórico para o Python. Útil para
+    recálculos de todo o histórico (ex.: depois de configurar um novo
+    indicador). EMAs são recursivas e não têm forma exata com funções de
+    janela, então ficam a cargo do IndicatorEngine.
+    """
+
+    def __init__(self, **kwargs):
+        self.table_prices = kwargs.get("table_prices", "prices")
+        self.indicators = resolve_indicators(kwargs.get("indicators"))
+
+    @property
+    def columns(self):
+        """Colunas recalculadas no banco."""
+        return ["pct_change", *(c for c, (kind, _) in self.indicators.items() if kind != "ema")]
+
+    def build_query(self, symbols=None):
+        """Monta o SELECT (id + colunas de indicadores) calculado com funções de janela."""
+        selects, windows = [], []
+        for column, (kind, window) in self.indicators.items():
+            if kind == "ema":
+                continue
+
+            name = f"w_{column}"
+            windows.append(
+                f"{name} AS (PARTITION BY symbol ORDER BY date "
+                f"ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW)"
+            )
+            # Janelas incompletas (início do histórico) ficam NULL, como no pandas
+            if kind == "sma":
+                selects.append(
+                    f"CASE WHEN COUNT(close) OVER {name} = {window} "
+                    f"THEN ROUND(AVG(close) OVER {name}, 2) END AS {column}"
+                )
+            elif kind == "volatility":
+                selects.append(
+                    f"CASE WHEN COUNT(pct_change) OVER {name} = {window} AND {window} > 1 "
+                    f"THEN STDDEV_SAMP(pct_change) OVER {name} END AS {column}"
+                )
+
+        where = "AND list_contains(?, symbol)" if symbols else ""
+        select_str = "".join(f",\n                {s}" for s in selects)
+        window_str = ",\n                ".join(windows)
+        return f"""
+            WITH base AS (
+                SELECT
+                    id, symbol, date, close,
+                    COALESCE(close / LAG(close) OVER (PARTITION BY symbol ORDER BY date) - 1, 0) AS pct_change
+                FROM {self.table_prices}
+                WHERE close IS NOT NULL {where}
+            )
+            SELECT
+                id, pct_change{select_str}
+            FROM base
+            {"WINDOW " + window_str if windows else ""}
+        """
+
+    def recompute(self, conn, symbols=None):
+        """Atualiza os indicadores de `symbols` (ou de todos os ativos) e retorna o total de linhas."""
+        skipped = [c for c, (kind, _) in self.indicators.items() if kind == "ema"]
+        if skipped:
+            logger.warning("⚠️ Indicadores EMA não são recalculados em SQL: %s", ", ".join(skipped))
+
+        # Indicadores recém-configurados ainda não têm coluna na tabela
+        for column in self.columns:
+            conn.execute(f"ALTER TABLE {self.table_prices} ADD COLUMN IF NOT EXISTS {column} DOUBLE;")
+
+        set_str = ", ".join(f"{column} = calc.{column}" for column in self.columns)
+        params = [symbols] if symbols else []
+        updated = conn.execute(f"""
+            UPDATE {self.table_prices}
+            SET {set_str}
+            FROM ({self.build_query(symbols)}) calc
+            WHERE {self.table_prices}.id = calc.id
+        """, params).fetchone()[0]
+
+        logger.info("🧮 Indicadores recalculados no DuckDB para %d registros.", updated)
+        return updated
@@ -4,40 +4,76 @@ from api.tasks.extractor import YFinanceExtract
 from api.tasks.loader import YFinanceLoad
 from api.tasks.transformers import YFinanceTransform
 from bases.interfaces.pipeline import PipelineInterface
+from bases.metrics import counting
+from config.settings import METRICS_PATH
 
 logger = logging.getLogger(__name__)
 
 
 class YFinancePipeline(PipelineInterface):
-    
+    name = 'yfinance'
+
     def __init__(self, **kwargs):
-        self.extractor = kwargs.get('extractor', YFinanceExtract())
-        self.transformer = kwargs.get('transformer', YFinanceTransform())
-        self.loader = kwargs.get('loader', YFinanceLoad())
+        self.extractor = kwargs.get('extractor') or YFinanceExtract(**kwargs)
+        self.transformer = kwargs.get('transformer') or YFinanceTransform(**kwargs)
+        self.loader = kwargs.get('loader') or YFinanceLoad(**kwargs)
+        # Em fluxo, cada lote baixado é transformado e carregado antes dos seguintes
+        self.streaming = kwargs.get('streaming', False)
+        self.metrics_path = kwargs.get('metrics_path', METRICS_PATH)
 
     def run(self):
         start_time = time.perf_counter()
         logger.info("🚀 Iniciando pipeline de ETL para YFinance...")
 
+        with self.metrics.session():
+            self._run(start_time)
+
+    def _run(self, start_time):
         try:
+            if self.streaming:
+                self.run_stream()
+                logger.info("🏁 Pipeline YFinance (fluxo) finalizado em %.2fs", time.perf_counter() - start_time)
+                return
+
             # 1️⃣ Extração
             logger.info("📡 Iniciando extração de dados da API YFinance...")
-            data = self.extractor.do_extract()
+            with self.stage('extract') as stage:
+                data = self.extractor.do_extract()
+                stage.set_output(data)
             logger.info("✅ Extração concluída com sucesso (%d registros).", len(data))
 
             # 2️⃣ Transformação
             logger.info("⚙️ Iniciando transformação dos dados extraídos...")
-            transformed_data = self.transformer.do_transform(df=data)
+            with self.stage('transform', data) as stage:
+                transformed_data = self.transformer.do_transform(data=data)
+                stage.set_output(transformed_data)
             logger.info("✅ Transformação concluída. %d registros processados.", len(transformed_data))
 
             # 3️⃣ Carga
             logger.info("💾 Iniciando carga dos dados no banco DuckDB...")
-            self.loader.do_load(df=transformed_data)
+            with self.stage('load', transformed_data) as stage:
+                self.loader.do_load(df=transformed_data)
+                stats = self.loader.last_load_stats
+                stage.rows_out = stats["inserted"] + stats["updated"]
             logger.info("✅ Carga concluída com sucesso no banco '%s'.", self.loader.db_path)
 
             duration = time.perf_counter() - start_time
-            logger.info("🏁 Pipeline YFinance finalizado em %.2fs", duration)
+            logger.info("🏁 Pipeline YFinance finalizado em %.2fs (%s)", duration, self.metrics.summary())
 
         except Exception as e:
             logger.exception("❌ Falha durante a execução do pipeline YFinance: %s", e)
             raise
+
+    def run_stream(self):
+        """Executa extração → transformação → carga em fluxo, um lote de download por vez."""
+        with self.stage('stream') as stage:
+            batches = counting(self.extractor.iter_extract(), stage)
+            transformed = self.transformer.iter_transform(batches)
+
+            loaded = sum(1 for _ in self.loader.iter_load(transformed))
+            stats = self.loader.last_load_stats
+            stage.rows_out = stats["inserted"] + stats["updated"]
+        logger.info(
+            "✅ Fluxo concluído: %d lote(s) | %d inseridos | %d atualizados | %d inalterados.",
+            loaded, stats["inserted"], stats["updated"], stats["unchanged"],
+        )
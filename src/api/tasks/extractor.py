@@ -1,45 +1,77 @@
-import logging
+import logging, duckdb
+import pandas as pd
 import yfinance as yf
 
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from pathlib import Path
 
+from bases.cache import ParquetResponseCache
 from bases.interfaces.extractor import ExtractInterface
+from config.database import get_manager
+from config.settings import DB_PATH, YF_CACHE_PATH, YF_OFFLINE
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_symbols(symbols):
+    """Ativos em maiúsculas e sem espaços, sem vazios nem duplicados (ordem preservada)."""
+    return list(dict.fromkeys(s.strip().upper() for s in symbols or () if s and s.strip()))
+
+
 class YFinanceExtract(ExtractInterface):
-    
+
     def __init__(self, **kwargs):
         self.symbol = kwargs.get('symbol', 'BTC-USD')
+        self.symbols = kwargs.get('symbols')
+        self.symbols_file = kwargs.get('symbols_file')
         self.interval = kwargs.get('interval', '1d')
+        self.batch_size = kwargs.get('batch_size', 50)
+        self.max_workers = kwargs.get('max_workers', 4)
+        self.db_path = kwargs.get('db_path', DB_PATH)
+        self.table_prices = kwargs.get('table_prices', 'prices')
+        self.full_refresh = kwargs.get('full_refresh', False)
+        self.backfill_days = kwargs.get('backfill_days', 180)  # ~6 meses
+        self.overlap_days = kwargs.get('overlap_days', 3)
+        self.cache = kwargs.get('cache') or self._build_cache(**kwargs)
         super().__init__(**kwargs)
-    
+
+    @staticmethod
+    def _build_cache(**kwargs):
+        """
+        Cache em disco dos downloads, por (symbol, interval, start, end). Em
+        modo offline nada é baixado: só o que está no cache é usado.
+        """
+        cache_dir = kwargs.get('cache_dir', YF_CACHE_PATH)
+        offline = kwargs.get('offline', YF_OFFLINE)
+        if not cache_dir:
+            if offline:
+                raise ValueError("O modo offline do yfinance requer um diretório de cache (cache_dir).")
+            return None
+        return ParquetResponseCache(
+            Path(cache_dir),
+            ttl=kwargs.get('cache_ttl', 24 * 3600),
+            max_bytes=kwargs.get('cache_max_bytes', 512 * 1024 ** 2),
+            offline=offline,
+        )
+
     def do_extract(self):
         start_time = datetime.now()
-        logger.info("📡 Iniciando extração de dados para %s (%s)...", self.symbol, self.interval)
 
         try:
-            end_date = datetime.today()
-            start_date = end_date - timedelta(days=180)  # ~6 meses
-            logger.debug("🔍 Período solicitado: %s → %s", start_date.date(), end_date.date())
+            frames = list(self.iter_extract())
+            if not frames:
+                return pd.DataFrame()
 
-            df = yf.download(
-                self.symbol,
-                start=start_date.strftime("%Y-%m-%d"),
-                end=end_date.strftime("%Y-%m-%d"),
-                interval=self.interval,
-                multi_level_index=False
-            )
-
-            if df.empty:
-                logger.warning("⚠️ Nenhum dado foi retornado pela API do yfinance (%s).", self.symbol)
-                return df
+            df = pd.concat(frames, ignore_index=True)
+            df = df.sort_values(["symbol", "Date"], ignore_index=True)
 
-            logger.info("✅ Extração concluída com sucesso. %d registros obtidos.", len(df))
+            logger.info(
+                "✅ Extração concluída com sucesso. %d registros obtidos para %d ativo(s).",
+                len(df), df["symbol"].nunique(),
+            )
             logger.debug("📊 Colunas retornadas: %s", list(df.columns))
-
-            df.reset_index(inplace=True)
             return df
 
         except Exception as err:
@@ -49,3 +81,236 @@ class YFinanceExtract(ExtractInterface):
         finally:
             elapsed = (datetime.now() - start_time).total_seconds()
             logger.info("⏱️ Tempo total de extração: %.2fs", elapsed)
+
+    def iter_extract(self, **kwargs):
+        """
+        Gera um frame longo (symbol, Date, OHLCV) por lote de download, na ordem de conclusão.
+
+        No máximo `max_workers` downloads ficam em andamento, e um novo lote só
+        é submetido quando o anterior é consumido: a memória fica limitada ao
+        que está em trânsito, e a carga pode começar antes do último download.
+
+        Lotes que falham são registrados e os demais seguem; se todos falharem,
+        levanta `RuntimeError` (com a primeira falha como causa) em vez de
+        terminar como uma extração vazia.
+        """
+        symbols = self.get_symbols()
+        logger.info("📡 Iniciando extração de dados para %d ativo(s) (%s)...", len(symbols), self.interval)
+
+        end_date = datetime.today()
+        pending_batches = iter(self._plan_batches(symbols, end_date))
+        yielded = succeeded = 0
+        failures = []
+
+        # Cada lote vira um único yf.download; os lotes rodam em um pool limitado
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            futures = {}
+
+            def submit_next():
+                for batch, start_date in pending_batches:
+                    futures[executor.submit(self._download_batch, batch, start_date, end_date)] = batch
+                    return
+
+            for _ in range(max(1, self.max_workers)):
+                submit_next()
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = futures.pop(future)
+                    submit_next()
+                    try:
+                        frame = future.result()
+                    except Exception as err:
+                        logger.error("❌ Falha ao baixar o lote %s: %s", batch, err)
+                        failures.append((batch, err))
+                        continue
+                    succeeded += 1
+                    if not frame.empty:
+                        yielded += 1
+                        yield frame.sort_values(["symbol", "Date"], ignore_index=True)
+
+        if self.cache:
+            logger.info(
+                "🗃️ Cache do yfinance%s: %d acerto(s) | %d ausente(s) | %d vencido(s) | %d removido(s).",
+                " (offline)" if self.cache.offline else "", self.cache.stats["hits"], self.cache.stats["misses"],
+                self.cache.stats["expired"], self.cache.stats["evicted"],
+            )
+
+        if failures:
+            failed_symbols = [symbol for batch, _ in failures for symbol in batch]
+            if not succeeded:
+                raise RuntimeError(
+                    f"Todos os {len(failures)} lote(s) de download do yfinance falharam ({', '.join(failed_symbols)})."
+                ) from failures[0][1]
+            logger.warning(
+                "⚠️ %d de %d lote(s) falharam; ativos sem dados nesta execução: %s",
+                len(failures), len(failures) + succeeded, ", ".join(failed_symbols),
+            )
+        if not yielded:
+            logger.warning("⚠️ Nenhum dado foi retornado pela API do yfinance (%s).", ", ".join(symbols))
+
+    def get_symbols(self):
+        """Resolve a lista de ativos a partir de `symbols`, `symbols_file` ou `symbol`."""
+        symbols = []
+        if self.symbols:
+            symbols.extend(self.symbols)
+
+        if self.symbols_file:
+            # Um ativo por linha; linhas vazias e comentários (#) são ignorados
+            for line in Path(self.symbols_file).read_text(encoding="utf-8").splitlines():
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    symbols.append(line)
+
+        if not symbols:
+            symbols.append(self.symbol)
+
+        return normalize_symbols(symbols)
+
+    def get_watermarks(self, symbols):
+        """Retorna a última `date` armazenada em prices para cada ativo."""
+        if not Path(self.db_path).exists():
+            return {}
+
+        try:
+            rows = get_manager(self.db_path).cursor().execute(
+                f"SELECT symbol, MAX(date) FROM {self.table_prices} "
+                "WHERE list_contains(?, symbol) GROUP BY symbol",
+                [symbols],
+            ).fetchall()
+            return {symbol: last_date for symbol, last_date in rows if last_date is not None}
+
+        except duckdb.CatalogException:
+            logger.debug("🧱 Tabela '%s' ainda não existe; extração completa.", self.table_prices)
+            return {}
+
+    def _plan_batches(self, symbols, end_date):
+        """Agrupa os ativos pela data inicial e divide cada grupo em lotes de `batch_size`."""
+        backfill_start = end_date - timedelta(days=self.backfill_days)
+        watermarks = {} if self.full_refresh else self.get_watermarks(symbols)
+
+        groups = defaultdict(list)
+        for symbol in symbols:
+            last_date = watermarks.get(symbol)
+            if last_date is None:
+                start_date = backfill_start
+            else:
+                # Janela de sobreposição para capturar barras reajustadas pela fonte
+                start_date = datetime.combine(last_date, datetime.min.time()) - timedelta(days=self.overlap_days)
+            groups[start_date.date()].append(symbol)
+
+        logger.info(
+            "🔍 Modo %s: %d ativo(s) incrementais, %d com carga completa.",
+            "completo" if self.full_refresh else "incremental",
+            len(watermarks), len(symbols) - len(watermarks),
+        )
+
+        batches = []
+        for start_date, group in sorted(groups.items()):
+            logger.debug("🔍 Período solicitado: %s → %s (%d ativos)", start_date, end_date.date(), len(group))
+            start_date = datetime.combine(start_date, datetime.min.time())
+            for i in range(0, len(group), self.batch_size):
+                batches.append((group[i:i + self.batch_size], start_date))
+        return batches
+
+    def _download_batch(self, batch, start_date, end_date):
+        """
+        Baixa um lote de ativos em uma única chamada e devolve o frame em formato longo.
+
+        Com cache, só os ativos ausentes (ou vencidos) são baixados, e cada um
+        é gravado no cache separadamente.
+        """
+        start, end = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+        frames, missing = [], list(batch)
+        if self.cache:
+            frames, missing = self._from_cache(batch, start, end)
+            if missing and self.cache.offline:
+                logger.warning("📴 Modo offline: %d ativo(s) sem dados no cache: %s", len(missing), missing)
+                missing = []
+
+        if missing:
+            logger.debug("📦 Baixando lote com %d ativo(s): %s", len(missing), missing)
+            df = yf.download(
+                missing,
+                start=start,
+                end=end,
+                interval=self.interval,
+                group_by="ticker",
+                threads=False,
+                progress=False,
+            )
+            fresh = self._to_long_format(df, missing)
+            if self.cache and not fresh.empty:
+                for symbol, frame in fresh.groupby("symbol", sort=False):
+                    self.cache.put((symbol, self.interval, start, end), frame)
+            frames.append(fresh)
+
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _from_cache(self, batch, start, end):
+        """Separa o lote em frames do cache e ativos a baixar."""
+        frames, missing = [], []
+        for symbol in batch:
+            # Offline, a execução original pode ter sido em outra data: vale a entrada mais recente do ativo
+            frame = self.cache.get((symbol, self.interval, start, end), fallback=(symbol, self.interval))
+            if frame is not None and self.cache.offline:
+                self._warn_partial_range(symbol, frame.attrs.get('cache_key'), start, end)
+                frame = self._slice_dates(frame, start, end)
+            if frame is None:
+                missing.append(symbol)
+            else:
+                frames.append(frame)
+
+        if frames:
+            logger.debug("🗃️ %d de %d ativo(s) do lote servidos pelo cache.", len(frames), len(batch))
+        return frames, missing
+
+    @staticmethod
+    def _warn_partial_range(symbol, cache_key, start, end):
+        """Avisa quando a entrada repetida offline não cobre todo o período pedido."""
+        if not cache_key or len(cache_key) < 2:
+            return
+        # Datas ISO: a comparação de textos segue a ordem cronológica
+        cached_start, cached_end = cache_key[-2:]
+        if cached_start > start or cached_end < end:
+            logger.warning(
+                "📴 Modo offline: o cache de %s cobre só %s a %s (pedido: %s a %s); o período virá incompleto.",
+                symbol, cached_start, cached_end, start, end,
+            )
+
+    @staticmethod
+    def _slice_dates(frame, start, end):
+        """Linhas com `start <= Date < end` (o `end` do yfinance é exclusivo)."""
+        dates = frame["Date"]
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if dates.dt.tz is not None:
+            start, end = start.tz_localize(dates.dt.tz), end.tz_localize(dates.dt.tz)
+        return frame[(dates >= start) & (dates < end)].reset_index(drop=True)
+
+    @staticmethod
+    def _to_long_format(df, batch):
+        """Converte o retorno agrupado por ticker em linhas (symbol, Date, OHLCV)."""
+        if df is None or df.empty:
+            return pd.DataFrame()
+
+        if not isinstance(df.columns, pd.MultiIndex):
+            df = pd.concat({batch[0]: df}, axis=1)
+
+        frames = []
+        for symbol in df.columns.get_level_values(0).unique():
+            frame = df[symbol].dropna(how="all")
+            if frame.empty:
+                logger.warning("⚠️ Nenhum dado foi retornado pela API do yfinance (%s).", symbol)
+                continue
+
+            # Intradiário vem como "Datetime"; padroniza para "Date"
+            frame = frame.rename_axis("Date").reset_index()
+            frame.columns.name = None
+            frame.insert(0, "symbol", symbol)
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
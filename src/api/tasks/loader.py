@@ -1,51 +1,96 @@
-import logging, duckdb
-from pathlib import Path
+import logging
+import pyarrow.compute as pc
+from api.indicators import resolve_indicators
 from bases.interfaces.loader import LoadInterface
-from config.settings import DB_PATH
+from bases.lake import ParquetLakeSink
+from bases.metrics import track
+from config.database import arrow_table, get_manager
+from config.settings import DB_PATH, LAKE_PATH
 
 logger = logging.getLogger(__name__)
 
 
+def prices_lake_sink(root, table_prices="prices"):
+    """Cotações no lake: partições por ativo e ano, chave (symbol, date)."""
+    return ParquetLakeSink(root, table_prices, partition_by=["symbol", "year"], key=["symbol", "date"])
+
+
+def create_changes_table(conn, table_prices="prices"):
+    """
+    Registro das barras inseridas/alteradas (`<prices>_changes`), em ordem de `seq`.
+
+    Consumidores incrementais (ex.: `news_prices`) guardam o último `seq`
+    processado e releem apenas as barras mudadas desde então.
+    """
+    table = f"{table_prices}_changes"
+    conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {table}_seq START 1;")
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            seq BIGINT DEFAULT nextval('{table}_seq'),
+            symbol VARCHAR,
+            date DATE,
+            change VARCHAR,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    return table
+
+
 class YFinanceLoad(LoadInterface):
+    batch_kwarg = 'df'
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.db_path = kwargs.get("db_path", DB_PATH)
         self.table_instruments = kwargs.get("table_instruments", "instruments")
         self.table_prices = kwargs.get("table_prices", "prices")
-
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.indicator_columns = list(resolve_indicators(kwargs.get("indicators")))
+        self.last_load_stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+        self.db = get_manager(self.db_path)
+        # Cópia em Parquet das barras novas/alteradas, para leitura fora do banco
+        lake_path = kwargs.get("lake_path", LAKE_PATH)
+        self.lake = prices_lake_sink(lake_path, self.table_prices) if lake_path else None
 
     def do_load(self, **kwargs):
         """Carrega dados do YFinance em duas tabelas: instruments e prices."""
         df = kwargs.get("df")
-        symbol = kwargs.get("symbol", "BTC-USD")
+        self.last_load_stats = {"inserted": 0, "updated": 0, "unchanged": 0}
 
         if df is None or df.empty:
             logger.warning("⚠️ Nenhum dado fornecido para carga no banco.")
             return False
 
-        logger.info("💾 Iniciando carga de %d registros para o ativo '%s'...", len(df), symbol)
-        conn = None
-
-        try:
-            conn = duckdb.connect(self.db_path)
+        if "symbol" not in df.columns:
+            # `assign` devolve uma cópia: o DataFrame de quem chamou não é alterado
+            df = df.assign(symbol=kwargs.get("symbol", "BTC-USD"))
 
-            self._create_instruments_table(conn)
-            self._create_prices_table(conn)
-            self._ensure_instrument_exists(conn, symbol)
+        symbols = df["symbol"].unique().tolist()
+        logger.info("💾 Iniciando carga de %d registros para %d ativo(s)...", len(df), len(symbols))
+        conn = self.db.cursor()
 
-            df["symbol"] = symbol
+        try:
+            self.db.ensure_schema(f"yfinance:{self.table_instruments}:{self.table_prices}", self._create_schema)
             conn.register("temp_df", df)
 
             table_cols = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table_prices});").fetchall()]
             df_cols = [c for c in df.columns if c in table_cols]
-            cols_str = ", ".join(df_cols)
 
-            insert_query = f"INSERT INTO {self.table_prices} ({cols_str}) SELECT {cols_str} FROM temp_df"
-            conn.execute(insert_query)
+            with track('prices.upsert', df) as stage, self.db.writing():
+                self._ensure_instruments_exist(conn, symbols)
+                changed = self._changed_rows(conn, df_cols) if self.lake else None
+                inserted, updated = self._record_changes(conn, df_cols, changed)
+                self._upsert_prices(conn, df_cols)
+                stats = {"inserted": inserted, "updated": updated, "unchanged": len(df) - inserted - updated}
+                stage.rows_out = inserted + updated
+            self.last_load_stats = stats
+
+            if changed is not None:
+                self.lake.safe_append(changed.drop_columns(["change"]))
 
-            logger.info("✅ %d registros inseridos na tabela '%s' com sucesso.", len(df), self.table_prices)
+            logger.info(
+                "✅ Carga na tabela '%s' concluída: %d inseridos | %d atualizados | %d inalterados.",
+                self.table_prices, stats["inserted"], stats["updated"], stats["unchanged"],
+            )
             return True
 
         except Exception as err:
@@ -53,17 +98,30 @@ class YFinanceLoad(LoadInterface):
             return False
 
         finally:
-            if conn:
-                conn.close()
-                logger.debug("🔒 Conexão com o banco '%s' encerrada.", self.db_path)
+            conn.unregister("temp_df")
+
+    def iter_load(self, batches, **kwargs):
+        """Carrega cada lote transformado assim que ele chega; `last_load_stats` acumula o fluxo todo."""
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+        for loaded in super().iter_load(batches, **kwargs):
+            for key in totals:
+                totals[key] += self.last_load_stats[key]
+            yield loaded
+        self.last_load_stats = totals
 
     # -------------------------------------------------------------------
     # 🔧 Funções auxiliares
     # -------------------------------------------------------------------
+    def _create_schema(self, conn):
+        self._create_instruments_table(conn)
+        self._create_prices_table(conn)
+        create_changes_table(conn, self.table_prices)
+
     def _create_instruments_table(self, conn):
+        conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {self.table_instruments}_id_seq START 1;")
         query = f"""
             CREATE TABLE IF NOT EXISTS {self.table_instruments} (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY DEFAULT nextval('{self.table_instruments}_id_seq'),
                 symbol VARCHAR UNIQUE,
                 name VARCHAR,
                 sector VARCHAR,
@@ -74,9 +132,10 @@ class YFinanceLoad(LoadInterface):
         logger.debug("🧱 Tabela '%s' criada/verificada.", self.table_instruments)
 
     def _create_prices_table(self, conn):
+        conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {self.table_prices}_id_seq START 1;")
         query = f"""
             CREATE TABLE IF NOT EXISTS {self.table_prices} (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY DEFAULT nextval('{self.table_prices}_id_seq'),
                 symbol VARCHAR,
                 date DATE,
                 open DOUBLE,
@@ -91,12 +150,109 @@ class YFinanceLoad(LoadInterface):
             );
         """
         conn.execute(query)
+
+        # Indicadores extras configurados ganham sua própria coluna
+        for column in self.indicator_columns:
+            conn.execute(f"ALTER TABLE {self.table_prices} ADD COLUMN IF NOT EXISTS {column} DOUBLE;")
+
+        self._ensure_prices_key(conn)
         logger.debug("🧱 Tabela '%s' criada/verificada.", self.table_prices)
 
-    def _ensure_instrument_exists(self, conn, symbol):
-        query = f"SELECT COUNT(*) FROM {self.table_instruments} WHERE symbol = ?"
-        exists = conn.execute(query, [symbol]).fetchone()[0]
-        if not exists:
-            conn.execute(f"INSERT INTO {self.table_instruments} (symbol, name, sector) VALUES (?, ?, ?)",
-                         [symbol, symbol, "Crypto"])
-            logger.info("🔗 Novo instrumento adicionado: %s", symbol)
+    def _ensure_prices_key(self, conn):
+        """Garante o índice único (symbol, date), removendo duplicados de cargas antigas."""
+        index_name = f"{self.table_prices}_symbol_date_idx"
+        exists = conn.execute(
+            "SELECT COUNT(*) FROM duckdb_indexes() WHERE index_name = ?", [index_name]
+        ).fetchone()[0]
+        if exists:
+            return
+
+        removed = conn.execute(f"""
+            DELETE FROM {self.table_prices}
+            WHERE id NOT IN (SELECT MAX(id) FROM {self.table_prices} GROUP BY symbol, date)
+        """).fetchone()[0]
+        if removed:
+            logger.info("🧹 %d registros duplicados removidos de '%s'.", removed, self.table_prices)
+
+        conn.execute(f"CREATE UNIQUE INDEX {index_name} ON {self.table_prices} (symbol, date);")
+        logger.info("🔑 Índice único (symbol, date) criado em '%s'.", self.table_prices)
+
+    def _upsert_prices(self, conn, df_cols):
+        """Aplica temp_df em prices com um único INSERT ... ON CONFLICT (só as barras alteradas são reescritas)."""
+        value_cols = [c for c in df_cols if c not in ("symbol", "date")]
+        cols_str = ", ".join(df_cols)
+
+        set_str = ", ".join(f"{c} = EXCLUDED.{c}" for c in value_cols)
+        current_row = ", ".join(f"{self.table_prices}.{c}" for c in value_cols)
+        excluded_row = ", ".join(f"EXCLUDED.{c}" for c in value_cols)
+        conn.execute(f"""
+            INSERT INTO {self.table_prices} ({cols_str})
+            SELECT {cols_str} FROM temp_df
+            ON CONFLICT (symbol, date) DO UPDATE SET {set_str}
+            WHERE ROW({current_row}) IS DISTINCT FROM ROW({excluded_row})
+        """)
+
+    def _changed_from(self, value_cols):
+        """
+        Linhas de temp_df novas ou diferentes das gravadas (o que o upsert vai
+        escrever), com `change` = 'insert' ou 'update'.
+        """
+        target_row = ", ".join(f"p.{c}" for c in value_cols)
+        source_row = ", ".join(f"t.{c}" for c in value_cols)
+        return f"""
+            CASE WHEN p.id IS NULL THEN 'insert' ELSE 'update' END AS change
+            FROM temp_df t
+            LEFT JOIN {self.table_prices} p
+                ON p.symbol = t.symbol AND p.date = CAST(t.date AS DATE)
+            WHERE p.id IS NULL OR ROW({target_row}) IS DISTINCT FROM ROW({source_row})
+        """
+
+    def _changed_rows(self, conn, df_cols):
+        """Linhas novas/alteradas de temp_df em Arrow, com todas as colunas (destino: lake)."""
+        value_cols = [c for c in df_cols if c not in ("symbol", "date")]
+        return arrow_table(conn.execute(f"""
+            SELECT t.symbol, CAST(t.date AS DATE) AS date, {", ".join(f"t.{c}" for c in value_cols)},
+                   year(CAST(t.date AS DATE)) AS year,
+                   {self._changed_from(value_cols)}
+        """))
+
+    def _record_changes(self, conn, df_cols, changed=None):
+        """
+        Registra em `<prices>_changes` as barras que o upsert vai escrever, a
+        partir de `changed` (já calculado para o lake) ou direto de temp_df, e
+        retorna (inseridas, atualizadas). Um upsert que falhe depois deixa
+        entradas a mais, o que só faz os consumidores recalcularem essas barras.
+        """
+        insert = f"INSERT INTO {self.table_prices}_changes (symbol, date, change)"
+        if changed is None:
+            value_cols = [c for c in df_cols if c not in ("symbol", "date")]
+            changes = arrow_table(conn.execute(
+                f"{insert} SELECT t.symbol, CAST(t.date AS DATE), {self._changed_from(value_cols)} RETURNING change"
+            ))["change"]
+        else:
+            conn.register("temp_changes", changed)
+            try:
+                conn.execute(f"{insert} SELECT symbol, date, change FROM temp_changes")
+            finally:
+                conn.unregister("temp_changes")
+            changes = changed["change"]
+
+        inserted = pc.sum(pc.equal(changes, "insert")).as_py() or 0
+        return inserted, len(changes) - inserted
+
+    def _ensure_instruments_exist(self, conn, symbols):
+        """Cadastra, em um único comando, os ativos ainda ausentes em instruments."""
+        existing = {
+            row[0] for row in conn.execute(
+                f"SELECT symbol FROM {self.table_instruments} WHERE list_contains(?, symbol)", [symbols]
+            ).fetchall()
+        }
+        missing = [s for s in symbols if s not in existing]
+        if not missing:
+            return
+
+        conn.executemany(
+            f"INSERT INTO {self.table_instruments} (symbol, name, sector) VALUES (?, ?, ?)",
+            [[symbol, symbol, "Crypto"] for symbol in missing],
+        )
+        logger.info("🔗 %d novo(s) instrumento(s) adicionado(s): %s", len(missing), ", ".join(missing))
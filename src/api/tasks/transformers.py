@@ -1,35 +1,52 @@
 import logging
 import pandas as pd
+from api.indicators import IndicatorEngine, SqlIndicatorEngine
+from api.tasks.loader import create_changes_table
 from bases.interfaces.transformers import TransformInterface
+from bases.metrics import track
+from config.database import get_manager
+from config.settings import DB_PATH
 
 logger = logging.getLogger(__name__)
 
 
 class YFinanceTransform(TransformInterface):
-    
+
+    def __init__(self, **kwargs):
+        # Semeia as janelas com o histórico já gravado (necessário na extração incremental)
+        self.seed_from_db = kwargs.get('seed_from_db', True)
+        self.indicators = kwargs.get('indicator_engine') or IndicatorEngine(**kwargs)
+
     def do_transform(self, **kwargs):
         """Transforma e enriquece os dados financeiros extraídos via yfinance."""
         df = kwargs.get('data')
-        
+
         if df is None or df.empty:
             logger.warning("⚠️ Nenhum dado para transformar.")
             return pd.DataFrame()
-        
+
         logger.info("⚙️ Iniciando transformação de %d registros do YFinance...", len(df))
 
         try:
-            df = df.rename(columns=str.lower)
+            df = df.rename(columns=lambda c: str(c).lower().replace(" ", "_"))
             df = df.dropna(subset=["close"])
             logger.debug("🧹 Registros após remoção de valores nulos: %d", len(df))
-            df["pct_change"] = df["close"].pct_change().fillna(0)
+
+            if "symbol" not in df.columns:
+                df["symbol"] = kwargs.get("symbol", "BTC-USD")
 
             if "date" in df.columns:
                 df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.strftime("%Y-%m-%d")
 
-            df["ma_7d"] = df["close"].rolling(window=7).mean().round(2)
-            df["ma_30d"] = df["close"].rolling(window=30).mean().round(2)
+            # Em frames longos (vários ativos) a chave é (symbol, date)
+            df = df.drop_duplicates(subset=["symbol", "date"], keep="last")
 
-            df = df.drop_duplicates(subset=["date"], keep="last")
+            with track('indicators.seed', df) as stage:
+                seed = self.indicators.load_seed(df) if self.seed_from_db else None
+                stage.set_output(seed)
+            with track('indicators.compute', df) as stage:
+                df = self.indicators.compute(df, seed=seed)
+                stage.set_output(df)
 
             logger.info("✅ Transformação concluída com sucesso. %d registros finais.", len(df))
             logger.debug("📊 Colunas finais: %s", df.columns.tolist())
@@ -39,3 +56,45 @@ class YFinanceTransform(TransformInterface):
         except Exception as err:
             logger.exception("❌ Erro durante a transformação dos dados: %s", err)
             raise
+
+
+class YFinanceSqlTransform(TransformInterface):
+    """Recalcula os indicadores de todo o histórico de prices dentro do DuckDB."""
+
+    def __init__(self, **kwargs):
+        self.db_path = kwargs.get('db_path', DB_PATH)
+        self.symbols = kwargs.get('symbols')
+        self.indicators = kwargs.get('indicator_engine') or SqlIndicatorEngine(**kwargs)
+        self.table_prices = kwargs.get('table_prices', 'prices')
+
+    def do_transform(self, **kwargs):
+        """Atualiza os indicadores em prices e retorna a quantidade de registros recalculados."""
+        symbols = kwargs.get('symbols', self.symbols)
+        logger.info(
+            "⚙️ Iniciando recálculo dos indicadores no DuckDB (%s)...",
+            ", ".join(symbols) if symbols else "todos os ativos",
+        )
+
+        with get_manager(self.db_path).writing() as conn:
+            try:
+                conn.execute("BEGIN TRANSACTION")
+                updated = self.indicators.recompute(conn, symbols=symbols)
+                self._record_changes(conn, symbols)
+                conn.execute("COMMIT")
+
+                logger.info("✅ Recálculo concluído. %d registros atualizados.", updated)
+                return updated
+
+            except Exception as err:
+                conn.execute("ROLLBACK")
+                logger.exception("❌ Erro durante o recálculo dos indicadores: %s", err)
+                raise
+
+    def _record_changes(self, conn, symbols=None):
+        """Marca as barras recalculadas como alteradas para os consumidores incrementais."""
+        table = create_changes_table(conn, self.table_prices)
+        where = "WHERE list_contains(?, symbol)" if symbols else ""
+        conn.execute(
+            f"INSERT INTO {table} (symbol, date, change) SELECT symbol, date, 'update' FROM {self.table_prices} {where}",
+            [symbols] if symbols else [],
+        )
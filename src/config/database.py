@@ -0,0 +1,124 @@
+import atexit, logging, threading, duckdb
+import pyarrow as pa
+from contextlib import contextmanager
+from pathlib import Path
+
+from config.settings import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionManager:
+    """
+    Conexão DuckDB compartilhada pelo processo.
+
+    O arquivo do banco é aberto uma única vez (carga do catálogo e replay do
+    WAL acontecem só na primeira conexão). Cada thread recebe seu próprio
+    cursor, derivado da conexão principal, e a criação de tabelas/sequências
+    registrada em `ensure_schema` roda apenas uma vez por processo.
+
+    O DuckDB aceita um único processo escritor por arquivo; pipelines
+    concorrentes rodam em threads deste processo e serializam suas escritas
+    com `writing()`.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = str(db_path)
+        self._conn = None
+        self._lock = threading.RLock()
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._cursors = []
+        self._schemas = set()
+
+    @property
+    def connection(self):
+        """Conexão principal, aberta sob demanda."""
+        with self._lock:
+            if self._conn is None:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = duckdb.connect(self.db_path)
+                logger.debug("🔌 Conexão com o banco '%s' aberta.", self.db_path)
+            return self._conn
+
+    def cursor(self):
+        """Cursor da thread atual (reutilizado nas chamadas seguintes da mesma thread)."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            with self._lock:
+                cursor = self.connection.cursor()
+                self._cursors.append(cursor)
+            self._local.cursor = cursor
+        return cursor
+
+    @contextmanager
+    def writing(self):
+        """Seção de escrita exclusiva: devolve o cursor da thread atual."""
+        cursor = self.cursor()
+        with self._write_lock:
+            yield cursor
+
+    def ensure_schema(self, key, bootstrap):
+        """Executa `bootstrap(cursor)` apenas na primeira vez que `key` é solicitada."""
+        if key in self._schemas:
+            return
+
+        with self._lock, self._write_lock:
+            if key not in self._schemas:
+                bootstrap(self.cursor())
+                self._schemas.add(key)
+                logger.debug("🧱 Schema '%s' verificado no banco '%s'.", key, self.db_path)
+
+    def close(self):
+        """Fecha os cursores e a conexão principal."""
+        with self._lock:
+            for cursor in self._cursors:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            self._cursors.clear()
+            self._local = threading.local()
+            self._schemas.clear()
+
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                logger.debug("🔒 Conexão com o banco '%s' encerrada.", self.db_path)
+
+
+def arrow_table(result):
+    """Resultado de uma consulta como `pyarrow.Table` (o DuckDB recente devolve um leitor em fluxo)."""
+    table = result.arrow()
+    return table.read_all() if isinstance(table, pa.RecordBatchReader) else table
+
+
+def arrow_batches(result, batch_size):
+    """Resultado de uma consulta em `RecordBatch`es de até `batch_size` linhas, sem materializar tudo."""
+    reader = getattr(result, 'to_arrow_reader', None) or result.fetch_record_batch
+    return reader(batch_size)
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path=DB_PATH):
+    """Retorna o gerenciador de conexões do banco `db_path` (um por arquivo)."""
+    key = str(Path(db_path).resolve()) if db_path != ":memory:" else db_path
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = ConnectionManager(db_path)
+        return manager
+
+
+def close_all():
+    """Encerra todas as conexões abertas pelo processo."""
+    with _managers_lock:
+        for manager in _managers.values():
+            manager.close()
+        _managers.clear()
+
+
+atexit.register(close_all)
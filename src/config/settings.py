@@ -5,3 +5,10 @@ load_dotenv()
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.getenv("db_path", os.path.join(BASE_DIR, "data", "dck.db"))
+# Arquivo de métricas das etapas dos pipelines (`.prom` para Prometheus; senão JSON lines)
+METRICS_PATH = os.getenv("metrics_path")
+# Diretório do lake Parquet particionado (opcional; desativado se vazio)
+LAKE_PATH = os.getenv("lake_path")
+# Cache em disco dos downloads do yfinance (opcional) e repetição sem rede a partir dele
+YF_CACHE_PATH = os.getenv("yf_cache_path")
+YF_OFFLINE = os.getenv("yf_offline", "").lower() in ("1", "true", "yes")
@@ -0,0 +1,81 @@
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# Unidade (grupo nomeado na regex) → duração de uma unidade; meses ≈ 30 dias
+UNITS = {
+    'minutes': timedelta(minutes=1),
+    'hours': timedelta(hours=1),
+    'days': timedelta(days=1),
+    'weeks': timedelta(weeks=1),
+    'months': timedelta(days=30),
+}
+
+# Uma única alternação compilada para todos os formatos de tempo relativo
+RELATIVE_DATE_PATTERN = re.compile(
+    r'(?P<value>\d+)\s*(?:'
+    r'(?P<minutes>minutos?|min)|'
+    r'(?P<hours>horas?|h)|'
+    r'(?P<days>dias?|d)|'
+    r'(?P<weeks>semanas?|sem)|'
+    r'(?P<months>meses?|mês|m)'
+    r')\s*atrás?'
+)
+
+# Textos sem número (ex.: "ontem") → duração equivalente
+RELATIVE_WORDS = {
+    'ontem': timedelta(days=1),
+}
+
+# Datas absolutas exibidas para notícias mais antigas (ex.: "17/10/2025 às 10h30")
+ABSOLUTE_DATE_PATTERN = re.compile(
+    r'(?P<day>\d{1,2})/(?P<month>\d{1,2})/(?P<year>\d{4})'
+    r'(?:\D+(?P<hour>\d{1,2})\s*[h:]\s*(?P<minute>\d{2}))?'
+)
+
+
+@lru_cache(maxsize=1024)
+def parse_relative_date(text):
+    """
+    Interpreta o texto de data de uma notícia (memoizado).
+
+    Retorna um `timedelta` para textos relativos ("2 horas atrás"), um
+    `datetime` para datas absolutas ou `None` se o formato não for reconhecido.
+    """
+    text = text.strip().lower()
+    if text in RELATIVE_WORDS:
+        return RELATIVE_WORDS[text]
+
+    match = RELATIVE_DATE_PATTERN.search(text)
+    if match:
+        unit = next(name for name in UNITS if match.group(name))
+        return int(match.group('value')) * UNITS[unit]
+
+    match = ABSOLUTE_DATE_PATTERN.search(text)
+    if match:
+        try:
+            return datetime(
+                int(match.group('year')), int(match.group('month')), int(match.group('day')),
+                int(match.group('hour') or 0), int(match.group('minute') or 0),
+            )
+        except ValueError:
+            return None
+
+    return None
+
+
+def convert_relative_dates(texts, reference):
+    """
+    Converte um lote de textos de data em `datetime` usando um único instante de referência.
+
+    Todas as notícias de uma coleta são datadas a partir do mesmo `reference`
+    (o horário da extração); textos não reconhecidos viram `None` e a notícia
+    é mantida sem data (NULL no banco).
+    """
+    converted = []
+    for text in texts:
+        parsed = parse_relative_date(text) if text else None
+        if isinstance(parsed, timedelta):
+            parsed = reference - parsed
+        converted.append(parsed)
+    return converted
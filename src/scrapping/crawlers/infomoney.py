@@ -1,16 +1,25 @@
-import re
-from datetime import datetime
+import asyncio, logging, math, queue, threading, time
+from datetime import datetime, timedelta
 
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from bases.crawlers.async_fetcher import AsyncFetcher
 from bases.crawlers.base_crawler import BaseCrawler
+from bases.crawlers.http_client import HttpClient
+from bases.crawlers.readiness import ElementsPresent, POLL_FREQUENCY, collect_hrefs, count_matches, wait_for_count_above
 from bs4 import BeautifulSoup
+from scrapping.crawlers.dates import convert_relative_dates
+from scrapping.crawlers.parsers import get_listing_parser
+
+logger = logging.getLogger(__name__)
 
 
 class InfoMoneyCrawler(BaseCrawler):
     url = "https://www.infomoney.com.br/ultimas-noticias/"
+    # Páginas seguintes da listagem (o botão "carregar mais" percorre a mesma paginação)
+    PAGE_URL_TEMPLATE = "https://www.infomoney.com.br/ultimas-noticias/page/{page}/"
     LOAD_MORE_BUTTON = (
         By.XPATH,
         (
@@ -49,194 +58,361 @@ class InfoMoneyCrawler(BaseCrawler):
         ".//time | .//span[contains(@class, 'text-xs') or contains(@class, 'text-sm')]"
     )
     
+    ITEM_LINK = (
+        By.XPATH,
+        ITEM_CONTAINER[1] + "//div[contains(@class, 'md:line-clamp-3')]//a[contains(@class, 'hover:underline')]"
+    )
+
+    # Folga na comparação com a data mais recente armazenada (datas relativas são aproximadas)
+    DATE_WATERMARK_TOLERANCE = timedelta(days=1)
+
     def __init__(self, **kwargs):
-        kwargs.update(time_to_wait=2)
         super().__init__(**kwargs)
+        # Pronta quando a listagem aparece: a página tem anúncios e cotações que nunca param de mudar
+        if not kwargs.get('readiness'):
+            self.readiness = ElementsPresent(self.ITEM_CONTAINER)
+        # 'http' busca a listagem paginada via requests e usa o Selenium só como fallback;
+        # 'async' busca várias páginas em paralelo (e, opcionalmente, o texto das notícias)
+        self.mode = kwargs.get('mode', 'http')
+        self.fetch_articles = kwargs.get('fetch_articles', False)
+        self.minimum_items = kwargs.get('minimum_items', 100)
+        self.max_pages = kwargs.get('max_pages', 20)
+        self.page_url_template = kwargs.get('page_url_template', self.PAGE_URL_TEMPLATE)
+        self.http = kwargs.get('http_client') or HttpClient(**kwargs)
+        self.fetcher = kwargs.get('fetcher') or AsyncFetcher(**kwargs)
+        # Backend do parser da listagem: 'lxml' (padrão) ou 'bs4'
+        self.listing_parser = get_listing_parser(kwargs.get('parser', 'lxml'))
+        self.reference_time = None
+        self.data_extracao = None
+        # URLs já armazenadas: notícias conhecidas são descartadas e encerram a paginação
+        self.known_urls = kwargs.get('known_urls') or set()
+        self.reached_known = False
+        # Coleta incremental: para de paginar ao alcançar notícias já armazenadas,
+        # respeitando a profundidade mínima (`min_pages`) e máxima (`max_pages`)
+        self.stop_at_known = kwargs.get('stop_at_known', True)
+        self.min_pages = kwargs.get('min_pages', 1)
+        self.newest_stored_date = kwargs.get('newest_stored_date')
 
     def run(self):
         """Executa o crawling e retorna os dados processados."""
-        try:
-            info = {
-                'data_extracao': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            self.goto()
-            self._ensure_minimum_items_loaded()
-            page_source = self.get_page_source()
-            info.update(data=self._parser(page_source))
-            return info
-        finally:
-            pass
+        news_list = [news for batch in self.iter_run() for news in batch]
+        return {'data_extracao': self.data_extracao, 'data': news_list}
 
-    def _ensure_minimum_items_loaded(self, minimum=100):
-        wait = WebDriverWait(self.driver, 20)
-        try:
-            wait.until(EC.presence_of_all_elements_located(self.ITEM_CONTAINER))
-        except TimeoutException:
-            return
-        previous_total = len(self.driver.find_elements(*self.ITEM_CONTAINER))
-        
-        while previous_total < minimum:
-            try:
-                load_more = wait.until(EC.element_to_be_clickable(self.LOAD_MORE_BUTTON))
-            except TimeoutException:
+    def iter_run(self):
+        """
+        Gera as notícias novas em lotes, uma página da listagem por vez.
+
+        Cada lote é entregue assim que a página é parseada, permitindo que a
+        carga comece antes do fim da coleta; `run()` apenas junta os lotes.
+        """
+        # Um único instante de referência para as datas relativas de toda a coleta
+        self.reference_time = datetime.now().replace(microsecond=0)
+        self.data_extracao = self.reference_time.strftime('%Y-%m-%d %H:%M:%S')
+        self.reached_known = False
+        self.timings.reset()
+        self.budget.start()
+        started = time.perf_counter()
+
+        if self.mode == 'async':
+            batches = self._iter_async()
+        elif self.mode == 'http':
+            batches = self._iter_http()
+        else:
+            batches = iter(())
+
+        total = 0
+        for batch in batches:
+            total += len(batch)
+            yield batch
+
+        # Nenhuma notícia só aciona o Selenium se a listagem falhou (não se tudo já estava armazenado)
+        if not total and not self.reached_known:
+            if self.budget.expired:
+                logger.warning("⏳ Orçamento de tempo da coleta esgotado; fallback com Selenium ignorado.")
+            else:
+                batch = self._run_selenium()
+                if batch:
+                    yield batch
+
+        logger.info(
+            "⏱️ Coleta concluída em %.2fs — %s",
+            time.perf_counter() - started, self.timings.summary(),
+        )
+
+    def _iter_http(self):
+        """Percorre as páginas da listagem via HTTP até reunir `minimum_items` notícias."""
+        seen_urls = set()
+        fetched = total = 0
+
+        for page in range(1, self.max_pages + 1):
+            if self.budget.expired:
+                logger.warning("⏳ Orçamento de tempo da coleta esgotado na página %d.", page)
                 break
-            
-            self._click(load_more)
+
+            page_url = self._page_url(page)
             try:
-                wait.until(
-                    lambda driver: len(driver.find_elements(*self.ITEM_CONTAINER)) > previous_total
-                )
-            except TimeoutException:
+                with self.timings.phase('download'):
+                    page_source = self.http.get_text(page_url)
+            except Exception as err:
+                logger.warning("⚠️ Falha ao buscar a página %d da listagem (%s): %s", page, page_url, err)
                 break
-            
-            previous_total = len(self.driver.find_elements(*self.ITEM_CONTAINER))
-            
-        print(f"Loaded {len(self.driver.find_elements(*self.ITEM_CONTAINER))} items.")
 
-    def _parser(self, page_source):
-        """Extrai dados estruturados das notícias da página."""
-        soup = BeautifulSoup(page_source, 'html.parser')
+            fetched += 1
+            parsed = self._parser(page_source)
+            page_news = self._filter_new(parsed, seen_urls)
+            if page_news:
+                total += len(page_news)
+                yield page_news
+            # Para em página vazia/repetida, ao completar `minimum_items` ou ao alcançar o já armazenado
+            if not page_news and not self.reached_known:
+                break
+            if total >= self.minimum_items or self._should_stop(page):
+                break
+
+        if total or self.reached_known:
+            logger.info("🌐 %d notícias novas obtidas via HTTP (%d página(s)).", total, fetched)
+        else:
+            logger.warning("⚠️ Listagem via HTTP sem notícias; usando o Selenium como fallback.")
+
+    def _filter_new(self, items, seen_urls):
+        """
+        Mantém só as notícias ainda não vistas nesta coleta nem armazenadas no banco.
+
+        Atualiza `seen_urls` e marca `reached_known` quando aparece uma notícia
+        de `known_urls` ou quando todas as notícias do lote são mais antigas que
+        a notícia mais recente do banco (`newest_stored_date`, com folga).
+        """
         news_list = []
-        
-        # Encontra todos os containers de notícias
-        news_containers = soup.find_all('div', class_=lambda x: x and 'basis-1/4' in x and 'px-6' in x and 'md:px-0' in x)
-        
-        for container in news_containers:
-            try:
-                news_data = self._extract_news_data(container)
-                if news_data:
-                    news_list.append(news_data)
-            except Exception as e:
-                print(f"Erro ao extrair dados de uma notícia: {e}")
-                continue
-        
-        print(f"Extraídas {len(news_list)} notícias com dados completos.")
+        for news in items:
+            url = news['url_noticia']
+            if url in self.known_urls:
+                self.reached_known = True
+            elif url not in seen_urls:
+                seen_urls.add(url)
+                news_list.append(news)
+
+        if items and self.newest_stored_date is not None:
+            limit = self.newest_stored_date - self.DATE_WATERMARK_TOLERANCE
+            if all(n['data_noticia'] is not None and n['data_noticia'] < limit for n in items):
+                self.reached_known = True
         return news_list
-    
-    def _extract_news_data(self, container):
-        """Extrai dados específicos de um container de notícia."""
-        news_data = {
-            'tipo_noticia': self._extract_news_type(container),
-            'titulo_noticia': self._extract_news_title(container),
-            'url_noticia': self._extract_news_url(container),
-            'data_noticia': self._extract_news_date(container),
-        }
-        
-        # Só retorna se tiver pelo menos título e URL
-        if news_data['titulo_noticia'] and news_data['url_noticia']:
-            return news_data
-        return
-    
-    def _extract_news_type(self, container):
-        """Extrai o tipo/categoria da notícia."""
-        type = None
-        try:
-            # Procura por spans com classes específicas que podem indicar categoria
-            type_element = container.find('div', class_='line-clamp-1').find('div', class_='text-sm')
-            if type_element:
-                type = type_element.get_text(strip=True)
 
-        except:
-            pass
+    def _should_stop(self, pages_loaded):
+        """Encerramento antecipado: notícias conhecidas alcançadas após a profundidade mínima."""
+        return self.stop_at_known and self.reached_known and pages_loaded >= self.min_pages
 
-        return type
+    def _page_url(self, page):
+        return self.url if page == 1 else self.page_url_template.format(page=page)
 
-    def _extract_news_title(self, container):
-        """Extrai o título da notícia."""
-        title = None
-        try:
-            title_element = container.find('div', class_='md:line-clamp-3').find('a', class_='hover:underline')
-            if title_element:
-                title = title_element.get_text(strip=True)
+    async def stream(self):
+        """Gera as notícias parseadas, uma a uma, à medida que as páginas da listagem chegam."""
+        async for items in self.stream_pages():
+            for item in items:
+                yield item
 
-        except:
-            pass
-    
-        return title
+    async def stream_pages(self):
+        """
+        Gera as notícias novas de cada página da listagem à medida que as páginas chegam.
 
-    def _extract_news_url(self, container):
-        """Extrai a URL da notícia."""
-        url = None
-        try:
-            link_element = container.find('div', class_='md:line-clamp-3').find('a', class_='hover:underline')
-            if link_element:
-                url = link_element['href']
-                if url.startswith('/'):
-                    url = f"https://www.infomoney.com.br{url}"
-        except:
-            pass
-        
-        return url
-    
-    def _extract_news_date(self, container):
-        """Extrai a data da notícia e converte formato relativo para absoluto."""
-        date_text = None
+        A primeira página é buscada sozinha para estimar quantas notícias vêm por
+        página; as seguintes são buscadas em ondas paralelas do tamanho necessário
+        para completar `minimum_items` (limitadas pela concorrência do fetcher).
+        """
+        self.fetcher.reset()
+        seen_urls = set()
+        per_page = None
+        page = 1
+
+        while page <= self.max_pages and len(seen_urls) < self.minimum_items:
+            if self.budget.expired:
+                logger.warning("⏳ Orçamento de tempo da coleta esgotado na página %d.", page)
+                break
+
+            remaining = self.minimum_items - len(seen_urls)
+            wave_size = 1 if per_page is None else min(self.fetcher.concurrency, math.ceil(remaining / per_page))
+            pages = range(page, min(page + wave_size, self.max_pages + 1))
+            parsed_in_wave = new_in_wave = 0
+
+            async for page_url, body in self.fetcher.fetch_many([self._page_url(p) for p in pages]):
+                if isinstance(body, Exception):
+                    logger.warning("⚠️ Falha ao buscar a página da listagem %s: %s", page_url, body)
+                    continue
+
+                parsed = self._parser(body)
+                items = self._filter_new(parsed, seen_urls)
+                parsed_in_wave += len(parsed)
+                new_in_wave += len(items)
+
+                if self.fetch_articles:
+                    with self.timings.phase('artigos'):
+                        await self._attach_articles(items)
+                if items:
+                    yield items
+
+            # Para em onda vazia/repetida ou ao alcançar o já armazenado (após `min_pages`)
+            if not parsed_in_wave or (not new_in_wave and not self.reached_known):
+                break
+            if self._should_stop(pages.stop - 1):
+                break
+            per_page = per_page or math.ceil(parsed_in_wave / len(pages))
+            page = pages.stop
+
+    def _iter_async(self):
+        """
+        Consome `stream_pages()` em uma thread com seu próprio event loop.
+
+        As páginas passam por uma fila limitada, então a coleta fica no máximo
+        `concurrency` páginas à frente de quem consome os lotes.
+        """
+        pages, stop, done = queue.Queue(maxsize=self.fetcher.concurrency), threading.Event(), object()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        async def produce():
+            async for items in self.stream_pages():
+                await asyncio.to_thread(put, items)
+                if stop.is_set():
+                    break
+
+        def worker():
+            try:
+                asyncio.run(produce())
+            except Exception as err:
+                put(err)
+            finally:
+                put(done)
+
+        thread = threading.Thread(target=worker, name="infomoney-async", daemon=True)
+        thread.start()
+        total = 0
         try:
-            # Procura por elemento com a data relativa
-            time_element = container.find('div', class_='text-wl-neutral-500')
-            if time_element:
-                date_text = self._convert_relative_to_absolute_date(time_element.get_text(strip=True))
-            
-        except Exception as e:
-            pass
+            while (item := pages.get()) is not done:
+                if isinstance(item, Exception):
+                    raise item
+                total += len(item)
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+        if total or self.reached_known:
+            logger.info("🌐 %d notícias obtidas via HTTP assíncrono.", total)
+        else:
+            logger.warning("⚠️ Listagem assíncrona sem notícias; usando o Selenium como fallback.")
+
+    async def _attach_articles(self, items):
+        """Busca em paralelo a página de cada notícia e adiciona o texto em `conteudo_noticia`."""
+        by_url = {item['url_noticia']: item for item in items}
+        async for url, body in self.fetcher.fetch_many(list(by_url)):
+            if isinstance(body, Exception):
+                logger.debug("⚠️ Falha ao buscar a notícia %s: %s", url, body)
+                continue
+            by_url[url]['conteudo_noticia'] = self._parse_article(body)
+
+    def _parse_article(self, page_source):
+        """Extrai o texto corrido (parágrafos) da página de uma notícia."""
+        soup = BeautifulSoup(page_source, 'html.parser')
+        root = soup.find('article') or soup.body or soup
+        paragraphs = (p.get_text(' ', strip=True) for p in root.find_all('p'))
+        return "\n".join(p for p in paragraphs if p)
+
+    def _run_selenium(self):
+        """Carrega a listagem no navegador clicando em "carregar mais"."""
+        self.goto()
+        self._ensure_minimum_items_loaded(self.minimum_items)
+        page_source = self.get_page_source()
+        return self._filter_new(self._parser(page_source), set())
+
+    def _ensure_minimum_items_loaded(self, minimum=100):
+        with self.timings.phase('prontidao'):
+            if not ElementsPresent(self.ITEM_CONTAINER).wait(self.driver, self.budget.timeout(self.wait_timeout)):
+                return
+        # Contagens feitas no navegador (XPath `count()`), sem trazer os elementos para o Python
+        previous_total = count_matches(self.driver, self.ITEM_CONTAINER[1])
+        pages_loaded, checked_links = 1, 0
         
-        return date_text
-    
-    def _convert_relative_to_absolute_date(self, relative_date_text):
-        """Converte data relativa (ex: '53 minutos atrás') para data absoluta."""
-        try:
-            from datetime import datetime, timedelta
-            
-            text = relative_date_text.strip().lower()
+        while previous_total < minimum and pages_loaded < self.max_pages:
+            checked_links = self._check_known_links(checked_links)
+            if self._should_stop(pages_loaded):
+                logger.info("⏹️ Notícias já armazenadas alcançadas após %d carregamento(s).", pages_loaded)
+                break
+            if self.budget.expired:
+                logger.warning("⏳ Orçamento de tempo da coleta esgotado após %d carregamento(s).", pages_loaded)
+                break
+
+            with self.timings.phase('carregar_mais'):
+                try:
+                    load_more = WebDriverWait(
+                        self.driver, self.budget.timeout(self.wait_timeout), poll_frequency=POLL_FREQUENCY
+                    ).until(EC.element_to_be_clickable(self.LOAD_MORE_BUTTON))
+                except TimeoutException:
+                    break
+
+                self._click(load_more)
+                # Acorda assim que os novos itens entram no DOM (MutationObserver)
+                total = wait_for_count_above(
+                    self.driver, self.ITEM_CONTAINER[1], previous_total, self.budget.timeout(self.wait_timeout)
+                )
+            if total <= previous_total:
+                break
+
+            previous_total = total
+            pages_loaded += 1
             
-            # Padrões para diferentes tipos de tempo relativo
-            patterns = [
-                # Minutos
-                (r'(\d+)\s*minutos?\s*atrás?', 'minutes'),
-                (r'(\d+)\s*min\s*atrás?', 'minutes'),
-                # Horas
-                (r'(\d+)\s*horas?\s*atrás?', 'hours'),
-                (r'(\d+)\s*h\s*atrás?', 'hours'),
-                # Dias
-                (r'(\d+)\s*dias?\s*atrás?', 'days'),
-                (r'(\d+)\s*d\s*atrás?', 'days'),
-                # Semanas
-                (r'(\d+)\s*semanas?\s*atrás?', 'weeks'),
-                (r'(\d+)\s*sem\s*atrás?', 'weeks'),
-                # Meses
-                (r'(\d+)\s*meses?\s*atrás?', 'months'),
-                (r'(\d+)\s*m\s*atrás?', 'months'),
+        logger.debug("📄 %d notícias carregadas no navegador.", previous_total)
+
+    def _check_known_links(self, start=0):
+        """Verifica os links carregados a partir de `start` contra `known_urls`; retorna o total verificado."""
+        if not (self.stop_at_known and self.known_urls):
+            return start
+
+        hrefs = collect_hrefs(self.driver, self.ITEM_LINK[1], start)
+        if any(href in self.known_urls for href in hrefs):
+            self.reached_known = True
+        return start + len(hrefs)
+
+    def _parser(self, page_source, reference=None):
+        """Extrai dados estruturados das notícias da página."""
+        # Só mantém notícias com pelo menos título e URL
+        with self.timings.phase('parser'):
+            news_list = [
+                n for n in self.listing_parser.parse(page_source, self.url)
+                if n['titulo_noticia'] and n['url_noticia']
             ]
-            
-            for pattern, unit in patterns:
-                match = re.search(pattern, text)
-                if match:
-                    value = int(match.group(1))
-                    now = datetime.now()
-                    
-                    if unit == 'minutes':
-                        target_date = now - timedelta(minutes=value)
-                    elif unit == 'hours':
-                        target_date = now - timedelta(hours=value)
-                    elif unit == 'days':
-                        target_date = now - timedelta(days=value)
-                    elif unit == 'weeks':
-                        target_date = now - timedelta(weeks=value)
-                    elif unit == 'months':
-                        # Para meses, usamos aproximadamente 30 dias
-                        target_date = now - timedelta(days=value * 30)
-                    else:
-                        return relative_date_text  # Retorna o texto original se não conseguir converter
-                    
-                    # Retorna a data formatada
-                    return target_date.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Se não encontrou nenhum padrão, retorna o texto original
-            return relative_date_text
-            
-        except Exception as e:
-            print(f"Erro ao converter data relativa '{relative_date_text}': {e}")
-            return relative_date_text
+
+        # Converte as datas da página em lote, todas a partir do horário da coleta
+        dates = convert_relative_dates(
+            [n['data_noticia'] for n in news_list], reference or self._reference_time()
+        )
+        unparsed = []
+        for news_data, date in zip(news_list, dates):
+            if date is None and news_data['data_noticia']:
+                unparsed.append(news_data['data_noticia'])
+            news_data['data_noticia'] = date
+        if unparsed:
+            logger.warning(
+                "⚠️ %d notícia(s) com data não reconhecida mantida(s) sem data: %s",
+                len(unparsed), sorted(set(unparsed))[:5],
+            )
+
+        logger.debug("🧩 %d notícias extraídas com dados completos.", len(news_list))
+        return news_list
+
+    def _convert_relative_to_absolute_date(self, relative_date_text, reference=None):
+        """Converte uma data relativa (ex: '53 minutos atrás') para `datetime` (ou None)."""
+        return convert_relative_dates([relative_date_text], reference or self._reference_time())[0]
+
+    def _reference_time(self):
+        """Instante de referência da coleta atual (fixado em `run`)."""
+        if self.reference_time is None:
+            self.reference_time = datetime.now().replace(microsecond=0)
+        return self.reference_time
 
     def _click(self, element):
         try:
@@ -0,0 +1,197 @@
+import logging
+from abc import ABC, abstractmethod
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from lxml import etree, html
+
+logger = logging.getLogger(__name__)
+
+
+class ListingParser(ABC):
+    """
+    Extrai os campos brutos das notícias de uma página de listagem do InfoMoney.
+
+    Cada item traz `tipo_noticia`, `titulo_noticia`, `url_noticia` (absoluta) e
+    `data_noticia` com o texto relativo da página ("2 horas atrás"); a
+    conversão da data fica a cargo do crawler.
+    """
+
+    @abstractmethod
+    def parse(self, page_source, base_url):
+        pass
+
+
+class BeautifulSoupListingParser(ListingParser):
+    """Backend original: BeautifulSoup com `html.parser`."""
+
+    def parse(self, page_source, base_url):
+        soup = BeautifulSoup(page_source, 'html.parser')
+        news_list = []
+
+        # Encontra todos os containers de notícias
+        news_containers = soup.find_all('div', class_=lambda x: x and 'basis-1/4' in x and 'px-6' in x and 'md:px-0' in x)
+
+        for container in news_containers:
+            try:
+                news_list.append({
+                    'tipo_noticia': self._extract_news_type(container),
+                    'titulo_noticia': self._extract_news_title(container),
+                    'url_noticia': self._extract_news_url(container, base_url),
+                    'data_noticia': self._extract_news_date(container),
+                })
+            except Exception as e:
+                logger.warning("⚠️ Erro ao extrair dados de uma notícia: %s", e)
+                continue
+
+        return news_list
+
+    def _extract_news_type(self, container):
+        """Extrai o tipo/categoria da notícia."""
+        type = None
+        try:
+            # Procura por spans com classes específicas que podem indicar categoria
+            type_element = container.find('div', class_='line-clamp-1').find('div', class_='text-sm')
+            if type_element:
+                type = type_element.get_text(strip=True)
+
+        except Exception:
+            pass
+
+        return type
+
+    def _extract_news_title(self, container):
+        """Extrai o título da notícia."""
+        title = None
+        try:
+            title_element = container.find('div', class_='md:line-clamp-3').find('a', class_='hover:underline')
+            if title_element:
+                title = title_element.get_text(strip=True)
+
+        except Exception:
+            pass
+
+        return title
+
+    def _extract_news_url(self, container, base_url):
+        """Extrai a URL da notícia."""
+        url = None
+        try:
+            link_element = container.find('div', class_='md:line-clamp-3').find('a', class_='hover:underline')
+            if link_element:
+                url = link_element['href']
+                if url.startswith('/'):
+                    url = urljoin(base_url, url)
+        except Exception:
+            pass
+
+        return url
+
+    def _extract_news_date(self, container):
+        """Extrai o texto da data relativa da notícia."""
+        date_text = None
+        try:
+            time_element = container.find('div', class_='text-wl-neutral-500')
+            if time_element:
+                date_text = time_element.get_text(strip=True)
+
+        except Exception:
+            pass
+
+        return date_text
+
+
+class LxmlListingParser(ListingParser):
+    """
+    Backend lxml: XPath pré-compilado para os containers e uma única passada por container.
+
+    A passada percorre os `div` do container em ordem de documento e guarda o
+    primeiro bloco de tipo, o primeiro bloco de título/link e a primeira data;
+    o link fornece título e URL juntos. A semântica é a mesma do backend
+    BeautifulSoup (primeiro elemento em ordem de documento, texto com `strip`
+    de cada trecho).
+    """
+
+    CONTAINERS = etree.XPath(
+        "//div[contains(@class, 'basis-1/4') and contains(@class, 'px-6') and contains(@class, 'md:px-0')]"
+    )
+
+    def parse(self, page_source, base_url):
+        if not page_source or not page_source.strip():
+            return []
+
+        root = html.fromstring(page_source)
+        news_list = []
+
+        for container in self.CONTAINERS(root):
+            try:
+                news_list.append(self._extract(container, base_url))
+            except Exception as e:
+                logger.warning("⚠️ Erro ao extrair dados de uma notícia: %s", e)
+                continue
+
+        return news_list
+
+    def _extract(self, container, base_url):
+        type_box = link_box = date_element = None
+        for element in container.iterdescendants('div'):
+            classes = element.get('class')
+            if not classes:
+                continue
+
+            classes = classes.split()
+            if type_box is None and 'line-clamp-1' in classes:
+                type_box = element
+            if link_box is None and 'md:line-clamp-3' in classes:
+                link_box = element
+            if date_element is None and 'text-wl-neutral-500' in classes:
+                date_element = element
+            if type_box is not None and link_box is not None and date_element is not None:
+                break
+
+        type_element = self._first(type_box, 'div', 'text-sm')
+        link_element = self._first(link_box, 'a', 'hover:underline')
+
+        url = None
+        if link_element is not None:
+            url = link_element.get('href')
+            if url and url.startswith('/'):
+                url = urljoin(base_url, url)
+
+        return {
+            'tipo_noticia': self._text(type_element),
+            'titulo_noticia': self._text(link_element),
+            'url_noticia': url,
+            'data_noticia': self._text(date_element),
+        }
+
+    @staticmethod
+    def _first(parent, tag, class_name):
+        """Primeiro descendente `tag` de `parent` com a classe `class_name`."""
+        if parent is None:
+            return None
+        for element in parent.iterdescendants(tag):
+            if class_name in (element.get('class') or '').split():
+                return element
+        return None
+
+    @staticmethod
+    def _text(element):
+        """Equivalente a `get_text(strip=True)` do BeautifulSoup."""
+        if element is None:
+            return None
+        return "".join(text.strip() for text in element.itertext() if text.strip())
+
+
+PARSERS = {
+    'bs4': BeautifulSoupListingParser,
+    'lxml': LxmlListingParser,
+}
+
+
+def get_listing_parser(name='lxml'):
+    """Instancia o backend de parser pelo nome ('lxml' ou 'bs4')."""
+    try:
+        return PARSERS[name]()
+    except KeyError:
+        raise ValueError(f"Parser desconhecido: {name!r} (opções: {', '.join(PARSERS)})")
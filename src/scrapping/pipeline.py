@@ -1,8 +1,12 @@
 import logging
 import time
+import pandas as pd
 from bases.interfaces.extractor import ExtractInterface
 from bases.interfaces.loader import LoadInterface
+from bases.interfaces.pipeline import PipelineInterface
 from bases.interfaces.transformers import TransformInterface
+from bases.metrics import counting
+from config.settings import METRICS_PATH
 from scrapping.tasks.extractor import ScrappingExtractor
 from scrapping.tasks.transformer import ScrappingTransformer
 from scrapping.tasks.loader import ScrappingLoader
@@ -11,45 +15,95 @@ from scrapping.tasks.loader import ScrappingLoader
 logger = logging.getLogger(__name__)
 
 
-class ScrappingPipeline:
+class ScrappingPipeline(PipelineInterface):
+    name = 'scrapping'
+
     def __init__(
         self,
         extractor: ExtractInterface = None,
         transformer: TransformInterface = None,
         loader: LoadInterface = None,
+        metrics_path=METRICS_PATH,
     ):
         self.extractor = extractor or ScrappingExtractor()
         self.transformer = transformer or ScrappingTransformer()
         self.loader = loader or ScrappingLoader()
+        self.metrics_path = metrics_path
 
     def run(self, **kwargs):
         start_time = time.perf_counter()
         logger.info("🚀 Iniciando pipeline de Scraping...")
 
+        with self.metrics.session():
+            self._run(start_time, **kwargs)
+
+    def _run(self, start_time, **kwargs):
         try:
+            # Notícias já armazenadas: o crawler as ignora e para de paginar ao alcançá-las
+            if kwargs.get('skip_known', True) and 'known_urls' not in kwargs:
+                with self.stage('known_urls') as stage:
+                    kwargs['known_urls'] = self.loader.get_known_urls()
+                    latest = self.loader.get_latest_news()
+                    if latest:
+                        kwargs['known_urls'].add(latest['url'])
+                        kwargs.setdefault('newest_stored_date', latest['data_noticia'])
+                    stage.rows_out = len(kwargs['known_urls'])
+
+            if kwargs.get('streaming'):
+                self.run_stream(**kwargs)
+                logger.info("🏁 Pipeline de Scraping (fluxo) finalizado em %.2fs", time.perf_counter() - start_time)
+                return
+
             # ETAPA 1: Extração
             logger.info("📡 Iniciando extração de dados...")
-            data_extracted = self.extractor.do_extract(**kwargs)
+            with self.stage('extract') as stage:
+                data_extracted = self.extractor.do_extract(**kwargs)
+                stage.set_output(data_extracted)
             logger.info("✅ Extração concluída com sucesso (%d registros).", len(data_extracted))
 
             # ETAPA 2: Transformação
             logger.info("⚙️ Iniciando transformação de dados...")
-            data_transformed = self.transformer.do_transform(
-                data_extracted=data_extracted, **kwargs
-            )
+            with self.stage('transform', data_extracted) as stage:
+                data_transformed = self.transformer.do_transform(
+                    data_extracted=data_extracted, **kwargs
+                )
+                stage.set_output(data_transformed)
             logger.info("✅ Transformação concluída. %d registros processados.", len(data_transformed))
 
             # ETAPA 3: Carga
             logger.info("💾 Iniciando carga dos dados...")
-            self.loader.do_load(data_transformed=data_transformed, **kwargs)
+            with self.stage('load', data_transformed) as stage:
+                self.loader.do_load(data_transformed=data_transformed, **kwargs)
+                stage.rows_out = getattr(self.loader, 'last_load_stats', {}).get('inserted')
             logger.info("✅ Carga concluída com sucesso no destino final.")
 
-            df_news = self.loader.get_news_as_dataframe()
-            logger.debug("📊 Preview dos dados carregados:\n%s", df_news.head())
+            # Preview do próprio lote em memória (sem consultar a tabela inteira)
+            if logger.isEnabledFor(logging.DEBUG):
+                preview = pd.DataFrame(data_transformed.get('data', [])[:5])
+                logger.debug("📊 Preview dos dados carregados:\n%s", preview)
 
             elapsed = time.perf_counter() - start_time
-            logger.info("🏁 Pipeline de Scraping finalizado em %.2fs", elapsed)
+            logger.info("🏁 Pipeline de Scraping finalizado em %.2fs (%s)", elapsed, self.metrics.summary())
 
         except Exception as err:
             logger.exception("❌ Erro durante a execução do pipeline: %s", err)
             raise
+
+    def run_stream(self, **kwargs):
+        """
+        Executa extração → transformação → carga em fluxo, página a página.
+
+        Cada lote extraído é validado e carregado antes da próxima página ser
+        processada, com memória limitada ao lote em trânsito.
+        """
+        with self.stage('stream') as stage:
+            batches = counting(self.extractor.iter_extract(**kwargs), stage)
+            transformed = self.transformer.iter_transform(batches, **kwargs)
+
+            loaded = sum(1 for _ in self.loader.iter_load(transformed, **kwargs))
+            stats = getattr(self.loader, 'last_load_stats', {})
+            stage.rows_out = stats.get('inserted')
+        logger.info(
+            "✅ Fluxo concluído: %d lote(s) | %d notícias novas | %d já existentes.",
+            loaded, stats.get('inserted', 0), stats.get('skipped', 0),
+        )
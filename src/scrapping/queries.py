@@ -0,0 +1,163 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from config.database import arrow_table, get_manager
+from config.settings import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+NEWS_COLUMNS = ("id", "data_importacao", "tipo", "titulo", "url", "data_noticia")
+
+# Formatos de saída: conversões nativas do DuckDB, sem passar linha a linha pelo Python
+OUTPUTS = {
+    "df": lambda result: result.df(),
+    "arrow": arrow_table,
+    "numpy": lambda result: result.fetchnumpy(),
+}
+
+
+class NewsPage:
+    """Uma página de resultados e o cursor `(data_noticia, id)` para buscar a seguinte."""
+
+    def __init__(self, data, next_cursor):
+        self.data = data
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class NewsQuery:
+    """
+    Consultas de leitura sobre `news`, com filtros aplicados no DuckDB.
+
+    - filtros: período de `data_noticia` (`start` inclusivo, `end` exclusivo),
+      `tipo` (um valor ou lista) e texto no título (`text`, sem diferenciar
+      maiúsculas);
+    - paginação por chave (keyset) em `(data_noticia, id)`, da notícia mais
+      recente para a mais antiga: cada página continua de onde a anterior
+      parou, sem `OFFSET`; notícias sem data vêm ao final;
+    - saída em `df`, `arrow` ou `numpy`, convertida pelo próprio DuckDB.
+
+    Os filtros de período aproveitam os zonemaps da tabela (as notícias
+    chegam aproximadamente em ordem de data); o índice ART de `url` atende
+    `get_by_url`.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.db = get_manager(db_path)
+
+    @property
+    def conn(self):
+        return self.db.cursor()
+
+    @staticmethod
+    def _where(start=None, end=None, tipo=None, text=None, after=None):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("data_noticia >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("data_noticia < ?")
+            params.append(end)
+        if tipo:
+            if isinstance(tipo, str):
+                clauses.append("tipo = ?")
+                params.append(tipo)
+            else:
+                clauses.append("list_contains(?, tipo)")
+                params.append(list(tipo))
+        if text:
+            clauses.append("contains(lower(titulo), lower(?))")
+            params.append(text)
+        if after is not None:
+            # Continua após o cursor na ordem (data_noticia DESC NULLS LAST, id DESC)
+            after_date, after_id = after
+            if after_date is None:
+                clauses.append("(data_noticia IS NULL AND id < ?)")
+                params.append(after_id)
+            else:
+                clauses.append("(data_noticia < ? OR (data_noticia = ? AND id < ?) OR data_noticia IS NULL)")
+                params += [after_date, after_date, after_id]
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def page(self, limit=100, after=None, output="df", columns=None, **filters):
+        """
+        Retorna uma `NewsPage` com até `limit` notícias após o cursor `after`.
+
+        `columns` limita as colunas lidas; `data_noticia` e `id` são sempre
+        incluídas, pois formam o cursor.
+        """
+        if output not in OUTPUTS:
+            raise ValueError(f"Formato de saída desconhecido: {output!r} (use {', '.join(OUTPUTS)}).")
+
+        columns = list(dict.fromkeys([*(columns or NEWS_COLUMNS), "data_noticia", "id"]))
+        where, params = self._where(after=after, **filters)
+        query = (
+            f"SELECT {', '.join(columns)} FROM news{where} "
+            "ORDER BY data_noticia DESC NULLS LAST, id DESC"
+        )
+        if limit:
+            # Uma linha a mais indica se há próxima página
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        rows = self.conn.execute(query, params)
+        data = OUTPUTS[output](rows)
+        data, next_cursor = self._split_page(data, output, limit)
+        logger.debug("🔎 %d notícia(s) retornadas%s.", self._length(data, output), " (há mais)" if next_cursor else "")
+        return NewsPage(data, next_cursor)
+
+    def iter_pages(self, page_size=1000, output="df", columns=None, **filters):
+        """Percorre todas as páginas do filtro, da notícia mais recente para a mais antiga."""
+        after = None
+        while True:
+            page = self.page(page_size, after=after, output=output, columns=columns, **filters)
+            if self._length(page.data, output):
+                yield page.data
+            if not page.has_next:
+                return
+            after = page.next_cursor
+
+    def fetch(self, limit=None, output="df", columns=None, **filters):
+        """Todas as notícias do filtro (ou as `limit` mais recentes), sem cursor."""
+        return self.page(limit, output=output, columns=columns, **filters).data
+
+    def count(self, **filters):
+        where, params = self._where(**filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM news{where}", params).fetchone()[0]
+
+    def get_by_url(self, url, output="df"):
+        """Busca pontual pela URL (índice ART único `news_url_idx`)."""
+        return OUTPUTS[output](self.conn.execute(
+            f"SELECT {', '.join(NEWS_COLUMNS)} FROM news WHERE url = ?", [url]
+        ))
+
+    @staticmethod
+    def _length(data, output):
+        if output == "numpy":
+            return len(data["id"])
+        return data.num_rows if output == "arrow" else len(data)
+
+    @classmethod
+    def _split_page(cls, data, output, limit):
+        """Remove a linha extra da consulta e devolve `(dados, cursor da próxima página)`."""
+        if not limit or cls._length(data, output) <= limit:
+            return data, None
+
+        if output == "arrow":
+            data = data.slice(0, limit)
+            last_date, last_id = data["data_noticia"][limit - 1].as_py(), data["id"][limit - 1].as_py()
+        elif output == "numpy":
+            data = {name: values[:limit] for name, values in data.items()}
+            last_date, last_id = data["data_noticia"][limit - 1], data["id"][limit - 1]
+        else:
+            data = data.iloc[:limit]
+            last_date, last_id = data["data_noticia"].iloc[-1], data["id"].iloc[-1]
+
+        if last_date is np.ma.masked or pd.isna(last_date):
+            return data, (None, int(last_id))
+        return data, (pd.Timestamp(last_date).to_pydatetime(), int(last_id))
@@ -0,0 +1,184 @@
+import logging
+
+from config.database import get_manager
+from config.settings import DB_PATH
+from scrapping.queries import OUTPUTS
+
+logger = logging.getLogger(__name__)
+
+# Palavras sem valor de busca (já sem acento, como os termos indexados)
+STOPWORDS = (
+    "de", "da", "do", "das", "dos", "em", "no", "na", "nos", "nas", "um", "uma", "uns", "umas",
+    "os", "as", "ao", "aos", "para", "pra", "por", "pelo", "pela", "com", "sem", "que", "se",
+    "mais", "menos", "sobre", "apos", "ate", "entre", "como", "seu", "sua", "seus", "suas",
+    "ser", "sao", "foi", "tem", "ja", "nao", "ou", "mas", "diz", "eh",
+)
+
+
+def tokens_sql(expr):
+    """Expressão SQL com os termos de `expr`: minúsculas, sem acento, separados por não alfanuméricos."""
+    return f"string_split_regex(lower(strip_accents({expr})), '[^a-z0-9]+')"
+
+
+_TERM_FILTER = "length(term) > 1 AND term NOT IN ({})".format(", ".join(f"'{w}'" for w in STOPWORDS))
+
+
+class NewsSearchIndex:
+    """
+    Índice invertido de `news.titulo` dentro do próprio DuckDB, com ranking BM25.
+
+    - `news_terms` guarda uma linha por (termo, notícia) com a frequência do
+      termo, o tamanho do título e a `data_noticia` (filtros de período sem
+      consultar `news`); o índice ART em `term` atende a busca pontual;
+    - `news_fts_docs` registra as notícias já indexadas: `update` processa
+      apenas as de `id` maior que o último indexado, na mesma transação da
+      carga;
+    - a tokenização é a mesma em SQL para títulos e consultas, sem depender
+      da extensão `fts` (que exige download e reconstrução completa).
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.db = get_manager(db_path)
+
+    @property
+    def conn(self):
+        return self.db.cursor()
+
+    def create_schema(self, conn=None):
+        conn = conn or self.conn
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS news_terms (
+                term VARCHAR,
+                news_id INTEGER,
+                tf INTEGER,
+                doc_len INTEGER,
+                data_noticia TIMESTAMP
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS news_fts_docs (news_id INTEGER PRIMARY KEY, doc_len INTEGER)")
+        conn.execute("CREATE INDEX IF NOT EXISTS news_terms_term_idx ON news_terms (term)")
+        logger.debug("🔤 Tabelas do índice de busca verificadas/criadas.")
+
+    def update(self, conn=None):
+        """Indexa as notícias ainda não indexadas; retorna quantas foram processadas."""
+        conn = conn or self.conn
+        last_id = conn.execute("SELECT COALESCE(MAX(news_id), 0) FROM news_fts_docs").fetchone()[0]
+
+        conn.execute(f"""
+            INSERT INTO news_terms
+            SELECT term, news_id, COUNT(*)::INTEGER, ANY_VALUE(doc_len)::INTEGER, ANY_VALUE(data_noticia)
+            FROM (
+                SELECT *, COUNT(*) OVER (PARTITION BY news_id) AS doc_len
+                FROM (
+                    SELECT id AS news_id, data_noticia, unnest({tokens_sql('titulo')}) AS term
+                    FROM news
+                    WHERE id > ?
+                )
+                WHERE {_TERM_FILTER}
+            )
+            GROUP BY term, news_id
+        """, [last_id])
+
+        indexed = conn.execute("""
+            INSERT INTO news_fts_docs
+            SELECT n.id, COALESCE(t.doc_len, 0)
+            FROM news n
+            LEFT JOIN (
+                SELECT news_id, ANY_VALUE(doc_len) AS doc_len FROM news_terms WHERE news_id > ? GROUP BY news_id
+            ) t ON t.news_id = n.id
+            WHERE n.id > ?
+        """, [last_id, last_id]).fetchone()[0]
+
+        if indexed:
+            logger.debug("🔤 %d notícia(s) adicionada(s) ao índice de busca.", indexed)
+        return indexed
+
+    def rebuild(self):
+        """Reconstrói o índice a partir de toda a tabela `news`."""
+        with self.db.writing() as conn:
+            conn.execute("BEGIN TRANSACTION;")
+            try:
+                conn.execute("DELETE FROM news_terms;")
+                conn.execute("DELETE FROM news_fts_docs;")
+                indexed = self.update(conn)
+                conn.execute("COMMIT;")
+            except Exception:
+                conn.execute("ROLLBACK;")
+                raise
+        logger.info("🔤 Índice de busca reconstruído com %d notícia(s).", indexed)
+        return indexed
+
+    def tokenize(self, text):
+        """Termos de busca de `text`, com as mesmas regras da indexação."""
+        rows = self.conn.execute(f"""
+            SELECT DISTINCT term FROM (SELECT unnest({tokens_sql('?')}) AS term)
+            WHERE {_TERM_FILTER}
+        """, [text]).fetchall()
+        return [row[0] for row in rows]
+
+    def search(self, query, start=None, end=None, limit=20, match="all", output="df"):
+        """
+        Notícias que contêm os termos de `query`, ordenadas por relevância (BM25).
+
+        `match='all'` exige todos os termos; `'any'`, pelo menos um. `start`
+        (inclusivo) e `end` (exclusivo) filtram `data_noticia`. O resultado
+        traz as colunas da notícia, `score` e `matched` (termos encontrados).
+        """
+        if output not in OUTPUTS:
+            raise ValueError(f"Formato de saída desconhecido: {output!r} (use {', '.join(OUTPUTS)}).")
+
+        terms = self.tokenize(query)
+        if not terms:
+            logger.debug("🔎 Consulta sem termos pesquisáveis: %r", query)
+            terms = [""]
+
+        dates, params = [], []
+        if start is not None:
+            dates.append("h.data_noticia >= ?")
+            params.append(start)
+        if end is not None:
+            dates.append("h.data_noticia < ?")
+            params.append(end)
+        date_filter = ("WHERE " + " AND ".join(dates)) if dates else ""
+        min_matched = len(terms) if match == "all" else 1
+
+        result = self.conn.execute(f"""
+            WITH stats AS (
+                SELECT COUNT(*) AS n, GREATEST(AVG(doc_len), 1) AS avgdl FROM news_fts_docs
+            ),
+            hits AS MATERIALIZED (
+                SELECT term, news_id, tf, doc_len, data_noticia
+                FROM news_terms
+                WHERE term IN ({", ".join("?" * len(terms))})
+            ),
+            df AS (
+                SELECT term, COUNT(*) AS df FROM hits GROUP BY term
+            ),
+            ranked AS (
+                SELECT
+                    h.news_id,
+                    SUM(
+                        ln(1 + (s.n - df.df + 0.5) / (df.df + 0.5))
+                        * h.tf * ({self.K1} + 1)
+                        / (h.tf + {self.K1} * (1 - {self.B} + {self.B} * h.doc_len / s.avgdl))
+                    ) AS score,
+                    COUNT(*) AS matched
+                FROM hits h
+                JOIN df USING (term)
+                CROSS JOIN stats s
+                {date_filter}
+                GROUP BY h.news_id
+                HAVING COUNT(*) >= ?
+                ORDER BY score DESC, h.news_id DESC
+                LIMIT ?
+            )
+            SELECT n.id, n.data_noticia, n.tipo, n.titulo, n.url, r.score, r.matched
+            FROM ranked r
+            JOIN news n ON n.id = r.news_id
+            ORDER BY r.score DESC, n.data_noticia DESC, n.id DESC
+        """, [*terms, *params, min_matched, limit])
+        return OUTPUTS[output](result)
@@ -1,4 +1,6 @@
 import logging
+from contextlib import contextmanager
+
 from bases.interfaces.extractor import ExtractInterface
 from scrapping.crawlers.infomoney import InfoMoneyCrawler
 
@@ -13,9 +15,8 @@ class ScrappingExtractor(ExtractInterface):
     def do_extract(self, **kwargs):
         """Extrai dados usando o crawler com gerenciamento automático de recursos."""
         logger.info("📡 Iniciando extração de dados com InfoMoneyCrawler...")
-
         try:
-            with self.crawler as crawler:
+            with self._run_options(**kwargs), self.crawler as crawler:
                 raw_content = crawler.run()
 
             # Validação básica do retorno
@@ -29,3 +30,36 @@ class ScrappingExtractor(ExtractInterface):
         except Exception as err:
             logger.exception("❌ Erro durante a extração de dados: %s", err)
             raise
+
+    def iter_extract(self, **kwargs):
+        """Gera os dados extraídos página a página, no mesmo formato de `do_extract`."""
+        logger.info("📡 Iniciando extração em fluxo com InfoMoneyCrawler...")
+        with self._run_options(**kwargs), self.crawler as crawler:
+            for batch in crawler.iter_run():
+                yield {'data_extracao': crawler.data_extracao, 'data': batch}
+
+    def _run_options(self, **kwargs):
+        """Opções do crawler válidas só para esta execução (as padrão são restauradas ao final)."""
+        options = {}
+        # Permite escolher o modo do crawler por execução ('http', 'async' ou 'selenium')
+        if kwargs.get('mode'):
+            options['mode'] = kwargs['mode']
+        # URLs já armazenadas (fornecidas pelo pipeline a partir do loader)
+        if 'known_urls' in kwargs:
+            options['known_urls'] = kwargs['known_urls'] or set()
+        # Opções de profundidade/encerramento antecipado por execução
+        for option in ('newest_stored_date', 'stop_at_known', 'min_pages', 'max_pages', 'minimum_items'):
+            if kwargs.get(option) is not None:
+                options[option] = kwargs[option]
+        return self._overridden(options)
+
+    @contextmanager
+    def _overridden(self, options):
+        defaults = {option: getattr(self.crawler, option) for option in options}
+        for option, value in options.items():
+            setattr(self.crawler, option, value)
+        try:
+            yield
+        finally:
+            for option, value in defaults.items():
+                setattr(self.crawler, option, value)
@@ -1,32 +1,69 @@
-import os, duckdb, logging
+import logging
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
+from itertools import islice
 
 from bases.interfaces.loader import LoadInterface
-from config.settings import DB_PATH
+from bases.lake import ParquetLakeSink
+from bases.metrics import track
+from config.database import arrow_batches, get_manager
+from config.settings import DB_PATH, LAKE_PATH
+from scrapping.queries import NewsQuery
+from scrapping.search import NewsSearchIndex
 
 logger = logging.getLogger(__name__)
 
+# Schema colunar da carga (mesmos tipos da tabela `news`)
+NEWS_SCHEMA = pa.schema([
+    ('data_importacao', pa.timestamp('us')),
+    ('tipo', pa.string()),
+    ('titulo', pa.string()),
+    ('url', pa.string()),
+    ('data_noticia', pa.timestamp('us')),
+])
+
+
+def news_lake_sink(root):
+    """Notícias no lake: uma partição por data de importação, chave `url`."""
+    return ParquetLakeSink(root, 'news', partition_by=['ingestion_date'], key=['url'])
+
 
 class ScrappingLoader(LoadInterface):
-    def __init__(self, db_path=DB_PATH):
+    batch_kwarg = 'data_transformed'
+
+    def __init__(self, db_path=DB_PATH, chunk_size=50_000, lake_path=LAKE_PATH):
         self.db_path = db_path
-        self.ensure_db_directory()
-        self.conn = duckdb.connect(self.db_path)
-        self.ensure_sequence()
-        self.create_table()
-    
-    def ensure_db_directory(self):
-        db_dir = os.path.dirname(self.db_path)
-        if db_dir and not os.path.exists(db_dir):
-            os.makedirs(db_dir)
-            logger.debug("📁 Diretório criado para o banco de dados: %s", db_dir)
-
-    def ensure_sequence(self):
-        self.conn.execute("CREATE SEQUENCE IF NOT EXISTS news_id_seq START 1;")
+        # Notícias convertidas/inseridas por vez: limita a memória em cargas grandes
+        self.chunk_size = chunk_size
+        # Cópia em Parquet das notícias inseridas, para leitura fora do banco
+        self.lake = news_lake_sink(lake_path) if lake_path else None
+        self.last_load_stats = {"inserted": 0, "skipped": 0}
+        self.db = get_manager(self.db_path)
+        # Índice invertido dos títulos, atualizado na mesma transação da carga
+        self.search_index = NewsSearchIndex(self.db_path)
+        self.db.ensure_schema("scrapping:news", self._create_schema)
+
+    @property
+    def conn(self):
+        """Cursor da thread atual na conexão compartilhada do banco."""
+        return self.db.cursor()
+
+    def _create_schema(self, conn):
+        self.ensure_sequence(conn)
+        self.create_table(conn)
+        self.ensure_url_index(conn)
+        self.search_index.create_schema(conn)
+        # Indexa notícias de cargas anteriores ao índice de busca
+        indexed = self.search_index.update(conn)
+        if indexed:
+            logger.info("🔤 %d notícia(s) existentes adicionadas ao índice de busca.", indexed)
+
+    def ensure_sequence(self, conn=None):
+        (conn or self.conn).execute("CREATE SEQUENCE IF NOT EXISTS news_id_seq START 1;")
         logger.debug("🔢 Sequência 'news_id_seq' verificada/criada com sucesso.")
 
-    def create_table(self):
+    def create_table(self, conn=None):
         create_table_query = """
             CREATE TABLE IF NOT EXISTS news (
                 id INTEGER DEFAULT nextval('news_id_seq'),
@@ -38,11 +75,32 @@ class ScrappingLoader(LoadInterface):
                 PRIMARY KEY (id)
             )
         """
-        self.conn.execute(create_table_query)
+        (conn or self.conn).execute(create_table_query)
         logger.info("🧱 Tabela 'news' criada/verificada no banco: %s", self.db_path)
+
+    def ensure_url_index(self, conn=None):
+        """Garante o índice único em `url`, removendo duplicados de cargas antigas (mantém o primeiro)."""
+        conn = conn or self.conn
+        exists = conn.execute(
+            "SELECT COUNT(*) FROM duckdb_indexes() WHERE index_name = 'news_url_idx'"
+        ).fetchone()[0]
+        if exists:
+            return
+
+        removed = conn.execute("""
+            DELETE FROM news
+            WHERE url IS NOT NULL
+              AND id NOT IN (SELECT MIN(id) FROM news WHERE url IS NOT NULL GROUP BY url)
+        """).fetchone()[0]
+        if removed:
+            logger.info("🧹 %d notícias duplicadas removidas de 'news'.", removed)
+
+        conn.execute("CREATE UNIQUE INDEX news_url_idx ON news (url);")
+        logger.info("🔑 Índice único (url) criado em 'news'.")
     
     def do_load(self, **kwargs) -> bool:
         """Carrega os dados transformados no banco de dados."""
+        self.last_load_stats = {"inserted": 0, "skipped": 0}
         try:
             data_transformed = kwargs.get('data_transformed', {})
             if not data_transformed:
@@ -58,15 +116,20 @@ class ScrappingLoader(LoadInterface):
             
             logger.info("💾 Iniciando carregamento de %d notícias no banco...", len(news_list))
             
-            df = self._create_dataframe(news_list)
-            self._insert_dataframe_to_db(df)
+            with track('news.insert', news_list) as stage:
+                self.last_load_stats = self._insert_batches_to_db(self._create_record_batches(news_list))
+                stage.rows_out = self.last_load_stats["inserted"]
             
-            logger.info("✅ %d notícias inseridas no banco com sucesso!", len(news_list))
+            logger.info(
+                "✅ Carga concluída: %d notícias novas | %d já existentes ignoradas.",
+                self.last_load_stats["inserted"], self.last_load_stats["skipped"],
+            )
             logger.debug(
-                "📊 Totais — Originais: %d | Válidas: %d | Filtradas: %d",
+                "📊 Totais — Originais: %d | Válidas: %d | Filtradas: %d | Sem data: %d",
                 metadata.get('total_original', 0),
                 metadata.get('total_valid', 0),
                 metadata.get('total_filtered', 0),
+                metadata.get('total_undated', 0),
             )
             
             return True
@@ -74,51 +137,154 @@ class ScrappingLoader(LoadInterface):
         except Exception as e:
             logger.exception("❌ Erro durante o carregamento: %s", e)
             return False
-
-        finally:
-            if hasattr(self, 'conn'):
-                self.conn.close()
     
-    def _create_dataframe(self, news_list):
-        """Converte lista de notícias em DataFrame."""
+    def _create_record_batches(self, news_list):
+        """
+        Converte as notícias em RecordBatches do Arrow, em blocos de `chunk_size`.
+
+        As colunas são montadas diretamente como arrays tipados (timestamps em
+        `timestamp[us]`), sem passar por dicionários intermediários nem DataFrame.
+        """
         current_time = datetime.now()
-        
-        data = [{
-            'data_importacao': current_time,
-            'tipo': n.get('tipo_noticia', ''),
-            'titulo': n.get('titulo_noticia', ''),
-            'url': n.get('url_noticia', ''),
-            'data_noticia': n.get('data_noticia', None)
-        } for n in news_list]
-        
-        df = pd.DataFrame(data)
+        news_iter = iter(news_list)
+
+        while True:
+            chunk = list(islice(news_iter, self.chunk_size))
+            if not chunk:
+                return
+
+            yield pa.RecordBatch.from_arrays([
+                pa.array([current_time] * len(chunk), NEWS_SCHEMA.field('data_importacao').type),
+                pa.array([n.get('tipo_noticia', '') for n in chunk], pa.string()),
+                pa.array([n.get('titulo_noticia', '') for n in chunk], pa.string()),
+                pa.array([n.get('url_noticia', '') for n in chunk], pa.string()),
+                self._timestamp_array([n.get('data_noticia') for n in chunk]),
+            ], schema=NEWS_SCHEMA)
+
+    @staticmethod
+    def _timestamp_array(values):
+        """Array `timestamp[us]`; textos (ex.: dados antigos) são convertidos com `pd.to_datetime`."""
         try:
-            df['data_noticia'] = pd.to_datetime(df['data_noticia'], errors='coerce')
-        except Exception:
-            logger.warning("⚠️ Falha ao converter coluna 'data_noticia' para datetime.")
-        
-        logger.debug("🧾 DataFrame criado com %d registros e %d colunas.", len(df), len(df.columns))
-        return df
-    
-    def _insert_dataframe_to_db(self, df):
-        """Insere DataFrame no banco de forma segura."""
-        self.conn = duckdb.connect(self.db_path)
-        self.ensure_sequence()
+            return pa.array(values, pa.timestamp('us'))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            logger.debug("🕒 Datas em texto na carga; convertendo com pd.to_datetime.")
+            parsed = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce', format='mixed')
+            return pa.array(parsed.astype('datetime64[us]'), pa.timestamp('us'), from_pandas=True)
 
-        self.conn.register("temp_df", df)
+    def _insert_batches_to_db(self, batches):
+        """
+        Insere apenas as notícias cujo `url` ainda não está na tabela (anti-join).
 
+        Cada RecordBatch é registrado no DuckDB como tabela Arrow (lida sem
+        cópia) e inserido na mesma transação. URLs repetidas dentro da carga
+        ficam com a primeira ocorrência; o índice único `news_url_idx` garante
+        a unicidade mesmo com cargas concorrentes. As notícias novas entram no
+        índice de busca antes do COMMIT. Com o lake ativo, as linhas inseridas
+        (faixa de `id` da carga) são gravadas em Parquet após o COMMIT, lidas
+        do banco em blocos de `chunk_size`.
+        """
         insert_query = """
             INSERT INTO news (data_importacao, tipo, titulo, url, data_noticia)
             SELECT data_importacao, tipo, titulo, url, data_noticia
-            FROM temp_df
+            FROM (
+                SELECT *, ROW_NUMBER() OVER () AS _pos
+                FROM temp_news t
+                WHERE NOT EXISTS (SELECT 1 FROM news n WHERE n.url = t.url)
+            )
+            QUALIFY url IS NULL OR ROW_NUMBER() OVER (PARTITION BY url ORDER BY _pos) = 1
+            ORDER BY _pos
         """
-        self.conn.execute(insert_query)
-        logger.info("✅ %d registros inseridos na tabela 'news'.", len(df))
+        total = inserted = chunks = 0
+        with self.db.writing() as conn:
+            conn.execute("BEGIN TRANSACTION;")
+            try:
+                # As escritas são serializadas: os ids desta carga ficam acima do maior id atual
+                first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM news").fetchone()[0]
+                for batch in batches:
+                    conn.register("temp_news", pa.Table.from_batches([batch]))
+                    try:
+                        inserted += conn.execute(insert_query).fetchone()[0]
+                    finally:
+                        conn.unregister("temp_news")
+                    total += batch.num_rows
+                    chunks += 1
+                if inserted:
+                    self.search_index.update(conn)
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM news").fetchone()[0]
+                conn.execute("COMMIT;")
+            except Exception:
+                conn.execute("ROLLBACK;")
+                raise
+
+        if self.lake and inserted:
+            self._copy_to_lake(first_id, last_id)
+
+        stats = {"inserted": inserted, "skipped": total - inserted}
+        logger.debug(
+            "🧾 %d registros inseridos na tabela 'news' (%d ignorados, %d bloco(s)).",
+            stats["inserted"], stats["skipped"], chunks,
+        )
+        return stats
+
+    def _copy_to_lake(self, first_id, last_id):
+        """Grava no lake as notícias com `first_id < id <= last_id`, um bloco de `chunk_size` por vez."""
+        result = self.conn.execute("""
+            SELECT id, data_importacao, tipo, titulo, url, data_noticia,
+                   strftime(data_importacao, '%Y-%m-%d') AS ingestion_date
+            FROM news
+            WHERE id > ? AND id <= ?
+            ORDER BY id
+        """, [first_id, last_id])
+        for batch in arrow_batches(result, self.chunk_size):
+            self.lake.safe_append(pa.Table.from_batches([batch]))
+
+    def iter_load(self, batches, **kwargs):
+        """Carrega cada lote transformado assim que ele chega; `last_load_stats` acumula o fluxo todo."""
+        totals = {"inserted": 0, "skipped": 0}
+        for loaded in super().iter_load(batches, **kwargs):
+            for key in totals:
+                totals[key] += self.last_load_stats[key]
+            yield loaded
+        self.last_load_stats = totals
+
+    def get_known_urls(self, limit=1000):
+        """
+        URLs das notícias mais recentes já armazenadas (conjunto em memória).
+
+        O crawler consulta este conjunto para descartar notícias já carregadas e
+        parar a paginação ao alcançá-las; `limit=None` carrega todas.
+        """
+        try:
+            query = "SELECT url FROM news WHERE url IS NOT NULL ORDER BY id DESC"
+            params = []
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
+            urls = {row[0] for row in self.conn.execute(query, params).fetchall()}
+            logger.debug("🔎 %d URLs conhecidas carregadas da tabela 'news'.", len(urls))
+            return urls
+        except Exception as e:
+            logger.exception("❌ Erro ao consultar URLs conhecidas: %s", e)
+            return set()
     
+    def get_latest_news(self):
+        """Retorna `url` e `data_noticia` da notícia mais recente armazenada (ou None)."""
+        try:
+            row = self.conn.execute("""
+                SELECT url, data_noticia
+                FROM news
+                WHERE data_noticia IS NOT NULL
+                ORDER BY data_noticia DESC, id DESC
+                LIMIT 1
+            """).fetchone()
+            return {'url': row[0], 'data_noticia': row[1]} if row else None
+        except Exception as e:
+            logger.exception("❌ Erro ao consultar a notícia mais recente: %s", e)
+            return None
+
     def get_total_records(self):
         """Retorna o total de registros na tabela."""
         try:
-            self.conn = duckdb.connect(self.db_path)
             result = self.conn.execute("SELECT COUNT(*) FROM news").fetchone()
             total = result[0] if result else 0
             logger.debug("📈 Total de registros na tabela 'news': %d", total)
@@ -126,14 +292,10 @@ class ScrappingLoader(LoadInterface):
         except Exception as e:
             logger.exception("❌ Erro ao consultar total de registros: %s", e)
             return 0
-        finally:
-            if hasattr(self, 'conn'):
-                self.conn.close()
     
     def get_recent_news(self, limit=100):
         """Retorna as notícias mais recentes."""
         try:
-            self.conn = duckdb.connect(self.db_path)
             query = """
             SELECT data_importacao, tipo, titulo, url, data_noticia
             FROM news 
@@ -146,40 +308,33 @@ class ScrappingLoader(LoadInterface):
         except Exception as e:
             logger.exception("❌ Erro ao consultar notícias recentes: %s", e)
             return []
-        finally:
-            if hasattr(self, 'conn'):
-                self.conn.close()
     
     def get_news_as_dataframe(self, limit=None):
-        """Retorna as notícias como DataFrame."""
+        """Retorna as notícias como DataFrame, das mais recentes para as mais antigas (ver `NewsQuery`)."""
         try:
-            self.conn = duckdb.connect(self.db_path)
-            query = "SELECT * FROM news ORDER BY data_importacao DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-            df = pd.read_sql_query(query, self.conn)
+            df = NewsQuery(self.db_path).fetch(limit=limit)
             logger.debug("📊 DataFrame retornado com %d registros.", len(df))
             return df
         except Exception as e:
             logger.exception("❌ Erro ao consultar notícias como DataFrame: %s", e)
             return pd.DataFrame()
-        finally:
-            if hasattr(self, 'conn'):
-                self.conn.close()
     
     def get_news_by_type(self, news_type, limit=None):
         """Retorna notícias filtradas por tipo."""
         try:
-            self.conn = duckdb.connect(self.db_path)
-            query = "SELECT * FROM news WHERE tipo = ? ORDER BY data_importacao DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-            df = pd.read_sql_query(query, self.conn, params=(news_type,))
+            df = NewsQuery(self.db_path).fetch(limit=limit, tipo=news_type)
             logger.debug("🧩 %d notícias retornadas do tipo '%s'.", len(df), news_type)
             return df
         except Exception as e:
             logger.exception("❌ Erro ao consultar notícias por tipo: %s", e)
             return pd.DataFrame()
-        finally:
-            if hasattr(self, 'conn'):
-                self.conn.close()
+
+    def search_news(self, query, start=None, end=None, limit=20, match="all"):
+        """Notícias cujo título contém os termos de `query`, por relevância (ver `NewsSearchIndex`)."""
+        try:
+            df = self.search_index.search(query, start=start, end=end, limit=limit, match=match)
+            logger.debug("🔎 %d notícias encontradas para '%s'.", len(df), query)
+            return df
+        except Exception as e:
+            logger.exception("❌ Erro na busca de notícias: %s", e)
+            return pd.DataFrame()
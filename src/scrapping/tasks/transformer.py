@@ -6,11 +6,11 @@ logger = logging.getLogger(__name__)
 
 
 class ScrappingTransformer(TransformInterface):
+    batch_kwarg = "data_extracted"
     required_fields = [
         "tipo_noticia",
         "titulo_noticia",
         "url_noticia",
-        "data_noticia",
     ]
 
     def do_transform(self, **kwargs):
@@ -26,11 +26,14 @@ class ScrappingTransformer(TransformInterface):
         logger.info("⚙️ Iniciando transformação de %d notícias...", len(news_list))
 
         valid_news = []
-        invalid_count = 0
+        invalid_count = undated_count = 0
 
         for i, news in enumerate(news_list):
             if self.is_valid(news):
                 valid_news.append(news)
+                # Data não reconhecida: a notícia é mantida e gravada com `data_noticia` NULL
+                if news.get("data_noticia") is None:
+                    undated_count += 1
             else:
                 invalid_count += 1
                 logger.debug(
@@ -42,11 +45,14 @@ class ScrappingTransformer(TransformInterface):
         logger.info(
             "✅ Transformação concluída: %d válidas | %d filtradas", len(valid_news), invalid_count
         )
+        if undated_count:
+            logger.warning("⚠️ %d notícia(s) válida(s) sem data reconhecida.", undated_count)
 
         metadata = {
             "total_original": len(news_list),
             "total_valid": len(valid_news),
             "total_filtered": invalid_count,
+            "total_undated": undated_count,
             "data_extracao": data_extraction_time,
             "data_transformacao": self._get_current_timestamp(),
         }
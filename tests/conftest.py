@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Mesmo layout do main.py; `benchmarks` fornece as fixtures offline (HTML, servidor, yfinance)
+for path in (PROJECT_ROOT, PROJECT_ROOT / "src", PROJECT_ROOT / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Banco DuckDB temporário; a conexão compartilhada é fechada ao final do teste."""
+    from config.database import close_all
+
+    yield str(tmp_path / "test.db")
+    close_all()
@@ -0,0 +1,49 @@
+"""
+Grava páginas reais do InfoMoney para os testes de seletores (`tests/test_infomoney_recorded.py`).
+
+Salva em `tests/data/infomoney/`:
+    listing.html        primeira página de /ultimas-noticias/
+    listing_page2.html  segunda página, pela `PAGE_URL_TEMPLATE` do crawler
+    article.html        a primeira notícia da listagem
+
+`<script>`, `<style>`, `<svg>` e comentários são removidos para manter os
+arquivos pequenos; a marcação usada pelos seletores fica intacta.
+
+Uso:
+    python tests/data/capture_infomoney.py
+"""
+import re, sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(PROJECT_ROOT), str(PROJECT_ROOT / "src")]
+
+from bases.crawlers.http_client import HttpClient
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+from scrapping.crawlers.parsers import get_listing_parser
+
+OUTPUT_DIR = Path(__file__).resolve().parent / "infomoney"
+NOISE = re.compile(r"<(script|style|svg)\b.*?</\1\s*>|<!--.*?-->", re.S | re.I)
+
+
+def trim(page):
+    return NOISE.sub("", page)
+
+
+def main():
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    with HttpClient() as http:
+        listing = http.get_text(InfoMoneyCrawler.url)
+        page2 = http.get_text(InfoMoneyCrawler.PAGE_URL_TEMPLATE.format(page=2))
+        items = get_listing_parser().parse(listing, InfoMoneyCrawler.url)
+        if not items:
+            sys.exit("Nenhuma notícia encontrada na listagem: os seletores precisam de revisão.")
+        article = http.get_text(items[0]["url_noticia"])
+
+    for name, page in (("listing", listing), ("listing_page2", page2), ("article", article)):
+        (OUTPUT_DIR / f"{name}.html").write_text(trim(page), encoding="utf-8")
+    print(f"{len(items)} notícias na listagem; páginas salvas em {OUTPUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
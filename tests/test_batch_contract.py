@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from api.tasks.loader import YFinanceLoad
+from bench_indicators import make_ohlcv
+from scrapping.tasks.loader import ScrappingLoader
+from scrapping.tasks.transformer import ScrappingTransformer
+
+
+def _news(start, count):
+    return {
+        "data_extracao": "2025-01-15 12:00:00",
+        "data": [
+            {"tipo_noticia": "Mercados", "titulo_noticia": f"Notícia {i}", "url_noticia": f"https://x/{i}",
+             "data_noticia": datetime(2025, 1, 15)}
+            for i in range(start, start + count)
+        ],
+    }
+
+
+def test_scrapping_batches_flow_through_the_default_iter_methods(db_path):
+    transformed = ScrappingTransformer().iter_transform([_news(0, 3), _news(3, 2)])
+    loader = ScrappingLoader(db_path=db_path)
+
+    assert list(loader.iter_load(transformed)) == [True, True]
+    assert loader.last_load_stats == {"inserted": 5, "skipped": 0}
+
+
+def test_yfinance_batches_flow_through_the_default_iter_load(db_path):
+    df = make_ohlcv(2, 30)
+    loader = YFinanceLoad(db_path=db_path)
+
+    assert list(loader.iter_load(frame for _, frame in df.groupby("symbol"))) == [True, True]
+    assert loader.last_load_stats["inserted"] == len(df)
@@ -0,0 +1,122 @@
+import logging, os, time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import api.tasks.extractor as yf_extractor
+from api.tasks.extractor import YFinanceExtract
+from bases.cache import ParquetResponseCache
+from fixtures import fake_yf_download
+
+
+def _frame(symbol="AAA", start="2024-01-01", end="2024-03-01"):
+    return YFinanceExtract._to_long_format(fake_yf_download([symbol], start=start, end=end), [symbol])
+
+
+def _age(cache, key, seconds, atime=None):
+    """Recua o mtime (gravação) e, opcionalmente, fixa o atime (último uso) da entrada."""
+    path = cache.path_for(key)
+    now = time.time()
+    os.utime(path, (atime if atime is not None else now, now - seconds))
+
+
+def test_hit_returns_the_stored_frame(tmp_path):
+    cache = ParquetResponseCache(tmp_path)
+    key = ("AAA", "1d", "2024-01-01", "2024-03-01")
+    frame = _frame()
+    cache.put(key, frame)
+
+    cached = cache.get(key)
+    pd.testing.assert_frame_equal(cached, frame)
+    assert cached.attrs["cache_key"] == key
+    assert cache.get(("BBB", "1d", "2024-01-01", "2024-03-01")) is None
+    assert cache.stats == {"hits": 1, "misses": 1, "expired": 0, "evicted": 0}
+
+
+def test_key_parts_with_separator_round_trip(tmp_path):
+    cache = ParquetResponseCache(tmp_path)
+    key = ("BRK_B", "1d", "2024-01-01", "2024-03-01")
+    cache.put(key, _frame())
+    assert cache.key_for(cache.path_for(key)) == key
+
+
+def test_entries_expire_after_ttl_unless_offline(tmp_path):
+    key = ("AAA", "1d", "2024-01-01", "2024-03-01")
+    cache = ParquetResponseCache(tmp_path, ttl=60)
+    cache.put(key, _frame())
+    _age(cache, key, 120)
+
+    assert cache.get(key) is None
+    assert cache.stats["expired"] == 1
+    assert ParquetResponseCache(tmp_path, ttl=60, offline=True).get(key) is not None
+
+
+def test_eviction_removes_least_recently_used_first(tmp_path):
+    cache = ParquetResponseCache(tmp_path, max_bytes=None)
+    keys = [(symbol, "1d", "2024-01-01", "2024-03-01") for symbol in ("AAA", "BBB", "CCC")]
+    for key in keys:
+        cache.put(key, _frame(key[0]))
+    # AAA é a mais antiga na gravação, mas a mais recente no uso
+    now = time.time()
+    for key, last_used in zip(keys, (now, now - 300, now - 200)):
+        os.utime(cache.path_for(key), (last_used, now - 600))
+
+    size = cache.path_for(keys[0]).stat().st_size
+    cache.max_bytes = size * 2
+    assert cache.evict() == 1
+    assert not cache.path_for(keys[1]).exists()
+    assert cache.path_for(keys[0]).exists() and cache.path_for(keys[2]).exists()
+    assert cache.stats["evicted"] == 1
+
+
+def test_size_limit_is_enforced_when_opening(tmp_path):
+    writer = ParquetResponseCache(tmp_path, max_bytes=None)
+    for symbol in ("AAA", "BBB", "CCC"):
+        writer.put((symbol, "1d", "2024-01-01", "2024-03-01"), _frame(symbol))
+
+    # Uma execução só de leitura (ou offline) nunca grava, mas também respeita o limite
+    reader = ParquetResponseCache(tmp_path, max_bytes=1, offline=True)
+    assert reader.stats["evicted"] == 3
+    assert not list(tmp_path.glob("*.parquet"))
+
+
+def test_offline_falls_back_to_latest_entry_of_the_symbol(tmp_path):
+    cache = ParquetResponseCache(tmp_path, offline=True)
+    old, new = ("AAA", "1d", "2023-01-01", "2023-03-01"), ("AAA", "1d", "2024-01-01", "2024-03-01")
+    cache.put(old, _frame())
+    cache.put(new, _frame())
+    _age(cache, old, 3600)
+
+    cached = cache.get(("AAA", "1d", "2024-01-15", "2024-02-01"), fallback=("AAA", "1d"))
+    assert cached.attrs["cache_key"] == new
+    assert cache.get(("AAA", "1h", "2024-01-15", "2024-02-01"), fallback=("AAA", "1h")) is None
+    assert ParquetResponseCache(tmp_path).get(("AAA", "1d", "2024-01-15", "2024-02-01"), fallback=("AAA", "1d")) is None
+
+
+@pytest.fixture
+def offline_extractor(tmp_path, monkeypatch):
+    def no_network(tickers, **kwargs):
+        raise AssertionError("o modo offline não deve acessar o yfinance")
+
+    monkeypatch.setattr(yf_extractor.yf, "download", no_network)
+    cache = ParquetResponseCache(tmp_path / "cache", offline=True)
+    cache.put(("AAA", "1d", "2024-01-01", "2024-03-01"), _frame())
+    return YFinanceExtract(symbols=["AAA"], cache=cache, db_path=str(tmp_path / "ausente.db"))
+
+
+def test_offline_fallback_slices_the_requested_range(offline_extractor, caplog):
+    with caplog.at_level(logging.WARNING, logger=yf_extractor.__name__):
+        df = offline_extractor._download_batch(["AAA"], datetime(2024, 1, 15), datetime(2024, 2, 1))
+
+    assert df["Date"].min() >= pd.Timestamp("2024-01-15") and df["Date"].max() < pd.Timestamp("2024-02-01")
+    assert not caplog.records
+
+
+def test_offline_fallback_warns_on_partial_range(offline_extractor, caplog):
+    with caplog.at_level(logging.WARNING, logger=yf_extractor.__name__):
+        df = offline_extractor._download_batch(["AAA"], datetime(2024, 2, 1), datetime(2024, 4, 1))
+
+    assert df["Date"].max() < pd.Timestamp("2024-03-01")
+    assert len(caplog.records) == 1
+    assert "2024-01-01 a 2024-03-01" in caplog.records[0].getMessage()
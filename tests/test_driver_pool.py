@@ -0,0 +1,36 @@
+import pytest
+
+from bases.crawlers.base_crawler import BaseCrawler
+from bases.crawlers.driver_pool import close_all_pools, get_driver_pool
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+
+
+@pytest.fixture(autouse=True)
+def _pools():
+    yield
+    close_all_pools()
+
+
+def test_pool_is_shared_only_for_the_same_options():
+    pool = get_driver_pool(headless=True, size=1)
+
+    assert get_driver_pool(headless=True, size=1) is pool
+    assert get_driver_pool(headless=True, size=4).size == 4
+    assert get_driver_pool(headless=True, size=1, max_pages_per_driver=5).max_pages_per_driver == 5
+    assert get_driver_pool(headless=False, size=1) is not pool
+
+
+def test_driver_and_http_pool_sizes_are_separate_options():
+    crawler = InfoMoneyCrawler(driver_pool_size=4)
+    assert crawler.pool_options["size"] == 4
+    assert crawler.http.pool_size == 10
+
+    crawler = InfoMoneyCrawler(pool_size=4)
+    assert crawler.pool_options["size"] == 1
+    assert crawler.http.pool_size == 4
+
+
+def test_crawler_gets_a_pool_with_its_own_size():
+    small, large = BaseCrawler(headless=True), BaseCrawler(headless=True, driver_pool_size=3)
+    assert small._get_pool() is not large._get_pool()
+    assert large._get_pool().size == 3
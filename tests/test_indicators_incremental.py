@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from api.indicators import IndicatorEngine
+from api.tasks.loader import YFinanceLoad
+from bench_indicators import make_ohlcv
+
+INDICATORS = {
+    "ma_14d": ("sma", 14),
+    "ema_20d": ("ema", 20),
+    "vol_30d": ("volatility", 30),
+}
+
+
+def _is_recent(frame, n):
+    """Máscara das últimas `n` barras de cada ativo."""
+    return frame.groupby("symbol")["date"].rank(method="first", ascending=False) <= n
+
+
+@pytest.mark.parametrize("new_bars", [1, 5, 60])
+def test_incremental_batch_matches_full_recompute(db_path, new_bars):
+    df = make_ohlcv(3, 150)
+    engine = IndicatorEngine(db_path=db_path, indicators=INDICATORS)
+    full = engine.compute(df).sort_values(["symbol", "date"], ignore_index=True)
+
+    # Histórico já gravado (calculado e carregado) e um lote só com as barras novas
+    recent = _is_recent(df, new_bars)
+    history, batch = df[~recent], df[recent]
+    assert YFinanceLoad(db_path=db_path, indicators=INDICATORS).do_load(df=engine.compute(history))
+
+    incremental = engine.compute(batch, seed=engine.load_seed(batch))
+    incremental = incremental.sort_values(["symbol", "date"], ignore_index=True)
+    expected = full[_is_recent(full, new_bars)].reset_index(drop=True)
+
+    assert incremental[["symbol", "date"]].equals(expected[["symbol", "date"]])
+    for column in engine.columns:
+        np.testing.assert_array_equal(
+            incremental[column].to_numpy("float64"), expected[column].to_numpy("float64"), err_msg=column
+        )
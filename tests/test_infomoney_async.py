@@ -0,0 +1,95 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+from bases.crawlers.async_fetcher import AsyncFetcher
+from bases.crawlers.http_client import HttpClient
+from fixtures import infomoney_routes
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+
+BASE_URL = "https://infomoney.test"
+
+
+class StubClient:
+    """Cliente HTTP falso: responde pelas rotas das fixtures e registra as requisições."""
+
+    retries = 0
+
+    def __init__(self, routes, delays=None, failures=None):
+        self.routes = routes
+        self.delays = delays or {}
+        # Caminho → quantas vezes falhar antes de responder
+        self.failures = dict(failures or {})
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def get_text(self, url):
+        path = urlsplit(url).path
+        with self._lock:
+            self.requested.append(path)
+            failing = self.failures.get(path, 0)
+            if failing:
+                self.failures[path] = failing - 1
+        time.sleep(self.delays.get(path, 0))
+        if failing:
+            raise ConnectionError(f"falha simulada em {path}")
+        body = self.routes(path)
+        if body is None:
+            raise LookupError(f"404 em {path}")
+        return body
+
+
+def _crawler(client, **kwargs):
+    fetcher = AsyncFetcher(http_client=client, concurrency=2, rate_per_host=0, backoff_factor=0, retries=1)
+    crawler = InfoMoneyCrawler(mode="async", fetcher=fetcher, reuse_driver=False, **kwargs)
+    crawler.url = f"{BASE_URL}/ultimas-noticias/"
+    crawler.page_url_template = f"{BASE_URL}/ultimas-noticias/page/{{page}}/"
+    return crawler
+
+
+def _numbers(items):
+    return [int(item["url_noticia"].rstrip("/").rsplit("-", 1)[-1]) for item in items]
+
+
+def test_first_page_comes_first_and_every_item_once():
+    # Página 3 responde antes da 2: a ordem entre páginas da mesma onda é a de chegada
+    client = StubClient(infomoney_routes(pages=5, per_page=10), delays={"/ultimas-noticias/page/2/": 0.05})
+    items = _crawler(client, minimum_items=50, max_pages=5).run()["data"]
+
+    numbers = _numbers(items)
+    assert numbers[:10] == list(range(10))
+    assert sorted(numbers) == list(range(50))
+    assert client.requested[0] == "/ultimas-noticias/"
+
+
+def test_stops_after_the_wave_with_known_urls():
+    client = StubClient(infomoney_routes(pages=10, per_page=10))
+    crawler = _crawler(client, minimum_items=100, max_pages=10, min_pages=1)
+    crawler.known_urls = {f"{BASE_URL}/mercados/noticia-25/"}
+
+    items = crawler.run()["data"]
+
+    assert crawler.reached_known
+    assert sorted(_numbers(items)) == [n for n in range(30) if n != 25]
+    assert "/ultimas-noticias/page/4/" not in client.requested
+
+
+def test_failed_page_is_skipped_and_transient_failures_are_retried():
+    client = StubClient(infomoney_routes(pages=3, per_page=10), failures={
+        "/ultimas-noticias/page/2/": 5,  # sempre falha (retries=1)
+        "/ultimas-noticias/page/3/": 1,  # falha uma vez e responde na nova tentativa
+    })
+    items = _crawler(client, minimum_items=30, max_pages=3).run()["data"]
+
+    assert sorted(_numbers(items)) == list(range(10)) + list(range(20, 30))
+    assert client.requested.count("/ultimas-noticias/page/2/") == 2
+    assert client.requested.count("/ultimas-noticias/page/3/") == 2
+
+
+@pytest.mark.parametrize("client, fetcher_retries", [(None, 3), (HttpClient(), 0), (HttpClient(retries=0), 3)])
+def test_only_one_layer_retries(client, fetcher_retries):
+    fetcher = AsyncFetcher(http_client=client)
+    assert fetcher.retries == fetcher_retries
+    assert not (fetcher.retries and fetcher.http.retries)
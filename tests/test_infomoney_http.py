@@ -0,0 +1,100 @@
+"""
+Paginação, deduplicação e fallback do modo HTTP sobre páginas sintéticas
+(`benchmarks/fixtures.py`). Os seletores contra páginas reais ficam em
+`test_infomoney_recorded.py`.
+"""
+import pytest
+
+from fixtures import FakeDriver, infomoney_routes, make_listing_page, serve
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+
+
+def _recording(routes):
+    """Envolve `routes` guardando os caminhos pedidos ao servidor."""
+    requested = []
+
+    def handler(path):
+        requested.append(path)
+        return routes(path)
+
+    handler.requested = requested
+    return handler
+
+
+def _crawler(base_url, **kwargs):
+    crawler = InfoMoneyCrawler(mode="http", reuse_driver=False, **kwargs)
+    crawler.url = f"{base_url}/ultimas-noticias/"
+    crawler.page_url_template = f"{base_url}/ultimas-noticias/page/{{page}}/"
+    return crawler
+
+
+def _listing_pages(*pages):
+    """Rotas da listagem a partir de `(início, quantidade)` por página."""
+    def routes(path):
+        page = 1 if path == "/ultimas-noticias/" else int(path.strip("/").rsplit("/", 1)[-1])
+        return make_listing_page(*pages[page - 1]) if page <= len(pages) else None
+    return routes
+
+
+def _urls(items):
+    return [item["url_noticia"] for item in items]
+
+
+def test_paginates_until_minimum_items():
+    routes = _recording(infomoney_routes(pages=10, per_page=10))
+    with serve(routes) as base_url:
+        items = _crawler(base_url, minimum_items=25, max_pages=10).run()["data"]
+
+    assert len(items) == 30
+    assert routes.requested == ["/ultimas-noticias/", "/ultimas-noticias/page/2/", "/ultimas-noticias/page/3/"]
+    assert all(item["data_noticia"] is not None for item in items)
+
+
+def test_stops_at_max_pages():
+    routes = _recording(infomoney_routes(pages=10, per_page=10))
+    with serve(routes) as base_url:
+        items = _crawler(base_url, minimum_items=1000, max_pages=2).run()["data"]
+
+    assert len(items) == 20
+    assert len(routes.requested) == 2
+
+
+def test_deduplicates_by_url_across_pages():
+    # A página 2 repete metade da página 1 (listagem deslocada entre as requisições)
+    with serve(_listing_pages((0, 10), (5, 10))) as base_url:
+        items = _crawler(base_url, minimum_items=1000, max_pages=2).run()["data"]
+
+    urls = _urls(items)
+    assert len(urls) == len(set(urls)) == 15
+
+
+@pytest.mark.parametrize("pages", [((0, 10), (10, 0), (20, 10)), ((0, 10), (0, 10), (20, 10))])
+def test_stops_on_page_without_new_items(pages):
+    routes = _recording(_listing_pages(*pages))
+    with serve(routes) as base_url:
+        items = _crawler(base_url, minimum_items=1000, max_pages=10).run()["data"]
+
+    assert len(items) == 10
+    assert routes.requested == ["/ultimas-noticias/", "/ultimas-noticias/page/2/"]
+
+
+def test_falls_back_to_selenium_when_http_returns_nothing(monkeypatch):
+    listing = infomoney_routes(pages=1, per_page=10)
+    with serve(lambda path: None) as base_url:
+        crawler = _crawler(base_url, minimum_items=10, max_pages=3)
+        crawler.driver = FakeDriver(lambda url: listing(url.split(base_url, 1)[-1]))
+        # Os cliques em "carregar mais" dependem de um navegador real
+        monkeypatch.setattr(crawler, "_ensure_minimum_items_loaded", lambda minimum: None)
+        monkeypatch.setattr(crawler.readiness, "wait", lambda driver, timeout: True)
+        items = crawler.run()["data"]
+
+    assert len(items) == 10
+    assert _urls(items)[0].endswith("/mercados/noticia-0/")
+
+
+def test_no_selenium_fallback_when_everything_is_known(monkeypatch):
+    with serve(infomoney_routes(pages=1, per_page=10)) as base_url:
+        crawler = _crawler(base_url, minimum_items=10, max_pages=1)
+        crawler.known_urls = set(_urls(crawler.listing_parser.parse(make_listing_page(0, 10), crawler.url)))
+        monkeypatch.setattr(crawler, "_run_selenium", lambda: pytest.fail("Selenium não deveria ser usado"))
+        assert crawler.run()["data"] == []
@@ -0,0 +1,60 @@
+"""
+Seletores do crawler contra páginas reais do InfoMoney gravadas em
+`tests/data/infomoney/` (ver `tests/data/capture_infomoney.py`).
+"""
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from scrapping.crawlers.dates import convert_relative_dates
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+from scrapping.crawlers.parsers import get_listing_parser
+
+PAGES_DIR = Path(__file__).resolve().parent / "data" / "infomoney"
+REFERENCE = datetime(2025, 1, 15, 12, 0)
+
+if not (PAGES_DIR / "listing.html").exists():
+    pytest.skip(
+        "Páginas gravadas ausentes; rode `python tests/data/capture_infomoney.py`.", allow_module_level=True
+    )
+
+
+def _page(name):
+    return (PAGES_DIR / f"{name}.html").read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def listing():
+    return get_listing_parser("lxml").parse(_page("listing"), InfoMoneyCrawler.url)
+
+
+def test_listing_selectors_find_complete_news(listing):
+    assert len(listing) >= 10
+    for news in listing:
+        assert news["titulo_noticia"]
+        assert news["url_noticia"].startswith("https://www.infomoney.com.br/")
+
+    urls = [news["url_noticia"] for news in listing]
+    assert len(set(urls)) == len(urls)
+
+
+def test_listing_dates_are_recognised(listing):
+    dates = convert_relative_dates([news["data_noticia"] for news in listing], REFERENCE)
+    assert sum(date is not None for date in dates) >= 0.9 * len(dates)
+
+
+def test_parser_backends_agree_on_the_recorded_page(listing):
+    assert get_listing_parser("bs4").parse(_page("listing"), InfoMoneyCrawler.url) == listing
+
+
+def test_page_url_template_serves_older_news(listing):
+    page2 = get_listing_parser("lxml").parse(_page("listing_page2"), InfoMoneyCrawler.url)
+
+    assert len(page2) >= 10
+    assert {n["url_noticia"] for n in page2} - {n["url_noticia"] for n in listing}
+
+
+def test_article_text_is_extracted():
+    text = InfoMoneyCrawler(mode="http")._parse_article(_page("article"))
+    assert len(text) > 200
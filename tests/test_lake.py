@@ -0,0 +1,69 @@
+import logging
+import threading
+
+import pyarrow as pa
+
+from bases.lake import connect_lake, lake_reader
+from scrapping.tasks.loader import ScrappingLoader, news_lake_sink
+
+
+def _table(urls):
+    return pa.table({"url": urls, "titulo": [f"Título {u}" for u in urls], "ingestion_date": ["2025-01-15"] * len(urls)})
+
+
+def test_safe_append_writes_and_creates_views(tmp_path):
+    sink = news_lake_sink(tmp_path)
+
+    assert sink.safe_append(_table(["a", "b"]))
+    assert sink.views_ready
+    with connect_lake(tmp_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM news").fetchone()[0] == 2
+
+
+def test_safe_append_logs_and_continues_on_failure(tmp_path, monkeypatch, caplog):
+    sink = news_lake_sink(tmp_path)
+    monkeypatch.setattr(sink, "append", lambda table: 1 / 0)
+
+    with caplog.at_level(logging.ERROR, logger="bases.lake"):
+        assert sink.safe_append(_table(["a"])) == []
+    assert "lake" in caplog.text
+    assert not sink.views_ready
+
+
+def test_loader_appends_to_the_lake_per_chunk(db_path, tmp_path, monkeypatch):
+    loader = ScrappingLoader(db_path=db_path, chunk_size=10, lake_path=tmp_path / "lake")
+    appended = []
+    append = loader.lake.safe_append
+    monkeypatch.setattr(loader.lake, "safe_append", lambda table: appended.append(table.num_rows) or append(table))
+
+    news = [
+        {"tipo_noticia": "Mercados", "titulo_noticia": f"Notícia {i}", "url_noticia": f"https://x/{i % 25}",
+         "data_noticia": None}
+        for i in range(30)
+    ]
+    assert loader.do_load(data_transformed={"data": news})
+
+    assert appended == [10, 10, 5]
+    with lake_reader(tmp_path / "lake") as conn:
+        assert conn.execute("SELECT COUNT(DISTINCT url), COUNT(*) FROM news").fetchone() == (25, 25)
+
+
+def test_compaction_waits_for_readers_before_removing_files(tmp_path):
+    sink = news_lake_sink(tmp_path)
+    for url in ("a", "b", "c"):
+        sink.safe_append(_table([url, "a"]))
+    old_files = sorted(sink.path.rglob("*.parquet"))
+
+    with lake_reader(tmp_path) as conn:
+        compaction = threading.Thread(target=sink.compact)
+        compaction.start()
+        compaction.join(0.3)
+
+        # O arquivo compactado já existe, mas os antigos continuam enquanto o leitor está ativo
+        assert compaction.is_alive()
+        assert all(f.exists() for f in old_files)
+        assert conn.execute("SELECT COUNT(*) FROM news").fetchone()[0] == 3
+
+    compaction.join(5)
+    assert not any(f.exists() for f in old_files)
+    assert len(list(sink.path.rglob("*.parquet"))) == 1
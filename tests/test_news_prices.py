@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics.news_prices import NewsPriceLinks
+from api.tasks.loader import YFinanceLoad
+from bench_indicators import make_ohlcv
+from scrapping.tasks.loader import ScrappingLoader
+
+START = datetime(2000, 1, 3, 15, 0)
+PRICES = make_ohlcv(3, 40)
+TWO_SYMBOLS = PRICES[PRICES["symbol"] != "SYM0002"]
+
+
+def _load_news(db_path, start, count):
+    news = [
+        {"tipo_noticia": "Mercados", "titulo_noticia": f"Notícia {i}", "url_noticia": f"https://x/{i}",
+         # Inclui fins de semana e notícias sem data
+         "data_noticia": None if i % 7 == 0 else START + timedelta(days=i, hours=i % 5)}
+        for i in range(start, start + count)
+    ]
+    assert ScrappingLoader(db_path=db_path).do_load(data_transformed={"data": news})
+
+
+def _changes(links):
+    return links.conn.execute(f"SELECT COUNT(*) FROM {links.table_prices}_changes").fetchone()[0]
+
+
+@pytest.fixture
+def links(db_path):
+    assert YFinanceLoad(db_path=db_path).do_load(df=TWO_SYMBOLS[TWO_SYMBOLS["date"] < "2000-02-01"])
+    _load_news(db_path, 0, 30)
+    links = NewsPriceLinks(db_path=db_path)
+    links.refresh()
+    return links
+
+
+def test_incremental_refresh_matches_full_refresh(links, db_path):
+    changed = PRICES.copy()
+    changed.loc[changed["date"] == "2000-01-12", "close"] += 5.0
+    # Barras novas, uma barra antiga alterada e um ativo novo (SYM0002)
+    assert YFinanceLoad(db_path=db_path).do_load(df=changed)
+    _load_news(db_path, 30, 15)
+
+    stats = links.refresh()
+    assert stats["news"] > 0 and stats["stale"] > 0
+    incremental = links.fetch().sort_values(["news_id", "symbol"], ignore_index=True)
+
+    links.refresh(full=True)
+    full = links.fetch().sort_values(["news_id", "symbol"], ignore_index=True)
+
+    assert set(incremental["symbol"]) == {"SYM0000", "SYM0001", "SYM0002"}
+    assert incremental.equals(full)
+
+
+def test_refresh_prunes_consumed_changes(links, db_path):
+    assert _changes(links) == 0
+
+    assert YFinanceLoad(db_path=db_path).do_load(df=TWO_SYMBOLS)
+    assert _changes(links) == (TWO_SYMBOLS["date"] >= "2000-02-01").sum()
+    links.refresh()
+    assert _changes(links) == 0
+
+
+def test_changes_are_kept_when_pruning_is_disabled(links, db_path):
+    keep = NewsPriceLinks(db_path=db_path, prune_changes=False)
+    assert YFinanceLoad(db_path=db_path).do_load(df=TWO_SYMBOLS)
+    keep.refresh()
+    assert _changes(keep) == (TWO_SYMBOLS["date"] >= "2000-02-01").sum()
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from scrapping.queries import NewsQuery
+from scrapping.tasks.loader import ScrappingLoader
+
+BASE = datetime(2025, 1, 15, 12, 0)
+
+
+def _load(db_path, news):
+    data = [
+        {"tipo_noticia": tipo, "titulo_noticia": titulo, "url_noticia": f"https://x/{i}", "data_noticia": date}
+        for i, (tipo, titulo, date) in enumerate(news)
+    ]
+    assert ScrappingLoader(db_path=db_path).do_load(data_transformed={"data": data})
+
+
+@pytest.fixture
+def news_db(db_path):
+    # Datas repetidas (empates no cursor) e notícias sem data, que vêm ao final
+    _load(db_path, [
+        ("Mercados" if i % 2 else "Economia", f"Notícia {i}", None if i % 11 == 0 else BASE - timedelta(hours=i // 3))
+        for i in range(100)
+    ])
+    return db_path
+
+
+@pytest.mark.parametrize("output", ["df", "arrow", "numpy"])
+@pytest.mark.parametrize("page_size", [1, 7, 100, 500])
+def test_keyset_pages_have_no_gaps_or_duplicates(news_db, output, page_size):
+    query = NewsQuery(news_db)
+    expected = query.fetch()["id"].tolist()
+
+    ids = []
+    for data in query.iter_pages(page_size=page_size, output=output):
+        ids.extend(int(i) for i in (data["id"].to_pylist() if output == "arrow" else data["id"]))
+
+    assert ids == expected
+    assert len(ids) == len(set(ids)) == 100
+
+
+def test_undated_news_come_last(news_db):
+    dates = NewsQuery(news_db).fetch()["data_noticia"]
+    assert dates.tail(10).isna().all()
+    assert dates.head(90).notna().all()
+
+
+def test_pages_respect_filters_and_order(news_db):
+    query = NewsQuery(news_db)
+    start, end = BASE - timedelta(hours=10), BASE - timedelta(hours=2)
+
+    pages = list(query.iter_pages(page_size=4, tipo="Mercados", start=start, end=end))
+    df = query.fetch(tipo="Mercados", start=start, end=end)
+
+    ids = [i for page in pages for i in page["id"]]
+    assert ids == df["id"].tolist()
+    assert len(ids) == query.count(tipo="Mercados", start=start, end=end)
+    assert (df["tipo"] == "Mercados").all()
+    assert df["data_noticia"].between(start, end, inclusive="left").all()
+    assert df["data_noticia"].is_monotonic_decreasing
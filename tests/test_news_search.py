@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from scrapping.tasks.loader import ScrappingLoader
+
+TITLES = [
+    ("Petrobras anuncia dividendos recordes aos acionistas", datetime(2025, 1, 10)),
+    ("Ibovespa sobe com Petrobras e Vale", datetime(2025, 1, 11)),
+    ("Vale divulga produção de minério", datetime(2025, 1, 12)),
+    ("Dólar cai e Ibovespa fecha em alta", datetime(2025, 1, 13)),
+    ("Petrobras: Petrobras eleva preço do diesel", datetime(2025, 1, 14)),
+    ("Inflação acelera em janeiro", datetime(2025, 1, 15)),
+]
+
+
+def _news(titles, start=0):
+    return {"data": [
+        {"tipo_noticia": "Mercados", "titulo_noticia": title, "url_noticia": f"https://x/{i}", "data_noticia": date}
+        for i, (title, date) in enumerate(titles, start)
+    ]}
+
+
+@pytest.fixture
+def loader(db_path):
+    loader = ScrappingLoader(db_path=db_path)
+    assert loader.do_load(data_transformed=_news(TITLES))
+    return loader
+
+
+def test_ranking_prefers_term_frequency_and_short_titles(loader):
+    df = loader.search_index.search("petrobras")
+    assert df["titulo"].tolist() == [
+        "Petrobras: Petrobras eleva preço do diesel",
+        "Ibovespa sobe com Petrobras e Vale",
+        "Petrobras anuncia dividendos recordes aos acionistas",
+    ]
+    assert df["score"].is_monotonic_decreasing
+
+
+def test_match_all_any_and_accents(loader):
+    both = loader.search_index.search("PETROBRÁS vale")
+    assert both["titulo"].tolist() == ["Ibovespa sobe com Petrobras e Vale"]
+    assert (both["matched"] == 2).all()
+
+    either = loader.search_index.search("petrobras vale", match="any")
+    assert len(either) == 4
+    assert either["titulo"].iloc[0] == "Ibovespa sobe com Petrobras e Vale"
+
+    assert loader.search_index.search("inflacao")["titulo"].tolist() == ["Inflação acelera em janeiro"]
+    assert loader.search_index.search("de em do").empty
+
+
+def test_date_filters_are_start_inclusive_end_exclusive(loader):
+    df = loader.search_index.search("petrobras", start=datetime(2025, 1, 11), end=datetime(2025, 1, 14))
+    assert df["titulo"].tolist() == ["Ibovespa sobe com Petrobras e Vale"]
+
+
+def test_incremental_index_matches_rebuild(loader):
+    assert loader.do_load(data_transformed=_news([("Vale e Petrobras lideram alta", datetime(2025, 1, 16))], len(TITLES)))
+    incremental = loader.search_index.search("petrobras vale", match="any")
+
+    loader.search_index.rebuild()
+    rebuilt = loader.search_index.search("petrobras vale", match="any")
+
+    assert incremental[["id", "matched"]].equals(rebuilt[["id", "matched"]])
+    assert incremental["score"].tolist() == pytest.approx(rebuilt["score"].tolist())
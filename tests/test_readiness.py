@@ -0,0 +1,93 @@
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+
+from bases.crawlers import readiness
+from bases.crawlers.readiness import AllReady, DocumentReady, DomQuiet, ElementsPresent, ReadinessStrategy
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+
+
+class FakeDriver:
+    """Webdriver falso: `readyState` muda após `ready_after` consultas; elementos conforme `elements`."""
+
+    def __init__(self, ready_after=0, elements=(), quiet=True):
+        self.ready_after = ready_after
+        self.elements = set(elements)
+        self.quiet = quiet
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.ready_after -= 1
+        return "complete" if self.ready_after < 0 else "loading"
+
+    def find_element(self, by, value):
+        if value not in self.elements:
+            raise NoSuchElementException(value)
+        return object()
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        self.scripts.append(script)
+        return self.quiet
+
+
+class Recording(ReadinessStrategy):
+    def __init__(self, result=True, delay=0.0):
+        self.result, self.delay, self.timeouts = result, delay, []
+
+    def wait(self, driver, timeout):
+        self.timeouts.append(timeout)
+        time.sleep(self.delay)
+        return self.result
+
+
+def test_all_ready_shares_one_deadline():
+    first, second = Recording(delay=0.1), Recording()
+
+    assert AllReady(first, second).wait(FakeDriver(), 1.0)
+    assert 0.95 < first.timeouts[0] <= 1.0
+    assert 0.8 < second.timeouts[0] <= 0.9
+
+
+def test_all_ready_stops_at_the_first_unmet_condition():
+    first, second = Recording(result=False), Recording()
+
+    assert not AllReady(first, second).wait(FakeDriver(), 1.0)
+    assert second.timeouts == []
+
+
+def test_document_ready_times_out():
+    assert DocumentReady().wait(FakeDriver(ready_after=2), 1.0)
+
+    start = time.monotonic()
+    assert not DocumentReady().wait(FakeDriver(ready_after=10**6), 0.3)
+    assert time.monotonic() - start < 1.0
+
+
+def test_elements_present_times_out_without_the_locator():
+    locator = InfoMoneyCrawler.ITEM_CONTAINER
+    assert ElementsPresent(locator).wait(FakeDriver(elements=[locator[1]]), 1.0)
+    assert not ElementsPresent(locator).wait(FakeDriver(), 0.2)
+
+
+def test_dom_quiet_ignores_attribute_changes_and_expired_budget():
+    driver = FakeDriver()
+    assert DomQuiet().wait(driver, 1.0)
+    assert "attributes" not in driver.scripts[0]
+
+    # Sem tempo restante, nem consulta o navegador
+    driver = FakeDriver(quiet=True)
+    assert not DomQuiet().wait(driver, 0)
+    assert driver.scripts == []
+
+
+def test_infomoney_waits_for_the_listing_by_default():
+    crawler = InfoMoneyCrawler()
+    assert isinstance(crawler.readiness, ElementsPresent)
+    assert crawler.readiness.locator == InfoMoneyCrawler.ITEM_CONTAINER
+
+    custom = Recording()
+    assert InfoMoneyCrawler(readiness=custom).readiness is custom
+    assert isinstance(readiness.default_readiness(), AllReady)
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from scrapping.crawlers.dates import convert_relative_dates
+from scrapping.tasks.loader import ScrappingLoader
+from scrapping.tasks.transformer import ScrappingTransformer
+
+REFERENCE = datetime(2025, 1, 15, 12, 0)
+
+
+def test_months_singular_plural_and_yesterday():
+    assert convert_relative_dates(["1 mês atrás", "2 meses atrás", "ontem", "3 h atrás"], REFERENCE) == [
+        REFERENCE - timedelta(days=30),
+        REFERENCE - timedelta(days=60),
+        REFERENCE - timedelta(days=1),
+        REFERENCE - timedelta(hours=3),
+    ]
+
+
+def test_absolute_and_unknown_dates():
+    assert convert_relative_dates(["17/10/2024 às 10h30", "há pouco", None], REFERENCE) == [
+        datetime(2024, 10, 17, 10, 30), None, None,
+    ]
+
+
+def test_undated_news_is_kept_and_stored_with_null_date(db_path):
+    news = [
+        {"tipo_noticia": "Mercados", "titulo_noticia": "Com data", "url_noticia": "https://x/1", "data_noticia": REFERENCE},
+        {"tipo_noticia": "Mercados", "titulo_noticia": "Sem data", "url_noticia": "https://x/2", "data_noticia": None},
+        {"tipo_noticia": "Mercados", "titulo_noticia": "", "url_noticia": "https://x/3", "data_noticia": REFERENCE},
+    ]
+    transformed = ScrappingTransformer().do_transform(data_extracted={"data_extracao": REFERENCE, "data": news})
+
+    assert [n["titulo_noticia"] for n in transformed["data"]] == ["Com data", "Sem data"]
+    assert transformed["metadata"]["total_filtered"] == 1
+    assert transformed["metadata"]["total_undated"] == 1
+
+    loader = ScrappingLoader(db_path=db_path)
+    assert loader.do_load(data_transformed=transformed)
+    rows = loader.conn.execute("SELECT titulo, data_noticia FROM news ORDER BY id").fetchall()
+    assert rows == [("Com data", REFERENCE), ("Sem data", None)]
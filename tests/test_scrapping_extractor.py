@@ -0,0 +1,39 @@
+import pytest
+
+from fixtures import infomoney_routes, serve
+from scrapping.crawlers.infomoney import InfoMoneyCrawler
+from scrapping.tasks.extractor import ScrappingExtractor
+
+
+def _extractor(base_url):
+    crawler = InfoMoneyCrawler(mode="http", reuse_driver=False, minimum_items=100, max_pages=20)
+    crawler.url = f"{base_url}/ultimas-noticias/"
+    crawler.page_url_template = f"{base_url}/ultimas-noticias/page/{{page}}/"
+    return ScrappingExtractor(crawler=crawler)
+
+
+def test_run_options_do_not_leak_into_the_next_run():
+    with serve(infomoney_routes(pages=10, per_page=10)) as base_url:
+        extractor = _extractor(base_url)
+        known = {f"{base_url}/mercados/noticia-15/"}
+
+        first = extractor.do_extract(minimum_items=10, max_pages=1, known_urls=known)
+        assert len(first["data"]) == 10
+        assert extractor.crawler.minimum_items == 100
+        assert extractor.crawler.max_pages == 20
+        assert extractor.crawler.known_urls == set()
+
+        # Sem opções, a execução seguinte usa os padrões do crawler
+        second = [news for batch in extractor.iter_extract() for news in batch["data"]]
+        assert len(second) == 100
+
+
+def test_run_options_are_restored_when_the_run_fails(monkeypatch):
+    with serve(infomoney_routes(pages=1, per_page=10)) as base_url:
+        extractor = _extractor(base_url)
+        monkeypatch.setattr(extractor.crawler, "run", lambda: 1 / 0)
+
+        with pytest.raises(ZeroDivisionError):
+            extractor.do_extract(mode="async", minimum_items=5)
+        assert extractor.crawler.mode == "http"
+        assert extractor.crawler.minimum_items == 100
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from api.indicators import IndicatorEngine, SqlIndicatorEngine
+from api.tasks.extractor import normalize_symbols
+from api.tasks.loader import YFinanceLoad
+from api.tasks.transformers import YFinanceSqlTransform
+from bench_indicators import make_ohlcv
+from config.database import get_manager
+
+INDICATORS = {
+    "ma_14d": ("sma", 14),
+    "ma_50d": ("sma", 50),
+    "vol_30d": ("volatility", 30),
+}
+
+
+@pytest.fixture
+def loaded(db_path):
+    """Banco com OHLCV sintético e os indicadores calculados em pandas."""
+    expected = IndicatorEngine(indicators=INDICATORS).compute(make_ohlcv(3, 120))
+    assert YFinanceLoad(db_path=db_path, indicators=INDICATORS).do_load(df=expected.copy())
+    return expected.sort_values(["symbol", "date"], ignore_index=True)
+
+
+def test_sql_recompute_matches_pandas(db_path, loaded):
+    sql_engine = SqlIndicatorEngine(indicators=INDICATORS)
+    conn = get_manager(db_path).cursor()
+    # Zera os indicadores para garantir que os valores comparados vêm do SQL
+    conn.execute(f"UPDATE prices SET {', '.join(f'{c} = NULL' for c in sql_engine.columns)}")
+    sql_engine.recompute(conn)
+
+    actual = conn.execute(
+        f"SELECT symbol, strftime(date, '%Y-%m-%d') AS date, {', '.join(sql_engine.columns)} "
+        "FROM prices ORDER BY symbol, date"
+    ).df()
+
+    assert actual[["symbol", "date"]].equals(loaded[["symbol", "date"]])
+    for column in sql_engine.columns:
+        # Médias são arredondadas em 2 casas: diferenças de 1 ulp podem virar 0.01
+        atol = 0.01 + 1e-9 if column.startswith("ma_") else 1e-12
+        expected, result = loaded[column].to_numpy("float64"), actual[column].to_numpy("float64")
+        np.testing.assert_array_equal(np.isnan(expected), np.isnan(result), err_msg=column)
+        np.testing.assert_allclose(result, expected, rtol=0, atol=atol, equal_nan=True, err_msg=column)
+
+
+def test_recompute_accepts_symbols_in_any_case(db_path, loaded):
+    symbols = normalize_symbols([" sym0001 ", "SYM0001", ""])
+    assert symbols == ["SYM0001"]
+
+    updated = YFinanceSqlTransform(db_path=db_path, indicators=INDICATORS).do_transform(symbols=symbols)
+    assert updated == (loaded["symbol"] == "SYM0001").sum()
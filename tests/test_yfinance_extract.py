@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import api.tasks.extractor as yf_extractor
+from api.tasks.extractor import YFinanceExtract
+from api.tasks.loader import YFinanceLoad
+from bench_indicators import make_ohlcv
+from fixtures import fake_yf_download
+
+
+def _extractor(tmp_path, symbols):
+    return YFinanceExtract(symbols=symbols, batch_size=1, db_path=str(tmp_path / "ausente.db"))
+
+
+def test_all_batches_failing_raises(monkeypatch, tmp_path):
+    def offline(tickers, **kwargs):
+        raise ConnectionError("sem rede")
+
+    monkeypatch.setattr(yf_extractor.yf, "download", offline)
+
+    with pytest.raises(RuntimeError) as info:
+        _extractor(tmp_path, ["AAA", "BBB"]).do_extract()
+    assert isinstance(info.value.__cause__, ConnectionError)
+
+
+def test_partial_failure_keeps_successful_batches(monkeypatch, tmp_path):
+    def flaky(tickers, **kwargs):
+        if "BBB" in tickers:
+            raise ConnectionError("sem rede")
+        return fake_yf_download(tickers, **kwargs)
+
+    monkeypatch.setattr(yf_extractor.yf, "download", flaky)
+
+    df = _extractor(tmp_path, ["AAA", "BBB"]).do_extract()
+    assert set(df["symbol"]) == {"AAA"}
+
+
+def test_plan_batches_uses_watermarks_with_overlap(db_path):
+    prices = make_ohlcv(1, 10).assign(symbol="AAA")
+    assert YFinanceLoad(db_path=db_path).do_load(df=prices)
+    last_date = datetime.strptime(prices["date"].max(), "%Y-%m-%d")
+    end_date = datetime(2024, 6, 1)
+
+    extractor = YFinanceExtract(symbols=["aaa", "BBB", "CCC"], batch_size=1, db_path=db_path, overlap_days=3)
+    batches = extractor._plan_batches(extractor.get_symbols(), end_date)
+
+    # Ativo com histórico: retoma a partir da última barra menos a sobreposição; os demais, backfill completo
+    backfill = datetime.combine((end_date - timedelta(days=extractor.backfill_days)).date(), datetime.min.time())
+    assert sorted(batches) == sorted([
+        (["AAA"], last_date - timedelta(days=3)),
+        (["BBB"], backfill),
+        (["CCC"], backfill),
+    ])
+
+
+def test_full_refresh_ignores_watermarks(db_path):
+    assert YFinanceLoad(db_path=db_path).do_load(df=make_ohlcv(1, 10).assign(symbol="AAA"))
+    end_date = datetime(2024, 6, 1)
+
+    extractor = YFinanceExtract(symbols=["AAA", "BBB"], batch_size=50, db_path=db_path, full_refresh=True)
+    [(batch, start_date)] = extractor._plan_batches(extractor.get_symbols(), end_date)
+    assert batch == ["AAA", "BBB"]
+    assert start_date.date() == (end_date - timedelta(days=extractor.backfill_days)).date()
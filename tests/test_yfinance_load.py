@@ -0,0 +1,27 @@
+from api.tasks.loader import YFinanceLoad
+from bench_indicators import make_ohlcv
+
+
+def test_reload_counts_inserted_updated_and_unchanged(db_path):
+    df = make_ohlcv(2, 20)
+    loader = YFinanceLoad(db_path=db_path)
+
+    assert loader.do_load(df=df.copy())
+    assert loader.last_load_stats == {"inserted": 40, "updated": 0, "unchanged": 0}
+
+    changed = df.copy()
+    changed.loc[5, "close"] += 1.0
+    assert loader.do_load(df=changed)
+    assert loader.last_load_stats == {"inserted": 0, "updated": 1, "unchanged": 39}
+
+    close = loader.db.cursor().execute(
+        "SELECT close FROM prices WHERE symbol = ? AND date = ?", [changed.loc[5, "symbol"], changed.loc[5, "date"]]
+    ).fetchone()[0]
+    assert close == changed.loc[5, "close"]
+
+
+def test_default_symbol_does_not_modify_the_callers_frame(db_path):
+    df = make_ohlcv(1, 5).drop(columns="symbol")
+
+    assert YFinanceLoad(db_path=db_path).do_load(df=df, symbol="ETH-USD")
+    assert "symbol" not in df.columns